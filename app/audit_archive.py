@@ -0,0 +1,105 @@
+"""감사 로그 보관: 오래된 audit_logs 행을 연도별 보관 DB(audit_archive/audit_YYYY.db)로 옮겨 본 DB를 작게 유지한다.
+보관 DB는 조회할 때 ATTACH하므로 Repo.audit_page가 본 DB와 함께 검색한다.
+
+    python -m app.audit_archive                  # 365일보다 오래된 로그를 연도별 보관 DB로 이동
+    python -m app.audit_archive --keep-days 90 --vacuum
+    python -m app.audit_archive --list
+
+created_at(UTC) 기준으로 옮기므로 created_at이 없는 예전 로그는 본 DB에 남는다.
+보관 DB는 본 DB 백업(app.backup)에 포함되지 않으니 폴더째 따로 백업할 것.
+"""
+import argparse, sys, sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from app import core_db
+from app.audit_log import get_audit_writer
+
+KEEP_DAYS = 365
+COLUMNS = "id,actor_user_id,action,target_type,target_id,detail,created_at"
+
+def archive_dir() -> Path:
+    return core_db.DB_PATH.parent / "audit_archive"
+
+def archive_path(year: int) -> Path:
+    return archive_dir() / f"audit_{year:04d}.db"
+
+def years() -> list[int]:
+    """보관 DB가 있는 연도 (오름차순)."""
+    folder = archive_dir()
+    if not folder.is_dir(): return []
+    return sorted(int(p.stem[6:]) for p in folder.glob("audit_[0-9][0-9][0-9][0-9].db"))
+
+@contextmanager
+def attached(conn: sqlite3.Connection, year: int, create: bool = False):
+    """연도 보관 DB를 conn에 'arc'로 붙였다가 뗀다. 트랜잭션 밖에서만 쓸 수 있다."""
+    path = archive_path(year)
+    if create: path.parent.mkdir(parents=True, exist_ok=True)
+    conn.execute("ATTACH DATABASE ? AS arc", (str(path),))
+    try:
+        if create:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS arc.audit_logs(
+                    id INTEGER PRIMARY KEY, actor_user_id INTEGER, action TEXT,
+                    target_type TEXT, target_id INTEGER, detail TEXT, created_at TEXT);
+                CREATE INDEX IF NOT EXISTS arc.idx_audit_actor ON audit_logs(actor_user_id);
+                CREATE INDEX IF NOT EXISTS arc.idx_audit_target ON audit_logs(target_type, target_id);
+                CREATE INDEX IF NOT EXISTS arc.idx_audit_action ON audit_logs(action);
+                CREATE INDEX IF NOT EXISTS arc.idx_audit_time ON audit_logs(created_at);
+            ''')
+        yield "arc"
+    finally:
+        if conn.in_transaction: conn.rollback()
+        conn.execute("DETACH DATABASE arc")
+
+def cutoff_for(keep_days: int) -> str:
+    return (datetime.now(timezone.utc).date() - timedelta(days=keep_days)).isoformat()
+
+def archive(keep_days: int = KEEP_DAYS, before: str | None = None, progress=None) -> dict[int, int]:
+    """created_at이 before(기본: 오늘-keep_days, UTC 날짜) 이전인 로그를 연도별로 옮기고 {연도: 건수}를 반환.
+
+    연도마다 한 트랜잭션으로 보관 DB에 넣고 본 DB에서 지운다. 도중에 중단되어 양쪽에 남은 행은
+    다음 실행 때 INSERT OR IGNORE로 건너뛰고 본 DB에서만 지워지므로 다시 돌려도 안전하다.
+    """
+    cutoff = before or cutoff_for(keep_days)
+    get_audit_writer().flush()
+    conn = core_db.get_conn(); moved: dict[int, int] = {}
+    if conn.in_transaction: conn.commit()
+    first = conn.execute("SELECT MIN(created_at) FROM audit_logs WHERE created_at < ?", (cutoff,)).fetchone()[0]
+    if first is None: return moved
+    for y in range(int(first[:4]), int(cutoff[:4]) + 1):
+        lo, hi = f"{y:04d}-01-01", min(f"{y + 1:04d}-01-01", cutoff)
+        if not conn.execute("SELECT 1 FROM audit_logs WHERE created_at >= ? AND created_at < ? LIMIT 1", (lo, hi)).fetchone():
+            continue
+        with attached(conn, y, create=True):
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f"INSERT OR IGNORE INTO arc.audit_logs({COLUMNS}) SELECT {COLUMNS} FROM main.audit_logs "
+                         "WHERE created_at >= ? AND created_at < ?", (lo, hi))
+            n = conn.execute("DELETE FROM main.audit_logs WHERE created_at >= ? AND created_at < ?", (lo, hi)).rowcount
+            conn.commit()
+        if n: moved[y] = n
+        if progress: progress(y, n)
+    return moved
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.audit_archive", description="감사 로그 보관(연도별 DB로 이동)")
+    ap.add_argument("--keep-days", type=int, default=KEEP_DAYS, help="본 DB에 남길 기간(일)")
+    ap.add_argument("--before", help="이 날짜(YYYY-MM-DD, UTC) 이전 로그를 이동 (--keep-days 대신)")
+    ap.add_argument("--vacuum", action="store_true", help="이동 후 본 DB VACUUM")
+    ap.add_argument("--db", help="대상 DB 파일 (기본: 앱 DB)")
+    ap.add_argument("--list", action="store_true", help="보관 DB 목록만 출력")
+    args = ap.parse_args(argv)
+    if args.db: core_db.configure(path=args.db)
+    if args.list:
+        for y in years(): print(f"{archive_path(y)}\t{archive_path(y).stat().st_size:,} bytes")
+        return 0
+    if not core_db.DB_PATH.exists():
+        print(f"DB 파일이 없습니다: {core_db.DB_PATH}", file=sys.stderr); return 1
+    moved = archive(args.keep_days, args.before)
+    for y, n in moved.items(): print(f"{y}\t{n:,}건 → {archive_path(y)}")
+    if not moved: print("옮길 로그가 없습니다.")
+    if args.vacuum: core_db.get_conn().execute("VACUUM")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
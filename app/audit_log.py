@@ -0,0 +1,89 @@
+"""감사 로그 비동기 기록기: Repo.audit는 메모리 버퍼에 넣고 바로 돌아오며, 백그라운드 스레드가
+모아서 한 트랜잭션으로 INSERT한다.
+
+    get_audit_writer().log(actor_user_id, "user_delete", "user", 3)
+    get_audit_writer().flush()     # 버퍼를 지금 기록 (조회/백업/복원 직전)
+
+버퍼가 FLUSH_SIZE개가 되거나 첫 항목이 들어온 뒤 FLUSH_INTERVAL초가 지나면 기록한다.
+created_at은 호출 시각(UTC, datetime('now')와 같은 형식)이라 기록이 늦어져도 시각은 정확하다.
+종료 시(atexit, App._on_close) close()가 남은 버퍼를 모두 기록한다.
+"""
+import atexit, logging, threading
+from datetime import datetime, timezone
+from app import core_db
+
+FLUSH_SIZE = 200
+FLUSH_INTERVAL = 1.0    # 초
+RETRY_LIMIT = 10_000    # 기록 실패 시 버퍼에 남겨 둘 최대 항목 수
+
+_INSERT = "INSERT INTO audit_logs(actor_user_id,action,target_type,target_id,detail,created_at) VALUES(?,?,?,?,?,?)"
+log = logging.getLogger("hris.audit")
+
+def now_utc() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+class AuditWriter:
+    def __init__(self, flush_size: int = FLUSH_SIZE, interval: float = FLUSH_INTERVAL):
+        self.flush_size = flush_size; self.interval = interval
+        self._buf: list[tuple] = []; self._cond = threading.Condition()
+        self._write_lock = threading.Lock()   # 백그라운드 기록과 flush()가 순서를 지키도록
+        self._thread: threading.Thread | None = None; self._closing = False
+        self.written = 0
+
+    def log(self, actor_user_id: int | None, action: str, target_type: str, target_id: int | None, detail: str | None = None):
+        row = (actor_user_id, action, target_type, target_id, detail, now_utc())
+        with self._cond:
+            if self._closing:   # 종료 후 들어온 항목은 바로 기록
+                self._write([row]); return
+            self._buf.append(row)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hris-audit", daemon=True); self._thread.start()
+            if len(self._buf) == 1 or len(self._buf) >= self.flush_size:
+                self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond: return len(self._buf)
+
+    def flush(self):
+        """버퍼를 호출한 스레드에서 바로 기록한다."""
+        with self._write_lock:
+            with self._cond:
+                batch, self._buf = self._buf, []
+            self._write(batch)
+
+    def close(self, timeout: float = 5.0):
+        """남은 버퍼를 기록하고 스레드를 멈춘다. 여러 번 불러도 된다."""
+        with self._cond:
+            self._closing = True; self._cond.notify()
+            t = self._thread
+        if t is not None: t.join(timeout)
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._buf and not self._closing:
+                    self._cond.wait()
+                if not self._closing and len(self._buf) < self.flush_size:   # 첫 항목 이후 interval만큼 더 모음
+                    self._cond.wait_for(lambda: self._closing or len(self._buf) >= self.flush_size, self.interval)
+                closing = self._closing
+            self.flush()
+            if closing: break
+        core_db.release_conn()
+
+    def _write(self, batch: list[tuple]):
+        if not batch: return
+        try:
+            with core_db.get_conn() as c:
+                c.executemany(_INSERT, batch)
+            self.written += len(batch)
+        except Exception:
+            log.exception("감사 로그 %d건 기록 실패", len(batch))
+            with self._cond:   # 다음 기록 때 다시 시도 (순서 유지)
+                self._buf[:0] = batch[-RETRY_LIMIT:]
+
+_writer = AuditWriter()
+atexit.register(_writer.close)
+
+def get_audit_writer() -> AuditWriter:
+    return _writer
@@ -0,0 +1,58 @@
+"""타임스탬프 백업 스냅샷과 보관 개수 관리. 백업/복원 탭과 스크립트(작업 스케줄러, cron)에서 같이 쓴다.
+
+    python -m app.backup                     # 기본 폴더에 스냅샷 1개, 최근 10개만 보관
+    python -m app.backup --gzip --keep 30 --dir D:/hris-backups
+    python -m app.backup --list
+"""
+import argparse, sys, datetime
+from pathlib import Path
+from app import core_db
+from app.utils_paths import appdata_dir
+
+KEEP = 10
+PREFIX = "hris_"
+
+def default_dir() -> Path:
+    return appdata_dir() / "backups"
+
+def snapshots(folder: str | Path | None = None) -> list[Path]:
+    """스냅샷 파일 목록 (오래된 것부터). 파일명의 타임스탬프 순서가 곧 생성 순서."""
+    folder = Path(folder) if folder else default_dir()
+    if not folder.is_dir(): return []
+    return sorted(p for p in folder.iterdir()
+                  if p.name.startswith(PREFIX) and (p.name.endswith(".db") or p.name.endswith(".db.gz")))
+
+def rotate(folder: str | Path | None = None, keep: int = KEEP) -> list[Path]:
+    """최근 keep개만 남기고 삭제. 삭제한 파일 목록을 반환."""
+    old = snapshots(folder)[:-keep] if keep > 0 else []
+    for p in old: p.unlink(missing_ok=True)
+    return old
+
+def snapshot(folder: str | Path | None = None, keep: int = KEEP, compress: bool = False, progress=None) -> Path:
+    """folder/hris_YYYYmmdd_HHMMSS.db[.gz]로 온라인 백업 후 보관 개수를 정리한다."""
+    folder = Path(folder) if folder else default_dir()
+    ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    path = core_db.backup_to(folder / f"{PREFIX}{ts}.db{'.gz' if compress else ''}", progress=progress, compress=compress)
+    rotate(folder, keep)
+    return path
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.backup", description="HRIS DB 온라인 백업")
+    ap.add_argument("--dir", help=f"백업 폴더 (기본: {default_dir()})")
+    ap.add_argument("--keep", type=int, default=KEEP, help="보관할 스냅샷 개수 (0=정리 안 함)")
+    ap.add_argument("--gzip", action="store_true", help="gzip 압축")
+    ap.add_argument("--db", help="백업할 DB 파일 (기본: 앱 DB)")
+    ap.add_argument("--list", action="store_true", help="스냅샷 목록만 출력")
+    args = ap.parse_args(argv)
+    if args.db: core_db.configure(path=args.db)
+    if args.list:
+        for p in snapshots(args.dir): print(f"{p}\t{p.stat().st_size:,} bytes")
+        return 0
+    if not core_db.DB_PATH.exists():
+        print(f"DB 파일이 없습니다: {core_db.DB_PATH}", file=sys.stderr); return 1
+    path = snapshot(args.dir, args.keep, args.gzip)
+    print(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
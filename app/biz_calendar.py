@@ -0,0 +1,89 @@
+"""영업일 달력: holidays 테이블을 연도별로 한 번만 읽어 메모리에 두고 휴일/영업일 질의에 답한다.
+
+    cal = get_calendar()
+    cal.is_holiday("2025-01-01"); cal.business_days("2025-01-01", "2025-01-31")
+    "2025-01-01" in cal      # is_holiday와 같음 (calc_work_buckets_batch의 holidays 인자로 그대로 사용)
+
+연도별로 휴일 서수(date.toordinal) 집합과 평일 휴일의 정렬된 서수 목록을 가진다. is_holiday는 O(1),
+business_days는 평일 수를 산식으로 구하고 구간 안의 평일 휴일을 bisect로 빼므로 O(log n).
+Repo.add_holiday/delete_holiday가 해당 연도를 invalidate한다. DB 없이 휴일 목록만으로 세야 하는 곳(보고서
+워커 프로세스)은 같은 산식인 weekday_holidays + count_business_days를 직접 쓴다.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+from app import core_db
+
+def _as_date(d) -> date:
+    return d if isinstance(d, date) else date.fromisoformat(d)
+
+def _weekdays_through(o: int) -> int:
+    """서수 1(0001-01-01, 월요일)부터 o까지의 평일 수."""
+    w, r = divmod(o, 7)
+    return w * 5 + min(r, 5)
+
+def weekday_holidays(holidays) -> list[int]:
+    """휴일 날짜들('YYYY-MM-DD' 또는 date) 중 평일인 날의 서수 (정렬됨). count_business_days의 인자."""
+    return sorted({o for o in (_as_date(d).toordinal() for d in holidays) if date.fromordinal(o).weekday() < 5})
+
+def count_business_days(s, e, weekday_ords: list[int]) -> int:
+    """s~e(포함) 중 주말과 weekday_ords(weekday_holidays 결과)를 뺀 날 수. 평일 수는 산식, 휴일은 bisect."""
+    s = _as_date(s); e = _as_date(e)
+    if e < s: return 0
+    so, eo = s.toordinal(), e.toordinal()
+    return (_weekdays_through(eo) - _weekdays_through(so - 1)
+            - (bisect_right(weekday_ords, eo) - bisect_left(weekday_ords, so)))
+
+class BusinessCalendar:
+    def __init__(self):
+        self._years: dict[int, tuple[frozenset[int], list[int]]] = {}
+        self._lock = threading.Lock(); self._path = None; self._gen = 0
+
+    def _year(self, y: int) -> tuple[frozenset[int], list[int]]:
+        if self._path != core_db.DB_PATH:   # DB가 바뀌면 전부 다시 읽음
+            self._years = {}; self._path = core_db.DB_PATH
+        data = self._years.get(y)
+        if data is None:
+            with self._lock:
+                gen = self._gen
+                days = [r[0] for r in core_db.get_conn().execute(
+                    "SELECT date FROM holidays WHERE date BETWEEN ? AND ?", (f"{y:04d}-01-01", f"{y:04d}-12-31"))]
+                data = (frozenset(date.fromisoformat(d).toordinal() for d in days), weekday_holidays(days))
+                if gen == self._gen:   # 읽는 도중 invalidate되었으면 이번 결과는 보관하지 않음
+                    self._years[y] = data
+        return data
+
+    def invalidate(self, year: int | None = None):
+        self._gen += 1
+        if year is None: self._years = {}
+        else: self._years.pop(year, None)
+
+    def is_holiday(self, d) -> bool:
+        """holidays 테이블에 등록된 날 (주말 여부와 무관)."""
+        d = _as_date(d)
+        return d.toordinal() in self._year(d.year)[0]
+
+    __contains__ = is_holiday
+
+    def is_business_day(self, d) -> bool:
+        d = _as_date(d)
+        return d.weekday() < 5 and not self.is_holiday(d)
+
+    def business_days(self, s, e) -> int:
+        """s~e(포함) 중 주말·휴일을 뺀 날 수."""
+        s = _as_date(s); e = _as_date(e)
+        if e < s: return 0
+        if s.year == e.year: return count_business_days(s, e, self._year(s.year)[1])
+        return count_business_days(s, e, [o for y in range(s.year, e.year + 1) for o in self._year(y)[1]])   # 연도순이라 이어 붙여도 정렬됨
+
+    def holidays_between(self, s, e) -> list[str]:
+        """s~e(포함)의 등록 휴일 날짜 목록 (주말 휴일 포함, 정렬됨)."""
+        s = _as_date(s); e = _as_date(e); out = []
+        for y in range(s.year, e.year + 1):
+            out += sorted(o for o in self._year(y)[0] if s.toordinal() <= o <= e.toordinal())
+        return [date.fromordinal(o).isoformat() for o in out]
+
+_calendar = BusinessCalendar()
+
+def get_calendar() -> BusinessCalendar:
+    return _calendar
@@ -0,0 +1,73 @@
+"""근무시간 버킷 계산 점검: 구간 산술로 바꾼 야간/버킷 계산이 분 단위로 세던 예전 루프와 같은지 시각 조합을 훑어 비교한다.
+
+    python -m app.calc_check      # 문제 없으면 종료코드 0
+
+기준(_night_loop)은 예전 _night_minutes의 분 루프 그대로이고, 버킷 기준(_buckets_ref)은 그 위에 예전
+calc_work_buckets 규칙을 얹었다. 단, 자정을 넘기는 근무의 total은 예전엔 음수가 되던 것을 넘김으로 고쳤으므로
+(퇴근 < 출근이면 다음 날 퇴근) 기준도 넘김으로 센다. 비교 대상은 calc_work_buckets, calc_work_buckets_batch,
+그리고 Repo 집계 쿼리가 쓰는 night_before_sql.
+"""
+import sqlite3, sys
+from datetime import date
+from app.utils_time import (BUCKET_KEYS, DAILY_REGULAR_MINUTES, NIGHT_END, NIGHT_START, _DAY, _night_before,
+                            _night_minutes, calc_work_buckets, calc_work_buckets_batch, night_before_sql)
+
+STEP = 15   # 분. 경계 근처 시각(EDGES)은 따로 더한다
+EDGES = ("00:01", "05:59", "06:00", "06:01", "17:59", "18:01", "21:59", "22:00", "22:01", "23:59")
+DAYS = (date(2025, 1, 6), date(2025, 1, 11))   # 평일, 토요일
+LUNCH = (0, 60)
+
+def _night_loop(s: int, e: int) -> int:
+    """예전 구현: 출근~퇴근을 1분씩 돌며 22~06시를 센다."""
+    if e < s: e += _DAY
+    night = 0
+    for minute in range(s, e):
+        h = (minute // 60) % 24
+        if h >= NIGHT_START or h < NIGHT_END: night += 1
+    return night
+
+def _buckets_ref(s: int, e: int, lunch: int, d: date, is_holiday: bool) -> dict:
+    total = (e - s if e >= s else e + _DAY - s) - lunch
+    hol = total if is_holiday or d.weekday() >= 5 else 0
+    return dict(regular=min(total, DAILY_REGULAR_MINUTES) if not hol else 0,
+                overtime=max(0, total - DAILY_REGULAR_MINUTES) if not hol else 0,
+                night=_night_loop(s, e), holiday=hol, total=total)
+
+def _times() -> list[str]:
+    ts = {f"{m // 60:02d}:{m % 60:02d}" for m in range(0, _DAY, STEP)} | set(EDGES)
+    return sorted(ts)
+
+def check() -> list[str]:
+    problems = []; times = _times(); mins = {t: int(t[:2]) * 60 + int(t[3:]) for t in times}
+    night_ref = {(a, b): _night_loop(mins[a], mins[b]) for a in times for b in times}
+    for (a, b), n in night_ref.items():
+        if _night_minutes(a, b) != n: problems.append(f"_night_minutes({a}, {b}) = {_night_minutes(a, b)}, 기준 {n}")
+    rows = []; expected = []
+    for d in DAYS:
+        for lunch in LUNCH:
+            for a in times:
+                for b in times:
+                    ref = _buckets_ref(mins[a], mins[b], lunch, d, False)
+                    got = calc_work_buckets(a, b, lunch, d, False)
+                    if got != ref: problems.append(f"calc_work_buckets({a}, {b}, {lunch}, {d}) = {got}, 기준 {ref}")
+                    rows.append(dict(employee_id=len(rows), date=d.isoformat(), in_time=a, out_time=b, lunch_minutes=lunch))
+                    expected.append(ref)
+    per_row, _ = calc_work_buckets_batch(rows)
+    for r, got, ref in zip(rows, per_row, expected):
+        if got != ref: problems.append(f"calc_work_buckets_batch({r['in_time']}, {r['out_time']}, {r['lunch_minutes']}, {r['date']}) = {got}, 기준 {ref}")
+    conn = sqlite3.connect(":memory:")
+    sql = f"SELECT value, {night_before_sql('value')} FROM json_each(?)"
+    for t, n in conn.execute(sql, (str(list(range(0, 2 * _DAY + 1))),)):
+        if n != _night_before(t): problems.append(f"night_before_sql({t}) = {n}, Python {_night_before(t)}")
+    conn.close()
+    return problems
+
+def main(argv=None) -> int:
+    problems = check()
+    for p in problems[:50]: print(p)
+    n = len(_times()) ** 2
+    print(f"FAIL: {len(problems)}건 불일치" if problems else f"OK: 시각 조합 {n:,}개 × {len(DAYS) * len(LUNCH)}가지, 기준과 일치")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""GUI 없이 쓰는 명령줄 진입점 (야간 배치, 헤드리스 서버용). tkinter를 import하지 않는다.
+
+    python -m app.cli init [--seed]                      # 스키마 생성/마이그레이션 (--seed: 샘플 데이터)
+    python -m app.cli timesheet --month 2025-01 --gzip   # 급여 마감용 근태 집계 CSV
+    python -m app.cli export attendance --start 2025-01-01 --end 2025-01-31
+    python -m app.cli report --month 2025-01 --workers 4   # 월말 부서별 보고서 (부서별 CSV + summary.csv)
+    python -m app.cli import-employees staff.csv
+    python -m app.cli backup --gzip --keep 30
+    python -m app.cli rebuild weekly goals
+    python -m app.cli archive-audit --keep-days 365
+    python -m app.cli serve --port 8765                  # 로컬 JSON HTTP 서비스 (app.server)
+    python -m app.cli --db D:/hris/hris.db overcap
+
+시작을 빠르게 하려고 하위 명령이 필요한 모듈만 함수 안에서 import하고, init --seed가 아니면 seed()를
+부르지 않는다. DB가 없으면 init을 먼저 하라고 알리고, 스키마가 예전 버전이면 마이그레이션만 적용한다.
+"""
+import argparse, sys
+
+def _db():
+    """기존 DB를 연다(없으면 None). 스키마가 뒤처져 있으면 마이그레이션만 적용한다."""
+    from app import core_db
+    if not core_db.DB_PATH.exists():
+        print(f"DB 파일이 없습니다: {core_db.DB_PATH} (python -m app.cli init)", file=sys.stderr); return None
+    if core_db.schema_version() < core_db.SCHEMA_VERSION: core_db.init_db()
+    from app.repo import Repo
+    return Repo()
+
+def _progress(quiet: bool, unit: str = "행"):
+    """write_csv용 progress(누적 행 수)."""
+    if quiet: return None
+    return lambda n: print(f"\r{n:,}{unit}", end="", file=sys.stderr, flush=True)
+
+def _import_progress(quiet: bool, unit: str = "건"):
+    """import_employees_csv용 progress(읽은 줄 수, 거부 건수)."""
+    if quiet: return None
+    return lambda lines, rej: print(f"\r{lines:,}줄 (거부 {rej:,}{unit})", end="", file=sys.stderr, flush=True)
+
+def _write(args, cols, batches, base_name: str) -> int:
+    from app.exporter import export_path, write_csv
+    path = args.out or export_path(base_name, args.gzip)
+    n = write_csv(cols, batches, path, progress=_progress(args.quiet))
+    if not args.quiet: print(file=sys.stderr)
+    print(f"{path}\t{n:,}행")
+    return 0
+
+def cmd_init(args) -> int:
+    from app import core_db
+    if args.seed:
+        from app.seed import seed
+        seed()
+    else:
+        core_db.init_db()
+    print(f"{core_db.DB_PATH}\tschema v{core_db.schema_version()}")
+    return 0
+
+def cmd_timesheet(args) -> int:
+    repo = _db()
+    if repo is None: return 1
+    from datetime import date, timedelta
+    from app.utils_time import month_range_of
+    if args.month:
+        s, e = month_range_of(date.fromisoformat(args.month + "-01"))
+        start, end = s.isoformat(), e.isoformat()
+    elif args.start and args.end:
+        start, end = args.start, args.end
+    else:   # 기본: 지난달 (매월 초 마감 배치)
+        s, e = month_range_of(date.today().replace(day=1) - timedelta(days=1))
+        start, end = s.isoformat(), e.isoformat()
+    cols = ("사번","이름","부서ID","근무일","일반","연장","야간","휴일","합계(분)")
+    rows = [(r["employee_no"], r["name"], r["department_id"], r["days"], r["regular"], r["overtime"], r["night"], r["holiday"], r["total"])
+            for r in repo.timesheet_summary(start, end, args.dept)]
+    return _write(args, cols, [rows], f"timesheet_{start}_{end}")
+
+def cmd_export(args) -> int:
+    repo = _db()
+    if repo is None: return 1
+    if args.what == "attendance":
+        if not (args.start and args.end):
+            print("attendance는 --start/--end가 필요합니다.", file=sys.stderr); return 2
+        cols, batches = repo.attendance_export(args.start, args.end, args.dept)
+        name = f"attendance_{args.start}_{args.end}"
+    elif args.what == "overview":
+        from app.utils_time import today_str
+        cols, batches = repo.overview_export(args.start or today_str(), args.dept, args.name)
+        name = "overview"
+    else:
+        cols, batches = repo.audit_export(since=args.start, until=args.end)   # 보관 DB 포함
+        name = "audit"
+    return _write(args, cols, batches, name)
+
+def cmd_report(args) -> int:
+    repo = _db()
+    if repo is None: return 1
+    from datetime import date, timedelta
+    from app.reports import monthly_reports
+    month = args.month or (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")   # 기본: 지난달
+    prog = None if args.quiet else (lambda done, total: print(f"\r부서 {done}/{total}", end="", file=sys.stderr, flush=True))
+    res = monthly_reports(month, args.out, args.workers, args.gzip, prog)
+    if not args.quiet: print(file=sys.stderr)
+    t = res["total"]
+    print(f"{res['summary']}\t부서 {len(res['departments'])}개, {t['headcount']:,}명, "
+          f"연장 {t['overtime']:,}분, 휴가 {t['leave_days']:,}일 ({res['workers']}프로세스, {res['seconds']:.1f}초)")
+    return 0
+
+def cmd_import_employees(args) -> int:
+    repo = _db()
+    if repo is None: return 1
+    from app.importer import import_employees_csv
+    res = import_employees_csv(args.csv, repo, upsert=not args.no_upsert, progress=_import_progress(args.quiet))
+    if not args.quiet: print(file=sys.stderr)
+    print(f"추가 {res['inserted']:,} / 갱신 {res['updated']:,} / 거부 {res['rejected']:,}")
+    if res["rejected"]: print(f"거부 목록: {res['rejected_path']}")
+    return 0 if not res["rejected"] else 3
+
+def cmd_rebuild(args) -> int:
+    repo = _db()
+    if repo is None: return 1
+    for what in args.what:
+        {"weekly": repo.rebuild_weekly_totals, "goals": repo.rebuild_goal_rollups}[what]()
+        print(f"{what}: 재계산 완료")
+    return 0
+
+def cmd_overcap(args) -> int:
+    repo = _db()
+    if repo is None: return 1
+    from datetime import date
+    from app.utils_time import week_range_of
+    ws = args.week or week_range_of(date.today())[0].isoformat()
+    cap = args.cap or repo.get_settings()["weekly_cap_minutes"] or 3120
+    for r in repo.over_cap(ws, cap):
+        print(f"{r['employee_no']}\t{r['name']}\t{r['total']}")
+    return 0
+
+def _delegate(module: str):
+    """자체 argparse가 있는 모듈(backup, audit_archive, utils_security, db_check, calc_check, smoke_check, server)에 나머지 인자를 넘긴다."""
+    def run(args) -> int:
+        import importlib
+        main = importlib.import_module(module).main
+        return main(args.rest) if module != "app.db_check" else main()
+    return run
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m app.cli", description="HRIS 명령줄 도구 (GUI 없이 실행)")
+    ap.add_argument("--db", help="DB 파일 (기본: 앱 DB)")
+    sub = ap.add_subparsers(dest="cmd", required=True, metavar="명령")
+
+    p = sub.add_parser("init", help="스키마 생성/마이그레이션")
+    p.add_argument("--seed", action="store_true", help="샘플 데이터와 기본 계정(admin 등)까지 넣기 (없으면 빈 DB)")
+    p.set_defaults(fn=cmd_init)
+
+    def out_opts(p):
+        p.add_argument("--out", help="저장 경로 (기본: exports/<이름>_<시각>.csv)")
+        p.add_argument("--gzip", action="store_true", help="gzip 압축 (--out이 .gz로 끝나도 압축)")
+        p.add_argument("--quiet", "-q", action="store_true", help="진행률 출력 안 함")
+        p.add_argument("--dept", type=int, help="부서 ID")
+
+    p = sub.add_parser("timesheet", help="근태 집계 CSV (급여 마감, 기본: 지난달)")
+    p.add_argument("--month", help="YYYY-MM")
+    p.add_argument("--start"); p.add_argument("--end")
+    out_opts(p); p.set_defaults(fn=cmd_timesheet)
+
+    p = sub.add_parser("export", help="CSV 내보내기 (attendance/overview/audit)")
+    p.add_argument("what", choices=("attendance", "overview", "audit"))
+    p.add_argument("--start", help="attendance 시작일 / overview 기준일 / audit 시작일(UTC)")
+    p.add_argument("--end", help="attendance 종료일 / audit 종료일(UTC, 당일 포함)")
+    p.add_argument("--name", help="overview 이름/이메일/사번 검색어")
+    out_opts(p); p.set_defaults(fn=cmd_export)
+
+    p = sub.add_parser("report", help="월말 부서별 보고서 (기본: 지난달)")
+    p.add_argument("--month", help="YYYY-MM")
+    p.add_argument("--workers", type=int, help="프로세스 수 (기본: CPU 수)")
+    p.add_argument("--out", help="저장 폴더 (기본: exports/monthly_<월>)")
+    p.add_argument("--gzip", action="store_true", help="부서별 CSV를 gzip 압축")
+    p.add_argument("--quiet", "-q", action="store_true", help="진행률 출력 안 함")
+    p.set_defaults(fn=cmd_report)
+
+    p = sub.add_parser("import-employees", help="직원 CSV 임포트")
+    p.add_argument("csv")
+    p.add_argument("--no-upsert", action="store_true", help="이미 있는 사번은 건너뜀")
+    p.add_argument("--quiet", "-q", action="store_true")
+    p.set_defaults(fn=cmd_import_employees)
+
+    p = sub.add_parser("rebuild", help="집계 테이블 재계산")
+    p.add_argument("what", nargs="+", choices=("weekly", "goals"))
+    p.set_defaults(fn=cmd_rebuild)
+
+    p = sub.add_parser("overcap", help="주간 캡 초과자 (기본: 이번 주, 설정의 캡)")
+    p.add_argument("--week", help="주 시작일(월요일) YYYY-MM-DD")
+    p.add_argument("--cap", type=int, help="캡(분)")
+    p.set_defaults(fn=cmd_overcap)
+
+    for name, module, help_ in (("backup", "app.backup", "온라인 백업 (python -m app.backup 인자)"),
+                                ("archive-audit", "app.audit_archive", "감사 로그 보관 (python -m app.audit_archive 인자)"),
+                                ("calibrate", "app.utils_security", "비밀번호 해시 비용 보정"),
+                                ("check", "app.db_check", "쿼리 플랜 점검"),
+                                ("check-calc", "app.calc_check", "근무시간 버킷 계산을 예전 분 단위 루프와 비교"),
+                                ("check-smoke", "app.smoke_check", "임시 DB로 명령줄/첫 실행 경로 점검"),
+                                ("serve", "app.server", "로컬 JSON HTTP 서비스 (python -m app.server 인자)")):
+        p = sub.add_parser(name, help=help_, add_help=False)   # -h/--help도 그 모듈로 넘김
+        p.set_defaults(fn=_delegate(module), delegated=True)
+    return ap
+
+def main(argv=None) -> int:
+    ap = build_parser()
+    args, rest = ap.parse_known_args(argv)
+    if rest and not getattr(args, "delegated", False):
+        ap.error(f"알 수 없는 인자: {' '.join(rest)}")
+    args.rest = rest
+    if args.db:
+        from app import core_db
+        core_db.configure(path=args.db)
+    return args.fn(args)   # 버퍼에 남은 감사 로그는 app.audit_log의 atexit가 기록
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,97 @@
-import sqlite3, shutil
+import sqlite3, shutil, threading, gzip, os
 from pathlib import Path
 from app.utils_paths import appdata_dir
 
 DB_PATH = appdata_dir() / "hris.db"
+POOL_SIZE = 4           # 스레드가 반납한 연결을 보관하는 최대 개수
+JOURNAL_MODE = "WAL"
+BUSY_TIMEOUT = 10.0     # 초
 
-def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+class ConnectionManager:
+    """스레드별로 오래 유지되는 연결 + 반납된 연결의 유휴 풀.
+
+    같은 스레드에서 get_conn()을 여러 번 불러도 하나의 연결을 재사용하므로
+    connect/스키마 파싱/파일 open 비용은 스레드당 한 번만 든다.
+    """
+    def __init__(self, path, pool_size: int = POOL_SIZE, journal_mode: str = JOURNAL_MODE):
+        self.path = Path(path); self.pool_size = pool_size; self.journal_mode = journal_mode
+        self._local = threading.local(); self._lock = threading.Lock()
+        self._idle: list[sqlite3.Connection] = []
+        self._live: set[sqlite3.Connection] = set()
+        self.opened = 0; self.reused = 0; self.closed = 0
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            if self.journal_mode.upper()=="WAL":
+                conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self.reused += 1
+            return conn
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop(); self.reused += 1
+            else:
+                conn = self._open(); self.opened += 1
+            self._live.add(conn)
+        self._local.conn = conn
+        return conn
+
+    def release(self):
+        """현재 스레드의 연결을 유휴 풀로 돌려준다(풀이 가득 차면 닫음). 워커 스레드 종료 시 호출."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None: return
+        self._local.conn = None
+        if conn.in_transaction: conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn); return
+            self._live.discard(conn)
+        conn.close(); self.closed += 1
+
+    def close_all(self):
+        """모든 연결을 닫는다(복원 전/종료 시). 다른 스레드는 다음 acquire에서 새로 연다."""
+        with self._lock:
+            conns = list(self._live); self._live.clear(); self._idle.clear()
+        for conn in conns:
+            try: conn.close()
+            except sqlite3.Error: pass
+            self.closed += 1
+        self._local = threading.local()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(opened=self.opened, reused=self.reused, closed=self.closed,
+                        live=len(self._live), idle=len(self._idle), pool_size=self.pool_size)
+
+_manager = ConnectionManager(DB_PATH)
+
+def configure(path=None, pool_size: int | None = None, journal_mode: str | None = None):
+    """DB 경로/풀 크기/저널 모드 변경. 기존 연결은 모두 닫힌다."""
+    global DB_PATH, _manager
+    _manager.close_all()
+    if path is not None: DB_PATH = Path(path)
+    _manager = ConnectionManager(DB_PATH,
+                                 pool_size if pool_size is not None else _manager.pool_size,
+                                 journal_mode if journal_mode is not None else _manager.journal_mode)
+
+def get_conn() -> sqlite3.Connection:
+    return _manager.acquire()
+
+def release_conn():
+    _manager.release()
+
+def close_all():
+    _manager.close_all()
+
+def conn_stats() -> dict:
+    return _manager.stats()
 
 def init_db():
     conn = get_conn(); cur = conn.cursor()
@@ -152,11 +236,213 @@ def init_db():
         );
         '''
     )
-    conn.commit(); conn.close()
+    conn.commit()
+    migrate(conn)
+
+# ===== Schema migrations (PRAGMA user_version) =====
+def _create_weekly_totals(conn):
+    conn.execute('''CREATE TABLE IF NOT EXISTS weekly_totals(
+        employee_id INTEGER NOT NULL,
+        week_start TEXT NOT NULL,          -- 해당 주 월요일 YYYY-MM-DD
+        regular INTEGER DEFAULT 0, overtime INTEGER DEFAULT 0, night INTEGER DEFAULT 0,
+        holiday INTEGER DEFAULT 0, total INTEGER DEFAULT 0, days INTEGER DEFAULT 0,
+        PRIMARY KEY(employee_id, week_start)
+    )''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_weekly_over ON weekly_totals(week_start, total)")
+    from app.repo import Repo  # 순환 import 방지
+    Repo()._rebuild_weekly_totals(conn)
+
+def _create_goal_rollups(conn):
+    """대시보드용 목표 집계: 직원×분기, 부서×분기별 가중 진행률 (weighted / weight_sum)."""
+    conn.execute('''CREATE TABLE IF NOT EXISTS goal_rollups(
+        employee_id INTEGER NOT NULL,
+        quarter TEXT NOT NULL,
+        department_id INTEGER,
+        goals INTEGER DEFAULT 0,
+        weight_sum REAL DEFAULT 0,         -- SUM(weight)
+        weighted REAL DEFAULT 0,           -- SUM(weight * progress)
+        progress REAL DEFAULT 0,           -- weighted / weight_sum
+        PRIMARY KEY(employee_id, quarter)
+    )''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS goal_dept_rollups(
+        quarter TEXT NOT NULL,
+        department_id INTEGER NOT NULL,    -- 부서 없음은 0
+        employees INTEGER DEFAULT 0,
+        goals INTEGER DEFAULT 0,
+        weight_sum REAL DEFAULT 0,
+        weighted REAL DEFAULT 0,
+        progress REAL DEFAULT 0,
+        PRIMARY KEY(quarter, department_id)
+    )''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rollup_rank ON goal_rollups(quarter, progress)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rollup_dept ON goal_rollups(quarter, department_id, progress)")
+    from app.repo import Repo  # 순환 import 방지
+    Repo()._rebuild_goal_rollups(conn)
+
+def _create_leave_ledger(conn):
+    """연차 잔액을 추가 전용 원장으로 바꾼다. 기존 leave_balances 값은 부여/사용 행으로 옮기고,
+    leave_balances는 원장 합계를 보여주는 뷰가 된다 (컬럼 이름은 그대로)."""
+    conn.execute('''CREATE TABLE IF NOT EXISTS leave_ledger(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,                -- 'grant'(부여/조정, ±) | 'use'(사용, −)
+        days REAL NOT NULL,
+        leave_request_id INTEGER,          -- use: 차감 근거 신청
+        note TEXT,
+        created_at TEXT DEFAULT (datetime('now'))
+    )''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_emp ON leave_ledger(employee_id, kind, days)")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_ledger_req ON leave_ledger(leave_request_id) WHERE leave_request_id IS NOT NULL")
+    conn.execute("""INSERT INTO leave_ledger(employee_id,kind,days,note)
+                    SELECT employee_id, 'grant', IFNULL(annual_total, 15.0), '잔액 이관' FROM leave_balances""")
+    conn.execute("""INSERT INTO leave_ledger(employee_id,kind,days,note)
+                    SELECT employee_id, 'use', -annual_used, '잔액 이관' FROM leave_balances WHERE annual_used > 0""")
+    conn.execute("DROP TABLE leave_balances")
+    conn.execute("""CREATE VIEW leave_balances AS
+                    SELECT employee_id,
+                           SUM(CASE WHEN kind='grant' THEN days ELSE 0 END) AS annual_total,
+                           -SUM(CASE WHEN kind='use' THEN days ELSE 0 END) AS annual_used,
+                           SUM(days) AS remaining
+                    FROM leave_ledger GROUP BY employee_id""")
+
+def _create_employee_fts(conn):
+    """직원 검색용 FTS5(trigram) 색인과 동기화 트리거. FTS5/trigram이 없는 SQLite면 건너뛰고
+    Repo는 LIKE 검색을 계속 쓴다."""
+    try:
+        conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5(
+                            name, email, employee_no, content='employees', content_rowid='id', tokenize='trigram')""")
+    except sqlite3.OperationalError:
+        return
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS employees_fts_ai AFTER INSERT ON employees BEGIN
+                        INSERT INTO employees_fts(rowid, name, email, employee_no) VALUES (new.id, new.name, new.email, new.employee_no);
+                    END""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS employees_fts_ad AFTER DELETE ON employees BEGIN
+                        INSERT INTO employees_fts(employees_fts, rowid, name, email, employee_no) VALUES ('delete', old.id, old.name, old.email, old.employee_no);
+                    END""")
+    conn.execute("""CREATE TRIGGER IF NOT EXISTS employees_fts_au AFTER UPDATE OF name, email, employee_no ON employees BEGIN
+                        INSERT INTO employees_fts(employees_fts, rowid, name, email, employee_no) VALUES ('delete', old.id, old.name, old.email, old.employee_no);
+                        INSERT INTO employees_fts(rowid, name, email, employee_no) VALUES (new.id, new.name, new.email, new.employee_no);
+                    END""")
+    conn.execute("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')")
+
+# (버전, 설명, SQL 스크립트 또는 conn을 받는 함수). 이미 배포된 항목은 수정하지 말고 새 버전을 추가할 것.
+MIGRATIONS: list[tuple] = [
+    (1, "secondary indexes", '''
+        CREATE INDEX IF NOT EXISTS idx_employees_dept ON employees(department_id);
+        CREATE INDEX IF NOT EXISTS idx_ot_emp ON overtime_requests(employee_id);
+        CREATE INDEX IF NOT EXISTS idx_ot_stage ON overtime_requests(manager_status, hr_status);
+        CREATE INDEX IF NOT EXISTS idx_leave_emp ON leave_requests(employee_id);
+        CREATE INDEX IF NOT EXISTS idx_leave_stage ON leave_requests(manager_status, hr_status);
+        CREATE INDEX IF NOT EXISTS idx_corr_emp ON correction_requests(employee_id);
+        CREATE INDEX IF NOT EXISTS idx_corr_stage ON correction_requests(manager_status, hr_status);
+        CREATE INDEX IF NOT EXISTS idx_audit_actor ON audit_logs(actor_user_id);
+        CREATE INDEX IF NOT EXISTS idx_audit_target ON audit_logs(target_type, target_id);
+        CREATE INDEX IF NOT EXISTS idx_goals_quarter ON goals(quarter, employee_id, progress);
+        CREATE INDEX IF NOT EXISTS idx_goals_emp ON goals(employee_id, quarter);
+        CREATE INDEX IF NOT EXISTS idx_goals_status ON goals(status);
+        CREATE INDEX IF NOT EXISTS idx_goals_mstatus ON goals(manager_status);
+        CREATE INDEX IF NOT EXISTS idx_goals_hstatus ON goals(hr_status);
+        CREATE INDEX IF NOT EXISTS idx_reviews_period ON reviews(period, employee_id, score);
+        CREATE INDEX IF NOT EXISTS idx_reviews_emp ON reviews(employee_id, period);
+        CREATE INDEX IF NOT EXISTS idx_feedback_to ON feedback(to_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_feedback_from ON feedback(from_id, created_at);
+    '''),
+    (2, "covering date index for timesheet_summary", '''
+        CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(date, employee_id, in_time, out_time, lunch_minutes);
+    '''),
+    (3, "weekly_totals", _create_weekly_totals),
+    (4, "password hash parameters", '''
+        ALTER TABLE settings ADD COLUMN password_params TEXT;   -- NULL이면 utils_security.DEFAULT_PARAMS
+    '''),
+    (5, "approval inbox indexes", '''
+        CREATE INDEX IF NOT EXISTS idx_ot_inbox ON overtime_requests(status, manager_status, hr_status);
+        CREATE INDEX IF NOT EXISTS idx_leave_inbox ON leave_requests(status, manager_status, hr_status);
+        CREATE INDEX IF NOT EXISTS idx_corr_inbox ON correction_requests(status, manager_status, hr_status);
+    '''),
+    (6, "leave ledger", _create_leave_ledger),
+    (7, "employee search index", _create_employee_fts),
+    (8, "audit timestamps", '''
+        ALTER TABLE audit_logs ADD COLUMN created_at TEXT;   -- UTC, 이전 기록은 NULL
+    '''),
+    (9, "audit filter indexes", '''
+        CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_logs(action);
+        CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_logs(created_at);
+    '''),
+    (10, "goal rollups", _create_goal_rollups),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(conn=None) -> int:
+    return (conn or get_conn()).execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn=None) -> list[int]:
+    """user_version 이후의 마이그레이션을 버전별 트랜잭션으로 적용하고, 적용한 버전 목록을 반환."""
+    conn = conn or get_conn()
+    current = schema_version(conn); applied = []
+    for version, _desc, sql in MIGRATIONS:
+        if version <= current: continue
+        try:
+            if callable(sql):  # 함수형 마이그레이션: executescript 없이 한 트랜잭션 안에서 실행
+                conn.execute("BEGIN"); sql(conn)
+                conn.execute(f"PRAGMA user_version={version}"); conn.commit()
+            else:
+                conn.executescript(f"BEGIN;\n{sql}\nPRAGMA user_version={version};\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction: conn.rollback()
+            raise
+        applied.append(version)
+    if applied:
+        conn.execute("PRAGMA optimize")
+    return applied
+
+BACKUP_PAGES = 256     # 백업 한 단계에 복사할 페이지 수 (단계 사이에는 락을 놓는다)
+
+def backup_to(path: str | Path, pages: int = BACKUP_PAGES, progress=None, compress: bool | None = None) -> Path:
+    """sqlite3 온라인 백업 API로 일관된 스냅샷을 만든다 (WAL 내용 포함, 앱 사용 중에도 안전).
 
-def backup_to(path: str):
-    src = DB_PATH; dst = Path(path); dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
+    pages 단위로 나눠 복사하므로 다른 연결의 쓰기를 오래 막지 않는다. 도중에 다른 연결이 쓰면
+    SQLite가 백업을 처음부터 다시 진행한다. progress(복사한 페이지, 전체 페이지)는 단계마다 호출.
+    compress=None이면 확장자(.gz)로 판단해 gzip으로 저장한다. 임시 파일에 만든 뒤 교체한다.
+    """
+    from app.audit_log import get_audit_writer  # 순환 import 방지
+    get_audit_writer().flush()   # 버퍼에 있는 감사 로그까지 스냅샷에 포함
+    dst = Path(path); dst.parent.mkdir(parents=True, exist_ok=True)
+    if compress is None: compress = dst.suffix == ".gz"
+    tmp = dst.with_name(dst.name + ".part"); raw = tmp.with_name(tmp.name + ".db") if compress else tmp
+    src = sqlite3.connect(DB_PATH, timeout=BUSY_TIMEOUT)
+    try:
+        out = sqlite3.connect(raw)
+        try:
+            src.backup(out, pages=pages,
+                       progress=(lambda _st, remaining, total: progress(total - remaining, total)) if progress else None)
+            out.execute("PRAGMA journal_mode=DELETE")   # 스냅샷은 -wal 없이 단일 파일
+        finally:
+            out.close()
+        if compress:
+            with open(raw, "rb") as f, gzip.open(tmp, "wb", compresslevel=6) as g:
+                shutil.copyfileobj(f, g, 1 << 20)
+            raw.unlink()
+        os.replace(tmp, dst)
+    except BaseException:
+        for p in (tmp, raw): p.unlink(missing_ok=True)
+        raise
+    finally:
+        src.close()
+    return dst
 
-def restore_from(path: str):
-    src = Path(path); shutil.copy2(src, DB_PATH)
+def restore_from(path: str | Path):
+    """백업 파일(.db 또는 .db.gz)로 현재 DB를 교체. 모든 연결을 닫은 뒤 진행하므로 앱 재시작이 필요하다."""
+    from app.audit_log import get_audit_writer  # 순환 import 방지
+    get_audit_writer().flush()   # 버퍼에 남은 감사 로그는 교체 전 DB에 기록
+    src = Path(path); close_all()
+    for suffix in ("-wal", "-shm"):
+        Path(str(DB_PATH) + suffix).unlink(missing_ok=True)
+    if src.suffix == ".gz":
+        with gzip.open(src, "rb") as g, open(DB_PATH, "wb") as f:
+            shutil.copyfileobj(g, f, 1 << 20)
+    else:
+        shutil.copy2(src, DB_PATH)
+    from app.biz_calendar import get_calendar
+    from app.directory import get_directory
+    from app.review_stats import get_review_stats
+    get_calendar().invalidate(); get_directory().invalidate(); get_review_stats().invalidate()
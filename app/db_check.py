@@ -0,0 +1,180 @@
+"""Repo 쿼리 플랜 점검: 임시 DB에서 모든 Repo 메서드를 실행하며 SQL을 수집하고
+EXPLAIN QUERY PLAN 결과에 테이블 풀스캔(SCAN)이 있으면 실패로 보고한다.
+
+    python -m app.db_check      # 문제 없으면 종료코드 0
+"""
+import sys, tempfile
+from pathlib import Path
+from app import core_db
+from app.repo import Repo
+
+# (메서드, 인자, 풀스캔 허용 여부). 전체 목록 조회처럼 의도적으로 모든 행을 읽는 호출만 허용.
+# Repo에 public 메서드를 추가하면 여기에도 등록해야 점검이 통과한다.
+CALLS: list[tuple[str, tuple, bool]] = [
+    ("user_by_username", ("admin",), False),
+    ("users", (), True),
+    ("create_user", ("check_user", "00", "00", "user", 1), False),
+    ("update_user_password", (1, "00", "00"), False),
+    ("update_user_role", (1, "admin", None), False),
+    ("delete_user", (999,), False),
+    ("departments", (), True),
+    ("add_department", ("점검팀",), False),
+    ("employees", (), True),
+    ("employee", (1,), False),
+    ("add_employee", ("CHK1", "점검", "chk@example.com", 2, None), False),
+    ("import_employees", ([[("CHK2", "점검2", "chk2@example.com", 2, None), ("CHK1", "점검", "chk@example.com", 3, "팀장")]],), False),
+    ("import_employees", ([[("CHK3", "점검3", "chk3@example.com", 2, None), ("CHK1", "점검", "x@example.com", 3, None)]], False), False),
+    ("attendance_for", (1, "2025-01-06"), False),
+    ("attendance_range", (1, "2025-01-06", "2025-01-12"), False),
+    ("upsert_attendance", (dict(employee_id=1, date="2025-01-06", in_time="09:00", out_time="18:00"),), False),
+    ("overview_export", ("2025-01-06", None, None), True),
+    ("overview_export", ("2025-01-06", 2, None), False),
+    ("audit_export", (), True),                          # 전체 감사 로그
+    ("attendance_export", ("2025-01-01", "2025-01-31"), False),
+    ("attendance_export", ("2025-01-01", "2025-01-31", 2), False),
+    ("timesheet_summary", ("2025-01-01", "2025-01-31"), True),   # 전체 직원 목록
+    ("timesheet_summary", ("2025-01-01", "2025-01-31", 2), False),
+    ("week_total", (1, "2025-01-06"), False),
+    ("over_cap", ("2025-01-06", 3120), False),
+    ("rebuild_weekly_totals", (), True),                  # 전체 재계산
+    ("save_overtime", (dict(employee_id=2, date="2025-01-06", start_time="18:00", end_time="20:00", minutes=120),), False),
+    ("overtimes_for_role", ("manager", 2), False),
+    ("overtimes_for_role", ("hr", None), False),
+    ("overtimes_for_role", ("admin", None), True),
+    ("overtimes_for_role", ("admin", None, 100, None, 50), False),
+    ("overtimes_for_role", ("manager", 2, None, 1, 50), False),
+    ("set_overtime_stage", (1, "manager", True), False),
+    ("save_leave", (dict(employee_id=2, start_date="2025-01-07", end_date="2025-01-07", type="연차"),), False),
+    ("leaves_for_role", ("manager", 2), False),
+    ("leaves_for_role", ("hr", None), False),
+    ("leaves_for_role", ("admin", None), True),
+    ("set_leave_stage", (1, "manager", True), False),
+    ("save_correction", (dict(employee_id=2, date="2025-01-06", new_in_time="09:00", new_out_time="18:00"),), False),
+    ("corrections_for_role", ("manager", 2), False),
+    ("corrections_for_role", ("hr", None), False),
+    ("corrections_for_role", ("admin", None), True),
+    ("set_correction_stage", (1, "manager", True), False),
+    ("decide_requests", ([("overtime", 1), ("leave", 1), ("correction", 1), ("overtime", 999)], "hr", True, 1), False),
+    ("decide_requests", ([("overtime", 2), ("leave", 2)], "manager", False, 1, 2), False),
+    ("inbox", ("manager", 2), False),
+    ("inbox", ("hr", None, "leave"), False),
+    ("inbox", ("admin", None, None, 100, None, 50), False),
+    ("inbox", ("admin", None, None, None, 3, 50), False),
+    ("inbox", ("user", None), False),
+    ("inbox_counts", ("manager", 2), False),
+    ("inbox_counts", ("hr", None), False),
+    ("inbox_counts", ("admin", None), False),
+    ("overview", ("2025-01-06", None, None), True),
+    ("overview", ("2025-01-06", 2, None), False),
+    ("overview", ("2025-01-06", None, "kim"), False),  # trigram FTS 색인
+    ("overview", ("2025-01-06", None, "김"), True),    # 3글자 미만은 LIKE 부분일치
+    ("search_employees", ("example",), False),
+    ("search_employees", ("A0",), True),
+    ("overview_page", ("2025-01-06", None, None, 1, None, 100), False),
+    ("overview_page", ("2025-01-06", 2, None, None, 3, 100), False),
+    ("get_settings", (), True),                          # 단일 행
+    ("update_settings", (), False),
+    ("holidays", (), True),
+    ("holiday_dates", ("2025-01-01", "2025-12-31"), False),
+    ("add_holiday", ("2025-01-01", "신정"), False),
+    ("delete_holiday", ("2025-01-01",), False),
+    ("get_leave_balance", (1,), False),
+    ("set_leave_total", (1, 17.0), False),
+    ("business_days", ("2025-01-01", "2025-01-31"), False),
+    ("leave_balances", (), True),                        # 전체 직원 잔액
+    ("leave_balances", (2,), False),
+    ("leave_ledger", (1,), False),
+    ("audit", (1, "check", "request", 1), False),
+    ("audit_recent", (), True),                          # 첫 페이지: rowid 역순 스캔 후 LIMIT에서 멈춤
+    ("audit_page", (100, 50), False),
+    ("audit_page", (None, 50, 10), False),
+    ("audit_page", (None, 50, None, 1), False),
+    ("audit_page", (None, 50, None, None, "hr_approve"), False),
+    ("audit_page", (None, 50, None, None, None, "leave", 1), False),
+    ("audit_page", (None, 50, None, None, None, None, None, "2025-01-01", "2025-12-31"), False),
+    ("archive_audit", (365,), False),
+    ("archive_audit", (0, "2999-01-01"), False),         # 전부 보관 DB로 → 아래는 ATTACH 조회 점검
+    ("audit_page", (100, 50, None, 1, None, None, None, "2020-01-01"), False),
+    ("audit_export", (None, None, "user_delete", None, None, "2020-01-01"), False),
+    ("goals_for_role", ("admin", None, None, "2025Q3"), False),
+    ("goals_for_role", ("admin", None, None, None), True),
+    ("goals_for_role", ("manager", 3, 2, "2025Q3"), False),
+    ("goals_for_role", ("user", 2, None, "2025Q3"), False),
+    ("create_goal", (2, "2025Q3", "점검", "", 1.0), False),
+    ("update_goal_progress", (1, 50.0), False),
+    ("submit_goal", (1,), False),
+    ("approve_goal_stage", (1, "manager", True), False),
+    ("add_review", (2, 1, "2025Q3", "peer", 4.0, ""), False),
+    ("reviews_for_role", ("admin", None, None, "2025Q3"), False),
+    ("reviews_for_role", ("manager", 3, 2, "2025Q3"), False),
+    ("reviews_for_role", ("user", 2, None, "2025Q3"), False),
+    ("review_avg_by_employee", ("2025Q3",), False),
+    ("review_avg_by_employee", (None,), True),
+    ("review_stats", ("2025Q3",), False),
+    ("review_stats", (None,), True),                     # 전체 기간
+    ("competencies", (), True),
+    ("add_competency", ("점검", ""), False),
+    ("set_employee_competency", (1, 1, 3, None), False),
+    ("employee_competencies", (1,), False),
+    ("add_feedback", (1, 2, "점검", "manager"), False),
+    ("feedback_received", (2,), False),
+    ("feedback_given", (1,), False),
+    ("goal_progress_avg_by_employee", ("2025Q3",), False),
+    ("goal_progress_avg_by_employee", (None,), True),
+    ("pending_goal_counts", (), False),
+    ("goal_rollup_rank", ("2025Q3",), False),
+    ("goal_rollup_rank", ("2025Q3", 5, True), False),
+    ("goal_rollup_rank", ("2025Q3", 5, False, 2), False),
+    ("goal_dept_rollups", ("2025Q3",), False),
+    ("rebuild_goal_rollups", (), True),                  # 전체 재계산
+]
+
+_PLANNED = ("SELECT", "UPDATE", "DELETE", "WITH", "INSERT")
+
+def _scans(conn, sql: str) -> list[str]:
+    """테이블 풀스캔 항목만 (서브쿼리 co-routine, json_each/FTS 같은 가상 테이블, 스키마 조회는 제외)."""
+    plan = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+    return [d for d in (r["detail"] for r in plan)
+            if d.startswith("SCAN ") and d not in ("SCAN CONSTANT ROW", "SCAN sqlite_master")
+            and not d.startswith("SCAN (subquery") and "VIRTUAL TABLE" not in d]
+
+def check_query_plans() -> tuple[list[str], list[str]]:
+    """(실패 메시지 목록, 점검하지 않은 Repo 메서드 목록)을 반환."""
+    from app.seed import seed
+    orig = core_db.DB_PATH
+    failures: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        core_db.configure(path=Path(tmp) / "plan_check.db")
+        try:
+            seed()
+            repo = Repo(); conn = core_db.get_conn()
+            for name, args, allow_scan in CALLS:
+                stmts: list[str] = []
+                conn.set_trace_callback(stmts.append)
+                try:
+                    getattr(repo, name)(*args)
+                finally:
+                    conn.set_trace_callback(None)
+                if allow_scan: continue
+                for sql in stmts:
+                    if not sql.lstrip().upper().startswith(_PLANNED): continue
+                    if sql.lstrip().upper().startswith("INSERT") and " SELECT " not in sql.upper(): continue
+                    # 감사 로그 보관 DB(arc)는 호출이 끝나면 DETACH되므로 같은 인덱스를 가진 본 DB 테이블로 플랜을 본다
+                    for detail in _scans(conn, sql.replace("arc.", "main.")):
+                        failures.append(f"{name}{args!r}: {detail}\n    {' '.join(sql.split())}")
+        finally:
+            core_db.configure(path=orig)
+    covered = {name for name, _a, _s in CALLS}
+    missing = sorted(n for n in dir(Repo) if not n.startswith("_") and callable(getattr(Repo, n)) and n not in covered)
+    return failures, missing
+
+def main() -> int:
+    failures, missing = check_query_plans()
+    for f in failures: print("SCAN:", f)
+    for m in missing: print("미점검 Repo 메서드:", m)
+    if failures or missing: return 1
+    print(f"OK: {len(CALLS)}개 호출, 풀스캔 없음")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
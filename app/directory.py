@@ -0,0 +1,76 @@
+"""직원/부서/사용자 디렉터리 캐시: 화면에서 ID를 이름·부서로 바꿀 때 DB를 다시 읽지 않도록 메모리에 둔다.
+
+    d = get_directory()
+    d.employee(3)["name"]; d.by_no("A003"); d.in_department(2); d.department_of(3); d.label(3)
+
+처음 쓸 때 employees/departments/users를 한 번씩 읽어 id, 사번, 부서별 dict를 만든다 (조회 O(1)).
+직원·부서·사용자를 바꾸는 Repo 메서드(add_employee, import_employees, add_department,
+create_user/update_user_role/delete_user)가 invalidate()를 부른다.
+"""
+import threading
+from app import core_db
+
+class _Snapshot:
+    __slots__ = ("employees", "by_no", "by_dept", "departments", "users")
+
+    def __init__(self, conn):
+        self.employees = {r["id"]: dict(r) for r in conn.execute("SELECT * FROM employees")}
+        self.by_no = {e["employee_no"]: e for e in self.employees.values()}
+        self.by_dept: dict[int, list[dict]] = {}
+        for e in sorted(self.employees.values(), key=lambda e: e["id"]):
+            self.by_dept.setdefault(e["department_id"], []).append(e)
+        self.departments = {r["id"]: r["name"] for r in conn.execute("SELECT id, name FROM departments")}
+        self.users = {r["id"]: dict(r) for r in conn.execute("SELECT id, username, role, employee_id FROM users")}
+
+class Directory:
+    def __init__(self):
+        self._snap: _Snapshot | None = None; self._path = None
+        self._lock = threading.Lock(); self._gen = 0
+
+    def _data(self) -> _Snapshot:
+        snap = self._snap
+        if snap is None or self._path != core_db.DB_PATH:
+            with self._lock:
+                gen = self._gen
+                snap = _Snapshot(core_db.get_conn())
+                if gen == self._gen:   # 읽는 도중 invalidate되었으면 이번 결과는 보관하지 않음
+                    self._snap = snap; self._path = core_db.DB_PATH
+        return snap
+
+    def invalidate(self):
+        self._gen += 1; self._snap = None
+
+    def employee(self, employee_id: int | None) -> dict | None:
+        return self._data().employees.get(employee_id)
+
+    def by_no(self, employee_no: str) -> dict | None:
+        return self._data().by_no.get(employee_no)
+
+    def in_department(self, department_id: int) -> list[dict]:
+        return self._data().by_dept.get(department_id, [])
+
+    def department_of(self, employee_id: int | None) -> int | None:
+        e = self.employee(employee_id)
+        return e["department_id"] if e else None
+
+    def department_name(self, department_id: int | None) -> str:
+        return self._data().departments.get(department_id, "" if department_id is None else str(department_id))
+
+    def user(self, user_id: int | None) -> dict | None:
+        return self._data().users.get(user_id)
+
+    def label(self, employee_id: int | None) -> str:
+        """표시용 '이름(ID)'. 없는 직원이면 ID만."""
+        e = self.employee(employee_id)
+        return f"{e['name']}({employee_id})" if e else ("" if employee_id is None else str(employee_id))
+
+    def user_label(self, user_id: int | None) -> str:
+        u = self.user(user_id)
+        if not u: return "" if user_id is None else str(user_id)
+        e = self.employee(u["employee_id"])
+        return f"{e['name']}({u['username']})" if e else u["username"]
+
+_directory = Directory()
+
+def get_directory() -> Directory:
+    return _directory
@@ -0,0 +1,33 @@
+"""조회 결과를 CSV(선택적으로 gzip)로 스트리밍 저장. Tk를 쓰지 않으므로 워커 스레드나 CLI에서 호출한다.
+
+    cols, batches = Repo().audit_export()
+    write_csv(cols, batches, export_path("audit", compress=True))
+"""
+import csv, gzip, os, datetime
+
+def export_dir() -> str:
+    folder = os.path.join(os.getcwd(), 'exports'); os.makedirs(folder, exist_ok=True)
+    return folder
+
+def export_path(base_name: str, compress: bool = False) -> str:
+    ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(export_dir(), f'{base_name}_{ts}.csv' + ('.gz' if compress else ''))
+
+def write_csv(cols, batches, path: str, compress: bool | None = None, progress=None) -> int:
+    """batches(행 리스트의 iterable)를 path에 쓰고 쓴 행 수를 반환. compress=None이면 확장자(.gz)로 판단.
+    임시 파일(.part)에 쓴 뒤 교체하므로 실패해도 반쯤 쓴 파일이 남지 않는다. progress(누적 행 수)는 배치마다 호출."""
+    if compress is None: compress = path.endswith(".gz")
+    tmp = path + ".part"; n = 0
+    opener = (lambda p: gzip.open(p, "wt", compresslevel=6, encoding="utf-8-sig", newline="")) if compress \
+        else (lambda p: open(p, "w", encoding="utf-8-sig", newline=""))
+    try:
+        with opener(tmp) as f:
+            w = csv.writer(f); w.writerow(cols)
+            for rows in batches:
+                w.writerows(rows); n += len(rows)
+                if progress: progress(n)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+    return n
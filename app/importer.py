@@ -0,0 +1,77 @@
+"""직원 CSV 임포트: 파일을 한 줄씩 읽어 검증하고, 통과한 행은 chunk 단위로 Repo.import_employees에
+넘겨 한 트랜잭션으로 반영한다. 거부된 행은 사유와 함께 별도 CSV로 남긴다.
+
+CSV 형식: employee_no,name,email,department_id,position  ('#'으로 시작하는 줄, 헤더 줄은 무시)
+"""
+import csv
+from pathlib import Path
+from app.repo import Repo
+
+COLUMNS = ("employee_no", "name", "email", "department_id", "position")
+CHUNK_SIZE = 1000
+
+def rejected_path_for(path: str | Path) -> Path:
+    p = Path(path)
+    return p.with_name(p.stem + "_rejected.csv")
+
+def _validate(row: list[str], dept_ids: set[int], seen: set[str]) -> tuple[tuple | None, str | None]:
+    if len(row) != len(COLUMNS):
+        return None, f"컬럼 수 오류({len(row)}개, {len(COLUMNS)}개 필요)"
+    eno, name, email, dept, position = (x.strip() for x in row)
+    if not eno or not name or not email:
+        return None, "필수값 누락(사번/이름/이메일)"
+    if "@" not in email:
+        return None, "이메일 형식 오류"
+    try: dept_id = int(dept)
+    except ValueError: return None, f"부서ID가 숫자가 아님: {dept!r}"
+    if dept_id not in dept_ids:
+        return None, f"없는 부서ID: {dept_id}"
+    if eno in seen:
+        return None, "파일 내 중복 사번"
+    seen.add(eno)
+    return (eno, name, email, dept_id, position or None), None
+
+def import_employees_csv(path: str | Path, repo: Repo | None = None, upsert: bool = True,
+                         chunk_size: int = CHUNK_SIZE, progress=None,
+                         rejected_path: str | Path | None = None) -> dict:
+    """CSV를 스트리밍으로 임포트. 모든 유효 행은 한 트랜잭션으로 들어가며 실패 시 전부 롤백된다.
+    progress(읽은 줄 수, 거부 건수)는 chunk마다 호출. 거부 행이 있으면 rejected_path
+    (기본: <파일명>_rejected.csv)에 원본 컬럼 + line, reason을 기록한다.
+    반환: {inserted, updated, rejected, rejected_path}"""
+    repo = repo or Repo()
+    dept_ids = {r["id"] for r in repo.departments()}
+    seen: set[str] = set(); line_of: dict[str, tuple[int, list[str]]] = {}
+    rejected: list[tuple[int, list[str], str]] = []
+    state = {"lines": 0}
+
+    def chunks():
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            chunk: list[tuple] = []
+            for line_no, row in enumerate(csv.reader(f), start=1):
+                state["lines"] = line_no
+                if not row or not "".join(row).strip() or row[0].lstrip().startswith("#"): continue
+                if line_no == 1 and row[0].strip().lower() == COLUMNS[0]: continue   # 헤더
+                rec, reason = _validate(row, dept_ids, seen)
+                if rec is None:
+                    rejected.append((line_no, row, reason)); continue
+                if not upsert: line_of[rec[0]] = (line_no, row)
+                chunk.append(rec)
+                if len(chunk) >= chunk_size:
+                    yield chunk; chunk = []
+            if chunk: yield chunk
+
+    res = repo.import_employees(chunks(), upsert=upsert,
+                                progress=(lambda _n: progress(state["lines"], len(rejected))) if progress else None)
+    for eno in res.pop("skipped"):
+        line_no, row = line_of[eno]
+        rejected.append((line_no, row, "이미 존재하는 사번(덮어쓰기 안 함)"))
+    out = None
+    if rejected:
+        rejected.sort(key=lambda x: x[0])
+        out = Path(rejected_path) if rejected_path else rejected_path_for(path)
+        with open(out, "w", newline="", encoding="utf-8-sig") as f:
+            w = csv.writer(f); w.writerow(["line", *COLUMNS, "reason"])
+            for line_no, row, reason in rejected:
+                w.writerow([line_no, *(row + [""] * (len(COLUMNS) - len(row)))[:len(COLUMNS)], reason])
+    if progress: progress(state["lines"], len(rejected))
+    return {**res, "rejected": len(rejected), "rejected_path": out}
@@ -1,12 +1,36 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+import logging, time
+from tkinter import ttk, messagebox, filedialog, simpledialog
 from datetime import datetime, date
-from app.seed import seed
+from pathlib import Path
+from app.seed import ensure_db
 from app.repo import Repo
-from app.utils_security import pbkdf2_verify, pbkdf2_hash
-from app.utils_time import today_str, week_range_of, to_minutes, minutes_to_hhmm, DAILY_REGULAR_MINUTES, calc_work_buckets, WEEKLY_MAX_MINUTES
-from app.ui_common import export_tree_to_csv
-from app.core_db import backup_to, restore_from
+from app.utils_security import hash_password, verify_password, needs_rehash, DEFAULT_PARAMS
+from app.utils_time import today_str, week_range_of, month_range_of, to_minutes, minutes_to_hhmm, DAILY_REGULAR_MINUTES, calc_work_buckets, calc_work_buckets_batch, WEEKLY_MAX_MINUTES
+from app.ui_common import export_tree_to_csv, export_rows_to_csv, export_query_to_csv, LazyTree
+from app.core_db import backup_to, restore_from, close_all
+from app import backup
+from app.ui_async import BackgroundExecutor
+from app.biz_calendar import get_calendar
+from app.directory import get_directory
+from app.audit_log import get_audit_writer
+from app import audit_archive
+from app.importer import import_employees_csv
+from app.utils_paths import appdata_dir
+
+log = logging.getLogger("hris")
+
+class StartupTimer:
+    """시작 단계별 소요 시간 기록. mark(name)은 직전 mark 이후 경과 시간을 name으로 남긴다."""
+    def __init__(self):
+        self.t0 = self.last = time.perf_counter(); self.parts: list[tuple[str, float]] = []
+
+    def mark(self, name: str):
+        now = time.perf_counter(); self.parts.append((name, now - self.last)); self.last = now
+
+    def summary(self) -> str:
+        total = self.last - self.t0
+        return " ".join(f"{n}={d*1000:.0f}ms" for n, d in self.parts) + f" total={total*1000:.0f}ms"
 
 # ---- 기본 스타일 살짝 손봄(이미지와 톤 맞춰 약간 차분하게) ----
 def apply_style(root: tk.Tk):
@@ -23,14 +47,35 @@ def apply_style(root: tk.Tk):
 
 class App(tk.Tk):
     def __init__(self):
+        self.timer = StartupTimer()
         super().__init__()
         self.title("HRIS (Zero-Dependency — Performance Edition)")
         self.geometry("1280x820")
-        apply_style(self)
+        apply_style(self); self.timer.mark("tk")
         self.repo = Repo()
-        seed()
+        self.db_state = ensure_db(); self.timer.mark(f"db({self.db_state})")
         self.user = None
-        self._build_login()
+        self.lbl_busy = ttk.Label(self, text="", foreground="#6b7280"); self.lbl_busy.pack(side="bottom", anchor="e", padx=8)
+        self.bg = BackgroundExecutor(self, on_busy=self._on_busy)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._build_login(); self.timer.mark("login_ui")
+        self.after_idle(lambda: log.info("startup %s", self.timer.summary()))
+
+    def _password_params(self) -> str:
+        return self.repo.get_settings()["password_params"] or DEFAULT_PARAMS
+
+    def _status(self, text: str):
+        self.lbl_busy.config(text=text)
+
+    def _on_busy(self, busy: bool):
+        self.lbl_busy.config(text="불러오는 중…" if busy else "")
+        self.config(cursor="watch" if busy else "")
+
+    def _on_close(self):
+        self.bg.shutdown(); get_audit_writer().close(); self.destroy()
+
+    def _audit(self, action: str, target_type: str, target_id: int | None, detail: str | None = None):
+        self.repo.audit(self.user["id"] if self.user else None, action, target_type, target_id, detail)
 
     # ===== Login =====
     def _build_login(self):
@@ -40,14 +85,26 @@ class App(tk.Tk):
         u = tk.Entry(win); p = tk.Entry(win, show="*")
         u.grid(row=0, column=1, padx=8, pady=6); p.grid(row=1, column=1, padx=8, pady=6)
         err = tk.Label(win, text="", fg="#b91c1c"); err.grid(row=2, column=0, columnspan=2)
-        def do_login():
-            row = self.repo.user_by_username(u.get().strip())
+        def check(username, password):  # 워커 스레드: 조회 + 해시 검증 (+ 파라미터가 바뀌었으면 재해시)
+            row = self.repo.user_by_username(username)
+            if not row: return None, "존재하지 않는 계정입니다."
+            if not verify_password(password, row["password_hash"], row["salt"]): return None, "비밀번호가 올바르지 않습니다."
+            params = self._password_params()
+            if needs_rehash(row["password_hash"], params):
+                self.repo.update_user_password(row["id"], *hash_password(password, params))
+            get_directory().employee(row["employee_id"])   # 디렉터리 캐시를 로그인 중에 미리 채움
+            return row, ""
+        def done(res):
+            row, msg = res; btn.config(state="normal")
             if not row:
-                err.config(text="존재하지 않는 계정입니다."); return
-            if not pbkdf2_verify(p.get(), row["salt"], row["password_hash"]):
-                err.config(text="비밀번호가 올바르지 않습니다."); return
-            self.user = row; win.destroy(); self._build_main()
-        ttk.Button(win, text="로그인", command=do_login).grid(row=3, column=0, columnspan=2, pady=8)
+                err.config(text=msg); return
+            self.user = row; win.destroy(); self.timer = StartupTimer(); self._build_main()
+        def failed(exc):
+            btn.config(state="normal"); err.config(text=f"로그인 오류: {exc}")
+        def do_login():
+            btn.config(state="disabled"); err.config(text="확인 중…")
+            self.bg.submit("login", check, u.get().strip(), p.get(), on_done=done, on_error=failed)
+        btn = ttk.Button(win, text="로그인", command=do_login); btn.grid(row=3, column=0, columnspan=2, pady=8)
 
     # ===== Main Tabs =====
     def _build_main(self):
@@ -64,6 +121,8 @@ class App(tk.Tk):
             self.tab_approval = ttk.Frame(nb); self.tab_overview = ttk.Frame(nb)
             nb.add(self.tab_approval, text="결재관리")
             nb.add(self.tab_overview, text="사용자근무현황보기")
+        if role in ("admin","hr"):
+            self.tab_timesheet = ttk.Frame(nb); nb.add(self.tab_timesheet, text="근무시간 집계")
         if role in ("admin","hr"):
             self.tab_holidays = ttk.Frame(nb); self.tab_users = ttk.Frame(nb); self.tab_audit = ttk.Frame(nb); self.tab_settings = ttk.Frame(nb); self.tab_backup = ttk.Frame(nb)
             nb.add(self.tab_holidays, text="휴일 관리")
@@ -79,23 +138,25 @@ class App(tk.Tk):
         self.tab_feedback = ttk.Frame(nb); nb.add(self.tab_feedback, text="피드백")
         self.tab_dash = ttk.Frame(nb); nb.add(self.tab_dash, text="대시보드")
 
-        # Build UIs
-        self._build_daily(self.tab_daily)
-        self._build_apply(self.tab_apply)
-        self._build_my(self.tab_my)
-        if hasattr(self, "tab_approval"): self._build_approval(self.tab_approval)
-        if hasattr(self, "tab_overview"): self._build_overview(self.tab_overview)
-        if hasattr(self, "tab_holidays"): self._build_holidays(self.tab_holidays)
-        if hasattr(self, "tab_users"): self._build_users(self.tab_users)
-        if hasattr(self, "tab_audit"): self._build_audit(self.tab_audit)
-        if hasattr(self, "tab_settings"): self._build_settings(self.tab_settings)
-        if hasattr(self, "tab_backup"): self._build_backup(self.tab_backup)
-        # Performance
-        self._build_goals(self.tab_goals)
-        self._build_reviews(self.tab_reviews)
-        self._build_comp(self.tab_comp)
-        self._build_feedback(self.tab_feedback)
-        self._build_dash(self.tab_dash)
+        # 탭 내용은 처음 선택될 때 만든다 (각 탭의 조회도 그때 실행)
+        builders = [(self.tab_daily, self._build_daily), (self.tab_apply, self._build_apply), (self.tab_my, self._build_my)]
+        for name in ("approval", "overview", "timesheet", "holidays", "users", "audit", "settings", "backup"):
+            if hasattr(self, f"tab_{name}"): builders.append((getattr(self, f"tab_{name}"), getattr(self, f"_build_{name}")))
+        builders += [(self.tab_goals, self._build_goals), (self.tab_reviews, self._build_reviews), (self.tab_comp, self._build_comp),
+                     (self.tab_feedback, self._build_feedback), (self.tab_dash, self._build_dash)]
+        self._tab_builders = {str(tab): (tab, fn) for tab, fn in builders}
+        self.nb = nb; self.timer.mark("notebook")
+        if hasattr(self, "tab_approval"): self._refresh_inbox_badge()
+        nb.bind("<<NotebookTabChanged>>", lambda _e: self._build_selected_tab())
+        self._build_selected_tab(); self.timer.mark("first_tab")
+        self.after_idle(lambda: (self.timer.mark("idle"), log.info("main %s: %s", self.user["role"], self.timer.summary())))
+
+    def _build_selected_tab(self):
+        entry = self._tab_builders.pop(self.nb.select(), None)
+        if entry is None: return
+        tab, build = entry
+        t = time.perf_counter(); build(tab)
+        log.debug("tab %s built in %.0fms", self.nb.tab(tab, "text"), (time.perf_counter() - t) * 1000)
 
     # ===== Daily =====
     def _build_daily(self, parent):
@@ -128,8 +189,9 @@ class App(tk.Tk):
         for i in self.daily_tree.get_children(): self.daily_tree.delete(i)
         from datetime import datetime as dt
         d = dt.strptime(today, '%Y-%m-%d').date()
+        start, end = week_range_of(d)
         b = calc_work_buckets(a["in_time"] if a else None, a["out_time"] if a else None,
-                              (a["lunch_minutes"] if a else 60), d, False)
+                              (a["lunch_minutes"] if a else 60), d, get_calendar().is_holiday(d))
         rows = [
             ("일반근무", b["regular"], b["regular"], ""),
             ("연장", b["overtime"], b["overtime"], ""),
@@ -139,15 +201,9 @@ class App(tk.Tk):
         for r in rows:
             self.daily_tree.insert("", "end", values=(r[0], f"{r[1]//60}시간 {r[1]%60}분", r[2], r[3]))
 
-        # 주간 합계 + 캡 경고
-        start, end = week_range_of(date.today())
-        recs = self.repo.attendance_range(emp_id, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
-        total=0
-        for r in recs:
-            if r["in_time"] and r["out_time"]:
-                bd = dt.strptime(r["date"], '%Y-%m-%d').date()
-                bb = calc_work_buckets(r["in_time"], r["out_time"], (r["lunch_minutes"] or 0), bd, False)
-                total += bb["total"]
+        # 주간 합계 + 캡 경고 (weekly_totals 단건 조회)
+        w = self.repo.week_total(emp_id, start.strftime('%Y-%m-%d'))
+        total = w["total"] if w else 0
         self.lbl_week.config(text=f"{minutes_to_hhmm(total)} / {WEEKLY_MAX_MINUTES//60}시간")
         cap = self.repo.get_settings()["weekly_cap_minutes"] or 3120
         if total > cap:
@@ -176,10 +232,9 @@ class App(tk.Tk):
         s,e,t,reason = vals
         if t=="연차":
             bal = self.repo.get_leave_balance(self.user["employee_id"] or 1)
-            from datetime import datetime as dt
-            days = (dt.strptime(e,"%Y-%m-%d").date() - dt.strptime(s,"%Y-%m-%d").date()).days + 1
-            if (bal["annual_used"] or 0) + days > (bal["annual_total"] or 0):
-                messagebox.showwarning("경고", "연차 잔여가 부족합니다."); return
+            days = self.repo.business_days(s, e)   # 주말·휴일 제외
+            if days > bal["remaining"]:
+                messagebox.showwarning("경고", f"연차 잔여가 부족합니다. (필요 {days}일, 잔여 {bal['remaining']:g}일)"); return
         self.repo.save_leave(dict(employee_id=self.user["employee_id"] or 1, start_date=s, end_date=e, type=t, reason=reason))
         messagebox.showinfo("저장", "휴가 신청 완료")
 
@@ -220,12 +275,10 @@ class App(tk.Tk):
         emp = self.user["employee_id"] or 1
         recs = self.repo.attendance_range(emp, s, e)
         for i in self.my_tree.get_children(): self.my_tree.delete(i)
-        total=0; days=0
-        for r in recs:
-            worked=0
-            if r["in_time"] and r["out_time"]:
-                worked = to_minutes(r["out_time"]) - to_minutes(r["in_time"]) - (r["lunch_minutes"] or 0)
-                total += worked; days += 1
+        buckets, per_emp = calc_work_buckets_batch(recs, get_calendar())
+        t = per_emp.get(emp, {}); total = t.get("total", 0); days = t.get("days", 0)
+        for r, b in zip(recs, buckets):
+            worked = b["total"]
             state = "실근무" if worked>0 else "기록없음"
             self.my_tree.insert("", "end", values=(r["date"], state, minutes_to_hhmm(worked), r["note"] or "", worked))
         avg = int(total/days) if days else 0
@@ -238,54 +291,66 @@ class App(tk.Tk):
         ttk.Button(frm, text="선택 반려(매니저)", command=lambda:self._approve_stage('manager', False)).pack(side="left", padx=4)
         ttk.Button(frm, text="선택 승인(HR)", command=lambda:self._approve_stage('hr', True)).pack(side="left", padx=4)
         ttk.Button(frm, text="선택 반려(HR)", command=lambda:self._approve_stage('hr', False)).pack(side="left", padx=4)
+        ttk.Button(frm, text="전체 선택", command=lambda: self.approval_tree.selection_set(self.approval_tree.get_children())).pack(side="left", padx=4)
 
-        self.ot_tree = ttk.Treeview(parent, columns=("ID","사번","일자","시간","M","HR","최종","사유"), show="headings", height=6)
-        for c in ("ID","사번","일자","시간","M","HR","최종","사유"): self.ot_tree.heading(c, text=c)
-        self.ot_tree.pack(fill="x", padx=8, pady=4)
-
-        self.leave_tree = ttk.Treeview(parent, columns=("ID","사번","기간","구분","M","HR","최종","사유"), show="headings", height=6)
-        for c in ("ID","사번","기간","구분","M","HR","최종","사유"): self.leave_tree.heading(c, text=c)
-        self.leave_tree.pack(fill="x", padx=8, pady=4)
-
-        self.corr_tree = ttk.Treeview(parent, columns=("ID","사번","일자","출근","퇴근","점심","M","HR","최종"), show="headings", height=6)
-        for c in ("ID","사번","일자","출근","퇴근","점심","M","HR","최종"): self.corr_tree.heading(c, text=c)
-        self.corr_tree.pack(fill="x", padx=8, pady=4)
+        self.lbl_inbox = ttk.Label(frm, text="", foreground="#6b7280"); self.lbl_inbox.pack(side="left", padx=12)
 
+        cols = ("구분","ID","사번","이름","일자/기간","내용","처리 단계","M","HR","사유")
+        self.approval_lazy = LazyTree(parent, cols, key=lambda r: r["k"], to_values=self._inbox_values, page_size=100, executor=self.bg, height=18, selectmode="extended")
+        self.approval_lazy.pack(fill="both", expand=True, padx=8, pady=8); self.approval_tree = self.approval_lazy.tree
         self._reload_approval()
 
-    def _reload_approval(self):
-        role = self.user["role"]; dept_id = None
-        if role=="manager":
-            emp_id = self.user["employee_id"]
-            if emp_id:
-                e = [x for x in self.repo.employees() if x["id"]==emp_id]
-                if e: dept_id = e[0]["department_id"]
-
-        for t in (self.ot_tree, self.leave_tree, self.corr_tree):
-            for i in t.get_children(): t.delete(i)
+    KIND_LABEL = {"overtime": "연장근무", "leave": "휴가", "correction": "근태정정"}
+    STAGE_LABEL = {"manager": "매니저", "hr": "HR"}
 
-        for o in self.repo.overtimes_for_role(role, dept_id):
-            self.ot_tree.insert("", "end", values=(o["id"], o["employee_id"], o["date"], f"{o['start_time']}-{o['end_time']}({o['minutes']}분)", o["manager_status"], o["hr_status"], o["status"], o["reason"] or ""))
+    @classmethod
+    def _inbox_values(cls, r):
+        return (cls.KIND_LABEL[r["kind"]], r["id"], r["employee_no"], r["name"], r["period"], r["detail"],
+                cls.STAGE_LABEL[r["stage"]], r["manager_status"], r["hr_status"], r["reason"] or "")
 
-        for l in self.repo.leaves_for_role(role, dept_id):
-            self.leave_tree.insert("", "end", values=(l["id"], l["employee_id"], f"{l['start_date']}~{l['end_date']}", l["type"], l["manager_status"], l["hr_status"], l["status"], l["reason"] or ""))
+    def _manager_dept(self):
+        if not hasattr(self, "_mgr_dept"):
+            self._mgr_dept = None
+            emp_id = self.user["employee_id"]
+            if self.user["role"]=="manager" and emp_id:
+                self._mgr_dept = get_directory().department_of(emp_id)
+        return self._mgr_dept
 
-        for c in self.repo.corrections_for_role(role, dept_id):
-            self.corr_tree.insert("", "end", values=(c["id"], c["employee_id"], c["date"], c["new_in_time"] or "", c["new_out_time"] or "", c["new_lunch_minutes"] or "", c["manager_status"], c["hr_status"], c["status"]))
+    def _reload_approval(self):
+        role = self.user["role"]; dept_id = self._manager_dept()
+        self.approval_lazy.reload(lambda after=None, before=None, limit=None: self.repo.inbox(role, dept_id, None, after, before, limit))
+        self._refresh_inbox_badge()
+
+    def _refresh_inbox_badge(self):
+        def show(counts):
+            total = sum(counts.values())
+            self.nb.tab(self.tab_approval, text=f"결재관리 ({total})" if total else "결재관리")
+            if hasattr(self, "lbl_inbox"):
+                self.lbl_inbox.config(text="대기: " + " · ".join(f"{self.KIND_LABEL[k]} {n}" for k, n in counts.items()))
+        self.bg.submit("inbox_counts", self.repo.inbox_counts, self.user["role"], self._manager_dept(), on_done=show)
 
     def _approve_stage(self, stage: str, approve: bool):
-        t = None; sel=None
-        for tree in (self.ot_tree, self.leave_tree, self.corr_tree):
-            s = tree.selection()
-            if s: t=tree; sel=s[0]; break
-        if not t:
+        sel = self.approval_tree.selection()
+        if not sel:
             messagebox.showwarning("경고","항목을 선택하세요."); return
-        row = t.item(sel)["values"]; rid = int(row[0])
-        if t is self.ot_tree: self.repo.set_overtime_stage(rid, stage, approve)
-        elif t is self.leave_tree: self.repo.set_leave_stage(rid, stage, approve)
-        else: self.repo.set_correction_stage(rid, stage, approve)
-        self.repo.audit(self.user["id"], f"{stage}_{'approve' if approve else 'reject'}", "request", rid, None)
-        self._reload_approval(); messagebox.showinfo("완료","처리되었습니다.")
+        dept_id = None
+        if self.user["role"] == "manager":   # 매니저는 자기 부서 신청만 (server.ep_decide와 같은 규칙)
+            dept_id = self._manager_dept()
+            if not dept_id:
+                messagebox.showwarning("경고","소속 부서가 없는 매니저는 결재할 수 없습니다."); return
+        items = []
+        for iid in sel:
+            rid, kind_idx = divmod(int(iid), 3)   # inbox 키: id*3 + 유형 순번
+            items.append((self.repo.INBOX_KINDS[kind_idx], rid))
+        def done(results):
+            failed = [r for r in results if not r["ok"]]
+            msg = f"{len(results)-len(failed)}건 처리되었습니다."
+            if failed:
+                msg += f"\n처리 안 됨 {len(failed)}건:\n" + "\n".join(
+                    f"- {self.KIND_LABEL[r['kind']]} #{r['id']}: {r['message']}" for r in failed[:15])
+                if len(failed) > 15: msg += f"\n… 외 {len(failed)-15}건"
+            self._reload_approval(); (messagebox.showwarning if failed else messagebox.showinfo)("결과", msg)
+        self.bg.submit("decide", self.repo.decide_requests, items, stage, approve, self.user["id"], dept_id, on_done=done)
 
     # ===== Overview =====
     def _build_overview(self, parent):
@@ -294,25 +359,103 @@ class App(tk.Tk):
         ttk.Label(frm, text="이름/메일/사번").pack(side="left"); nameq = tk.Entry(frm); nameq.pack(side="left", padx=4)
         ttk.Label(frm, text="기준일 YYYY-MM-DD").pack(side="left"); base = tk.Entry(frm); base.insert(0, today_str()); base.pack(side="left", padx=4)
         ttk.Button(frm, text="검색", command=lambda:self._reload_overview(base.get(), int(dept.get() or "0"), nameq.get().strip() or None)).pack(side="left", padx=4)
-        ttk.Button(frm, text="CSV 내보내기", command=lambda: export_tree_to_csv(self.ov_tree, "overview")).pack(side="left", padx=4)
+        ttk.Button(frm, text="CSV 내보내기", command=lambda: self._export_overview(base.get(), int(dept.get() or "0"), nameq.get().strip() or None)).pack(side="left", padx=4)
 
         cols=("이름","사번","부서ID","직위","출근","퇴근","점심","휴가구분","비고","분")
-        self.ov_tree=ttk.Treeview(parent, columns=cols, show="headings", height=14)
-        for c in cols: self.ov_tree.heading(c, text=c)
-        self.ov_tree.pack(fill="both", expand=True, padx=8, pady=8)
+        self.ov_lazy = LazyTree(parent, cols, key=lambda r: r["id"], to_values=self._overview_values, executor=self.bg, height=14)
+        self.ov_lazy.pack(fill="both", expand=True, padx=8, pady=8); self.ov_tree = self.ov_lazy.tree
+
+        # 입력하면서 검색: 타이핑이 멈추면(300ms) 목록을 다시 조회하고, 순위가 높은 직원 몇 명을 제안
+        self.ov_suggest = tk.Listbox(frm, height=1, width=36, activestyle="none"); self.ov_suggest.pack(side="left", padx=4)
+        self._ov_after = None
+        def search():
+            self._ov_after = None; q = nameq.get().strip()
+            self._reload_overview(base.get(), int(dept.get() or "0"), q or None)
+            self.bg.submit("ov_suggest", self.repo.search_employees, q, 5, on_done=fill)
+        def fill(rows):
+            self.ov_suggest.delete(0, "end"); self.ov_suggest.config(height=max(1, len(rows)))
+            for r in rows: self.ov_suggest.insert("end", f"{r['employee_no']}  {r['name']}  {r['email']}")
+        def typed(_e):
+            if self._ov_after: self.after_cancel(self._ov_after)
+            self._ov_after = self.after(300, search)
+        def pick(_e):
+            sel = self.ov_suggest.curselection()
+            if not sel: return
+            nameq.delete(0, "end"); nameq.insert(0, self.ov_suggest.get(sel[0]).split()[0]); search()
+        nameq.bind("<KeyRelease>", typed); self.ov_suggest.bind("<<ListboxSelect>>", pick)
 
     def _reload_overview(self, base, dept_id, nameq):
-        rows = self.repo.overview(base, dept_id if dept_id>0 else None, nameq)
-        for i in self.ov_tree.get_children(): self.ov_tree.delete(i)
-        for r in rows:
-            worked = 0
-            if r["in_time"] and r["out_time"]:
-                worked = to_minutes(r["out_time"]) - to_minutes(r["in_time"]) - (r["lunch_minutes"] or 0)
-            self.ov_tree.insert("", "end", values=(
-                r["name"], r["employee_no"], r["department_id"], r["position"] or "",
+        # 새 검색은 진행 중인 이전 검색/페이지 요청을 대체한다
+        dept = dept_id if dept_id>0 else None
+        self.ov_lazy.reload(lambda after=None, before=None, limit=None: self.repo.overview_page(base, dept, nameq, after, before, limit))
+
+    def _export_overview(self, base, dept_id, nameq):
+        dept = dept_id if dept_id>0 else None
+        export_query_to_csv(self.bg, lambda: self.repo.overview_export(base, dept, nameq), f"overview_{base}", self._status)
+
+    @staticmethod
+    def _overview_values(r):
+        worked = 0
+        if r["in_time"] and r["out_time"]:
+            worked = to_minutes(r["out_time"]) - to_minutes(r["in_time"]) - (r["lunch_minutes"] or 0)
+        return (r["name"], r["employee_no"], r["department_id"], r["position"] or "",
                 r["in_time"] or "", r["out_time"] or "", r["lunch_minutes"] or "",
-                "휴가" if (r["mode"]=="vacation") else "", r["note"] or "", worked
-            ))
+                "휴가" if (r["mode"]=="vacation") else "", r["note"] or "", worked)
+
+    # ===== Timesheet (급여 마감) =====
+    def _build_timesheet(self, parent):
+        frm = ttk.Frame(parent); frm.pack(fill="x", padx=8, pady=8)
+        s = tk.Entry(frm, width=12); e = tk.Entry(frm, width=12); dept = tk.Entry(frm, width=6); dept.insert(0,"0")
+        def preset(rng):
+            a, b = rng(date.today())
+            s.delete(0,"end"); s.insert(0, a.strftime('%Y-%m-%d')); e.delete(0,"end"); e.insert(0, b.strftime('%Y-%m-%d'))
+        preset(month_range_of)
+        ttk.Label(frm, text="시작일").pack(side="left"); s.pack(side="left", padx=4)
+        ttk.Label(frm, text="종료일").pack(side="left"); e.pack(side="left", padx=4)
+        ttk.Label(frm, text="부서ID(0=전체)").pack(side="left"); dept.pack(side="left", padx=4)
+        ttk.Button(frm, text="이번주", command=lambda: preset(week_range_of)).pack(side="left", padx=2)
+        ttk.Button(frm, text="이번달", command=lambda: preset(month_range_of)).pack(side="left", padx=2)
+        ttk.Button(frm, text="조회", command=lambda: self._reload_timesheet(s.get().strip(), e.get().strip(), int(dept.get() or "0"))).pack(side="left", padx=4)
+        ttk.Button(frm, text="CSV 내보내기", command=self._export_timesheet).pack(side="left", padx=4)
+        ttk.Button(frm, text="근태 원본 CSV", command=lambda: self._export_attendance(s.get().strip(), e.get().strip(), int(dept.get() or "0"))).pack(side="left", padx=4)
+        ttk.Button(frm, text="이번주 캡 초과자", command=self._show_over_cap).pack(side="left", padx=4)
+        cols=("사번","이름","부서ID","근무일","일반","연장","야간","휴일","합계(분)")
+        self.ts_tree=ttk.Treeview(parent, columns=cols, show="headings", height=16)
+        for c in cols: self.ts_tree.heading(c, text=c)
+        self.ts_tree.pack(fill="both", expand=True, padx=8, pady=8)
+        self.ts_rows = []
+
+    def _reload_timesheet(self, s, e, dept_id):
+        self.bg.submit("timesheet", self.repo.timesheet_summary, s, e, dept_id if dept_id>0 else None,
+                       on_done=lambda rows: self._fill_timesheet(rows, (s, e)))
+
+    def _fill_timesheet(self, rows, rng):
+        self.ts_rows = [(r["employee_no"], r["name"], r["department_id"], r["days"], r["regular"], r["overtime"], r["night"], r["holiday"], r["total"])
+                        for r in rows]
+        self.ts_range = rng
+        for i in self.ts_tree.get_children(): self.ts_tree.delete(i)
+        for row in self.ts_rows:
+            self.ts_tree.insert("", "end", values=row)
+
+    def _show_over_cap(self):
+        ws = week_range_of(date.today())[0].strftime('%Y-%m-%d')
+        def query():
+            cap = self.repo.get_settings()["weekly_cap_minutes"] or 3120
+            return cap, self.repo.over_cap(ws, cap)
+        def done(res):
+            cap, rows = res
+            self._fill_timesheet(rows, (ws, "overcap"))
+            messagebox.showinfo("주간 캡", f"{ws} 주 캡({cap//60}시간) 초과: {len(rows)}명")
+        self.bg.submit("timesheet", query, on_done=done)   # 같은 표를 채우므로 조회와 같은 key (늦게 온 쪽만 반영)
+
+    def _export_timesheet(self):
+        if not self.ts_rows:
+            messagebox.showwarning("경고","먼저 조회하세요."); return
+        export_rows_to_csv(self.ts_tree["columns"], self.ts_rows, f"timesheet_{self.ts_range[0]}_{self.ts_range[1]}")
+
+    def _export_attendance(self, s, e, dept_id):
+        dept = dept_id if dept_id>0 else None
+        export_query_to_csv(self.bg, lambda: self.repo.attendance_export(s, e, dept), f"attendance_{s}_{e}", self._status)
 
     # ===== Holidays =====
     def _build_holidays(self, parent):
@@ -346,7 +489,7 @@ class App(tk.Tk):
         ttk.Button(frm, text="역할/직원 매핑", command=self._set_role).pack(side="left", padx=4)
         ttk.Button(frm, text="삭제", command=self._del_user).pack(side="left", padx=4)
 
-        cols=("ID","username","role","employee_id")
+        cols=("ID","username","role","직원")
         self.u_tree=ttk.Treeview(parent, columns=cols, show="headings", height=14)
         for c in cols: self.u_tree.heading(c, text=c)
         self.u_tree.pack(fill="both", expand=True, padx=8, pady=8)
@@ -355,7 +498,7 @@ class App(tk.Tk):
     def _reload_users(self):
         for i in self.u_tree.get_children(): self.u_tree.delete(i)
         for u in self.repo.users():
-            self.u_tree.insert("", "end", values=(u["id"], u["username"], u["role"], u["employee_id"]))
+            self.u_tree.insert("", "end", values=(u["id"], u["username"], u["role"], get_directory().label(u["employee_id"])))
 
     def _new_user(self):
         win = tk.Toplevel(self); win.title("새 사용자"); es = []
@@ -366,10 +509,11 @@ class App(tk.Tk):
             username, pw, role, emp = [x.get().strip() for x in es]
             if not username or not pw or role not in ("admin","hr","manager","user"):
                 messagebox.showwarning("경고","입력값 확인"); return
-            salt, h = pbkdf2_hash(pw)
             emp_id = int(emp) if emp else None
-            self.repo.create_user(username, salt, h, role, emp_id)
-            self._reload_users(); win.destroy()
+            def create():   # 워커 스레드: 해시 계산 + 저장
+                self.repo.create_user(username, *hash_password(pw, self._password_params()), role, emp_id)
+                self._audit("user_create", "user", None, f"{username} role={role} employee={emp_id}")
+            self.bg.submit(None, create, on_done=lambda _r: (self._reload_users(), win.destroy()))
         ttk.Button(win, text="저장", command=save).grid(row=4, column=0, columnspan=2, pady=6)
 
     def _reset_pw(self):
@@ -380,9 +524,11 @@ class App(tk.Tk):
         tk.Label(win, text="새 비밀번호").grid(row=0,column=0,padx=6,pady=6,sticky="e")
         e=tk.Entry(win, show="*"); e.grid(row=0,column=1,padx=6,pady=6)
         def save():
-            salt, h = pbkdf2_hash(e.get().strip())
-            self.repo.update_user_password(uid, salt, h)
-            win.destroy(); messagebox.showinfo("완료","변경되었습니다.")
+            pw = e.get().strip()
+            def change():   # 워커 스레드: 해시 계산 + 저장
+                self.repo.update_user_password(uid, *hash_password(pw, self._password_params()))
+                self._audit("user_password_reset", "user", uid)
+            self.bg.submit(None, change, on_done=lambda _r: (win.destroy(), messagebox.showinfo("완료","변경되었습니다.")))
         ttk.Button(win, text="저장", command=save).grid(row=1,column=0,columnspan=2,pady=6)
 
     def _set_role(self):
@@ -398,7 +544,7 @@ class App(tk.Tk):
             role=r.get().strip(); emp_id=int(e.get().strip()) if e.get().strip() else None
             if role not in ("admin","hr","manager","user"):
                 messagebox.showwarning("경고","역할값 확인"); return
-            self.repo.update_user_role(uid, role, emp_id)
+            self.repo.update_user_role(uid, role, emp_id); self._audit("user_role", "user", uid, f"role={role} employee={emp_id}")
             win.destroy(); self._reload_users()
         ttk.Button(win, text="저장", command=save).grid(row=2,column=0,columnspan=2,pady=6)
 
@@ -407,22 +553,59 @@ class App(tk.Tk):
         if not sel: return
         uid = int(self.u_tree.item(sel[0])["values"][0])
         if messagebox.askyesno("확인","삭제하시겠습니까?"):
-            self.repo.delete_user(uid); self._reload_users()
+            self.repo.delete_user(uid); self._audit("user_delete", "user", uid); self._reload_users()
 
     # ===== Audit =====
     def _build_audit(self, parent):
         frm = ttk.Frame(parent); frm.pack(fill="x", padx=8, pady=8)
-        ttk.Button(frm, text="CSV 내보내기", command=lambda: export_tree_to_csv(self.audit_tree, "audit")).pack(side="left")
-        cols=("ID","행위자","액션","타깃","상세")
-        self.audit_tree=ttk.Treeview(parent, columns=cols, show="headings", height=16)
-        for c in cols: self.audit_tree.heading(c, text=c)
-        self.audit_tree.pack(fill="both", expand=True, padx=8, pady=8)
+        self.audit_filter = {}
+        for key, label, width in (("actor", "행위자(ID/아이디)", 10), ("action", "액션", 14), ("target_type", "타깃 유형", 10),
+                                  ("target_id", "타깃 ID", 6), ("since", "from(UTC)", 10), ("until", "to", 10)):
+            ttk.Label(frm, text=label).pack(side="left", padx=(6, 2))
+            e = ttk.Entry(frm, width=width); e.pack(side="left"); e.bind("<Return>", lambda _e: self._reload_audit())
+            self.audit_filter[key] = e
+        ttk.Button(frm, text="조회", command=self._reload_audit).pack(side="left", padx=6)
+        ttk.Button(frm, text="CSV 내보내기", command=self._export_audit).pack(side="left")
+        ttk.Button(frm, text="보관 정리", command=self._archive_audit).pack(side="left", padx=6)
+        cols=("ID","시각(UTC)","행위자","액션","타깃","상세")
+        self.audit_lazy = LazyTree(parent, cols, key=lambda r: r["id"], executor=self.bg, height=16,
+                                   to_values=lambda log: (log["id"], log["created_at"] or "", get_directory().user_label(log["actor_user_id"]), log["action"], f"{log['target_type']}:{log['target_id']}", log["detail"] or ""))
+        self.audit_lazy.pack(fill="both", expand=True, padx=8, pady=8); self.audit_tree = self.audit_lazy.tree
         self._reload_audit()
 
+    def _audit_filters(self) -> dict | None:
+        """감사 탭 필터 입력을 audit_page/audit_export 인자로. 잘못된 입력이면 알리고 None."""
+        f = {k: e.get().strip() or None for k, e in self.audit_filter.items()}
+        if f["target_id"] and not f["target_id"].isdigit():
+            messagebox.showwarning("경고","대상 ID는 숫자로 입력하세요."); return None
+        actor = f.pop("actor")
+        if actor and not actor.isdigit():
+            u = self.repo.user_by_username(actor)
+            actor = u["id"] if u else -1
+        f["actor_user_id"] = int(actor) if actor else None
+        if f["target_id"]: f["target_id"] = int(f["target_id"])
+        return f
+
     def _reload_audit(self):
-        for i in self.audit_tree.get_children(): self.audit_tree.delete(i)
-        for log in self.repo.audit_recent():
-            self.audit_tree.insert("", "end", values=(log["id"], log["actor_user_id"], log["action"], f"{log['target_type']}:{log['target_id']}", log["detail"] or ""))
+        f = self._audit_filters()
+        if f is None: return
+        self.audit_lazy.reload(lambda after=None, before=None, limit=None: self.repo.audit_page(after, limit, before, **f))
+
+    def _export_audit(self):
+        """현재 필터 그대로, 보관 DB까지 포함해 내보낸다."""
+        f = self._audit_filters()
+        if f is None: return
+        export_query_to_csv(self.bg, lambda: self.repo.audit_export(**f), "audit", self._status)
+
+    def _archive_audit(self):
+        days = simpledialog.askinteger("보관 정리", "며칠보다 오래된 감사 로그를 연도별 보관 DB로 옮길까요?",
+                                       initialvalue=audit_archive.KEEP_DAYS, minvalue=0, parent=self)
+        if days is None: return
+        def done(moved):
+            self._status(""); self._reload_audit()
+            messagebox.showinfo("완료", "\n".join(f"{y}년: {n:,}건" for y, n in moved.items()) or "옮길 로그가 없습니다.")
+        self._status("감사 로그 보관 중…")
+        self.bg.submit("archive_audit", self.repo.archive_audit, days, on_done=done)
 
     # ===== Settings =====
     def _build_settings(self, parent):
@@ -440,32 +623,64 @@ class App(tk.Tk):
         ttk.Button(frm, text="DB 백업", command=self._do_backup).pack(side="left", padx=6)
         ttk.Button(frm, text="DB 복원", command=self._do_restore).pack(side="left", padx=6)
         ttk.Button(frm, text="직원 CSV 임포트", command=self._import_employees_csv).pack(side="left", padx=6)
+        ttk.Button(frm, text="주간 합계 재계산", command=lambda:(self.repo.rebuild_weekly_totals(), messagebox.showinfo("완료","주간 합계를 다시 계산했습니다."))).pack(side="left", padx=6)
         ttk.Label(parent, text="임포트 CSV: employee_no,name,email,department_id,position", foreground="#6b7280").pack(anchor="w", padx=8)
 
+        snap = ttk.LabelFrame(parent, text=f"자동 보관 스냅샷 ({backup.default_dir()})"); snap.pack(fill="both", expand=True, padx=8, pady=8)
+        bar = ttk.Frame(snap); bar.pack(fill="x", padx=6, pady=6)
+        ttk.Label(bar, text="보관 개수").pack(side="left"); keep = tk.Entry(bar, width=5); keep.insert(0, str(backup.KEEP)); keep.pack(side="left", padx=4)
+        gz = tk.BooleanVar(value=False); ttk.Checkbutton(bar, text="gzip 압축", variable=gz).pack(side="left", padx=4)
+        ttk.Button(bar, text="지금 스냅샷", command=lambda: self._do_snapshot(int(keep.get() or backup.KEEP), gz.get())).pack(side="left", padx=4)
+        ttk.Button(bar, text="선택 스냅샷으로 복원", command=self._restore_snapshot).pack(side="left", padx=4)
+        ttk.Label(snap, text="스크립트: python -m app.backup --keep N [--gzip] [--dir 폴더]", foreground="#6b7280").pack(anchor="w", padx=6)
+        self.snap_tree = ttk.Treeview(snap, columns=("파일","크기(KB)"), show="headings", height=8)
+        for c in ("파일","크기(KB)"): self.snap_tree.heading(c, text=c)
+        self.snap_tree.pack(fill="both", expand=True, padx=6, pady=6)
+        self._reload_snapshots()
+
+    def _backup_progress(self, done, total):
+        self.bg.post(self._status, f"백업 중… {done}/{total} 페이지")
+
     def _do_backup(self):
-        path = filedialog.asksaveasfilename(defaultextension=".db", filetypes=[("SQLite DB","*.db")])
+        path = filedialog.asksaveasfilename(defaultextension=".db", filetypes=[("SQLite DB","*.db"),("SQLite DB (gzip)","*.db.gz")])
         if not path: return
-        backup_to(path); messagebox.showinfo("완료", f"백업됨: {path}")
+        self.bg.submit("backup", backup_to, path, progress=self._backup_progress,
+                       on_done=lambda p: messagebox.showinfo("완료", f"백업됨: {p}"))
+
+    def _do_snapshot(self, keep, compress):
+        self.bg.submit("backup", backup.snapshot, None, keep, compress, self._backup_progress,
+                       on_done=lambda p: (self._reload_snapshots(), messagebox.showinfo("완료", f"스냅샷: {p.name}")))
+
+    def _reload_snapshots(self):
+        for i in self.snap_tree.get_children(): self.snap_tree.delete(i)
+        for p in reversed(backup.snapshots()):
+            self.snap_tree.insert("", "end", iid=str(p), values=(p.name, f"{p.stat().st_size//1024:,}"))
+
+    def _restore_snapshot(self):
+        sel = self.snap_tree.selection()
+        if not sel: return
+        if messagebox.askyesno("확인", f"{Path(sel[0]).name}(으)로 현재 DB를 덮어쓸까요?"):
+            restore_from(sel[0]); messagebox.showinfo("완료", "복원되었습니다. 앱을 재시작하세요.")
 
     def _do_restore(self):
-        path = filedialog.askopenfilename(filetypes=[("SQLite DB","*.db"),("All files","*.*")])
+        path = filedialog.askopenfilename(filetypes=[("SQLite DB","*.db *.db.gz"),("All files","*.*")])
         if not path: return
         restore_from(path); messagebox.showinfo("완료", "복원되었습니다. 앱을 재시작하세요.")
 
     def _import_employees_csv(self):
         path = filedialog.askopenfilename(filetypes=[("CSV","*.csv")])
         if not path: return
-        import csv
-        with open(path, "r", encoding="utf-8-sig") as f:
-            r = csv.reader(f)
-            for row in r:
-                if not row or row[0].startswith("#"): continue
-                try:
-                    eno,name,email,dept,position = row
-                    self.repo.add_employee(eno.strip(), name.strip(), email.strip(), int(dept.strip()), position.strip() or None)
-                except Exception:
-                    pass
-        messagebox.showinfo("완료", "직원 임포트 완료")
+        upsert = messagebox.askyesnocancel("임포트", "이미 있는 사번은 덮어쓸까요?\n(아니오: 기존 직원은 건너뛰고 거부 목록에 기록)")
+        if upsert is None: return
+        def report(lines, rejected):
+            self.bg.post(self._status, f"임포트 중… {lines}줄 (거부 {rejected})")
+        def done(res):
+            msg = f"추가 {res['inserted']}건, 갱신 {res['updated']}건, 거부 {res['rejected']}건"
+            if res["rejected_path"]: msg += f"\n거부 목록: {res['rejected_path']}"
+            messagebox.showinfo("완료", msg)
+        self.bg.submit("import_employees", import_employees_csv, path, self.repo, upsert,
+                       progress=report, on_done=done,
+                       on_error=lambda e: messagebox.showerror("임포트 실패", f"전체 롤백되었습니다: {e}"))
 
     # ===== Performance: Goals =====
     def _build_goals(self, parent):
@@ -480,7 +695,7 @@ class App(tk.Tk):
         ttk.Button(frm, text="승인(HR)", command=lambda:self._approve_goal('hr', True)).pack(side="left", padx=4)
         ttk.Button(frm, text="반려(HR)", command=lambda:self._approve_goal('hr', False)).pack(side="left", padx=4)
 
-        cols=("ID","분기","직원ID","제목","가중치","진행률","상태","M","HR")
+        cols=("ID","분기","직원","제목","가중치","진행률","상태","M","HR")
         self.goal_tree=ttk.Treeview(parent, columns=cols, show="headings", height=16)
         for c in cols: self.goal_tree.heading(c, text=c)
         self.goal_tree.pack(fill="both", expand=True, padx=8, pady=8)
@@ -488,13 +703,10 @@ class App(tk.Tk):
         self._reload_goals(q.get())
 
     def _reload_goals(self, quarter):
-        role = self.user["role"]; emp_id = self.user["employee_id"]; dept_id=None
-        if role=="manager" and emp_id:
-            e = [x for x in self.repo.employees() if x["id"]==emp_id]
-            if e: dept_id = e[0]["department_id"]
+        role = self.user["role"]; emp_id = self.user["employee_id"]; dept_id = self._manager_dept(); d = get_directory()
         for i in self.goal_tree.get_children(): self.goal_tree.delete(i)
         for g in self.repo.goals_for_role(role, emp_id, dept_id, quarter):
-            self.goal_tree.insert("", "end", values=(g["id"], g["quarter"], g["employee_id"], g["title"], g["weight"], g["progress"], g["status"], g["manager_status"], g["hr_status"]))
+            self.goal_tree.insert("", "end", values=(g["id"], g["quarter"], d.label(g["employee_id"]), g["title"], g["weight"], g["progress"], g["status"], g["manager_status"], g["hr_status"]))
 
     def _sel_id(self, tree):
         sel = tree.selection()
@@ -539,7 +751,7 @@ class App(tk.Tk):
     def _approve_goal(self, stage, ok):
         gid = self._sel_id(self.goal_tree)
         if not gid: messagebox.showwarning("경고","선택하세요"); return
-        self.repo.approve_goal_stage(gid, stage, ok)
+        self.repo.approve_goal_stage(gid, stage, ok); self._audit(f"{stage}_{'approve' if ok else 'reject'}", "goal", gid)
         self._reload_goals(self.goal_quarter.get())
 
     # ===== Performance: Reviews =====
@@ -575,13 +787,10 @@ class App(tk.Tk):
         ttk.Button(win, text="저장", command=save).grid(row=len(labels),column=0,columnspan=2,pady=6)
 
     def _reload_reviews(self, period):
-        role=self.user["role"]; emp=self.user["employee_id"]; dept_id=None
-        if role=="manager" and emp:
-            e = [x for x in self.repo.employees() if x["id"]==emp]
-            if e: dept_id = e[0]["department_id"]
+        role=self.user["role"]; emp=self.user["employee_id"]; dept_id = self._manager_dept(); d = get_directory()
         for i in self.rv_tree.get_children(): self.rv_tree.delete(i)
         for r in self.repo.reviews_for_role(role, emp, dept_id, period):
-            self.rv_tree.insert("", "end", values=(r["id"], r["employee_id"], r["reviewer_id"], r["period"], r["category"], r["score"], r["comment"] or ""))
+            self.rv_tree.insert("", "end", values=(r["id"], d.label(r["employee_id"]), d.user_label(r["reviewer_id"]), r["period"], r["category"], r["score"], r["comment"] or ""))
 
     # ===== Performance: Competencies =====
     def _build_comp(self, parent):
@@ -687,6 +896,8 @@ class App(tk.Tk):
             self.fd_out.insert("", "end", values=(r["id"], r["from_id"], r["to_id"], r["comment"], r["visibility"], r["created_at"]))
 
     # ===== Performance: Dashboard =====
+    DASH_TOP_N = 5
+
     def _build_dash(self, parent):
         frm = ttk.Frame(parent); frm.pack(fill="x", padx=8, pady=8)
         ttk.Label(frm, text="분기").pack(side="left")
@@ -698,41 +909,59 @@ class App(tk.Tk):
         self.lbl_dash = ttk.Label(parent, text="")
         self.lbl_dash.pack(fill="x", padx=8, pady=6)
 
-        cols=("employee_id","평균 진행%","목표 수")
+        cols=("구분","직원","가중 진행%","목표 수")
         self.d_goal=ttk.Treeview(parent, columns=cols, show="headings", height=6)
         for c in cols: self.d_goal.heading(c, text=c)
         self.d_goal.pack(fill="x", padx=8, pady=4)
 
-        cols2=("employee_id","평균 점수","리뷰 수")
-        self.d_rev=ttk.Treeview(parent, columns=cols2, show="headings", height=6)
+        cols=("부서","인원","목표 수","가중 진행%")
+        self.d_dept=ttk.Treeview(parent, columns=cols, show="headings", height=5)
+        for c in cols: self.d_dept.heading(c, text=c)
+        self.d_dept.pack(fill="x", padx=8, pady=4)
+
+        cols2=("구분","리뷰 수","평균","표준편차","p25","중앙값","p75")
+        self.d_rev=ttk.Treeview(parent, columns=cols2, show="headings", height=10)
         for c in cols2: self.d_rev.heading(c, text=c)
         self.d_rev.pack(fill="x", padx=8, pady=4)
 
         self._reload_dash(q.get(), p.get())
 
     def _reload_dash(self, quarter, period):
-        for t in (self.d_goal, self.d_rev):
+        load = lambda: (self.repo.goal_rollup_rank(quarter, self.DASH_TOP_N), self.repo.goal_rollup_rank(quarter, self.DASH_TOP_N, bottom=True),
+                        self.repo.goal_dept_rollups(quarter), self.repo.review_stats(period), self.repo.pending_goal_counts())
+        self.bg.submit("dash", load, on_done=self._fill_dash)
+
+    def _fill_dash(self, res):
+        tops, bottoms, depts, revs, pend = res
+        for t in (self.d_goal, self.d_dept, self.d_rev):
             for i in t.get_children(): t.delete(i)
 
-        # goal averages
-        top=-1; bottom=10**9; top_e=None; bottom_e=None
-        pcnt=0
-        avgs = self.repo.goal_progress_avg_by_employee(quarter)
-        for g in avgs:
-            self.d_goal.insert("", "end", values=(g["employee_id"], round(g["avg_prog"],1), g["cnt"]))
-            if g["avg_prog"]>top: top=g["avg_prog"]; top_e=g["employee_id"]
-            if g["avg_prog"]<bottom: bottom=g["avg_prog"]; bottom_e=g["employee_id"]
-            pcnt += g["cnt"]
-
-        # reviews
-        avg_sum=0; avg_cnt=0
-        for r in self.repo.review_avg_by_employee(period):
-            self.d_rev.insert("", "end", values=(r["employee_id"], round(r["avg_score"],2), r["cnt"]))
-            avg_sum += r["avg_score"]; avg_cnt += 1
-
-        pend = self.repo.pending_goal_counts()
-        overall = f"Goal Top:{top_e}({round(top,1) if top>=0 else 0}%), Bottom:{bottom_e}({round(bottom,1) if bottom<10**9 else 0}%), 리뷰 평균:{round(avg_sum/avg_cnt,2) if avg_cnt else 0}, 대기 목표:{pend}"
+        # goal rollups: 가중 진행률 상위/하위 N명과 부서별 집계
+        for kind, rows in (("Top", tops), ("Bottom", bottoms)):
+            for g in rows:
+                self.d_goal.insert("", "end", values=(kind, get_directory().label(g["employee_id"]), round(g["progress"],1), g["goals"]))
+        wsum = wprog = 0
+        for d in depts:
+            self.d_dept.insert("", "end", values=(get_directory().department_name(d["department_id"] or None) or "(없음)", d["employees"], d["goals"], round(d["progress"],1)))
+            wsum += d["weight_sum"]; wprog += d["weighted"]
+
+        # reviews: 전체/유형별/부서별 분포와 편차가 큰 평가자
+        fmt = lambda v: "" if v is None else round(v, 2)
+        def add(label, st):
+            self.d_rev.insert("", "end", values=(label, st["n"], fmt(st["mean"]), fmt(st["std"]), fmt(st["p25"]), fmt(st["p50"]), fmt(st["p75"])))
+        add("전체", revs["overall"])
+        for cat, st in sorted(revs["by_category"].items()): add(f"유형 {cat}", st)
+        for dept, st in sorted(revs["by_department"].items()): add(f"부서 {get_directory().department_name(dept or None) or '(없음)'}", st)
+        for uid, st in sorted(revs["reviewers"].items(), key=lambda kv: -abs(kv[1]["offset"]))[:self.DASH_TOP_N]:
+            self.d_rev.insert("", "end", values=(f"평가자 {get_directory().user_label(uid)} (편차 {st['offset']:+.2f})", st["n"], fmt(st["mean"]), "", "", "", ""))
+
+        top = f"{get_directory().label(tops[0]['employee_id'])}({round(tops[0]['progress'],1)}%)" if tops else "-"
+        bottom = f"{get_directory().label(bottoms[0]['employee_id'])}({round(bottoms[0]['progress'],1)}%)" if bottoms else "-"
+        overall = f"Goal Top:{top}, Bottom:{bottom}, 전사 가중 진행:{round(wprog/wsum,1) if wsum else 0}%, 리뷰 평균:{fmt(revs['overall']['mean']) if revs['overall']['n'] else 0}, 대기 목표:{pend}"
         self.lbl_dash.config(text=overall)
 
 if __name__ == "__main__":
+    logging.basicConfig(filename=appdata_dir() / "hris.log", level=logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     App().mainloop()
+    close_all()
@@ -1,9 +1,36 @@
+import json
 from app.core_db import get_conn
-from datetime import datetime
+from app.biz_calendar import get_calendar
+from app.directory import get_directory
+from app.audit_log import get_audit_writer
+from app.review_stats import get_review_stats
+from app import audit_archive
+from app.utils_time import DAILY_REGULAR_MINUTES, off_dates, week_range_of, to_minutes_sql, night_before_sql, week_start_sql, week_start_of
+from datetime import datetime, timedelta
 
 class Repo:
     def __init__(self): pass
 
+    # ===== Keyset pagination =====
+    def _keyset(self, c, sql: str, where: list, params: list, key: str, desc: bool,
+                after: int | None, before: int | None, limit: int | None):
+        """화면 표시 순서(key 기준 desc/asc)로 after 다음 페이지, 또는 before 이전 페이지를 가져온다.
+
+        OFFSET 대신 키 비교만 쓰므로 몇 번째 페이지든 인덱스 탐색 한 번으로 끝난다.
+        """
+        where = list(where); params = list(params); backward = before is not None
+        if after is not None:
+            where.append(f"{key}{'<' if desc else '>'}?"); params.append(after)
+        if backward:
+            where.append(f"{key}{'>' if desc else '<'}?"); params.append(before)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {key} {'DESC' if desc != backward else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"; params.append(limit)
+        rows = c.execute(sql, tuple(params)).fetchall()
+        return rows[::-1] if backward else rows
+
     # ===== Users =====
     def user_by_username(self, username: str):
         with get_conn() as c:
@@ -13,6 +40,7 @@ class Repo:
         with get_conn() as conn:
             conn.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)",
                          (username, salt, hash_hex, role, employee_id))
+        get_directory().invalidate()
 
     def users(self):
         with get_conn() as c:
@@ -25,10 +53,12 @@ class Repo:
     def update_user_role(self, user_id: int, role: str, employee_id: int | None):
         with get_conn() as c:
             c.execute("UPDATE users SET role=?, employee_id=? WHERE id=?", (role, employee_id, user_id))
+        get_directory().invalidate()
 
     def delete_user(self, user_id: int):
         with get_conn() as c:
             c.execute("DELETE FROM users WHERE id=?", (user_id,))
+        get_directory().invalidate()
 
     # ===== Departments / Employees =====
     def departments(self):
@@ -38,17 +68,59 @@ class Repo:
     def add_department(self, name: str):
         with get_conn() as c:
             c.execute("INSERT INTO departments(name) VALUES(?)", (name,))
+        get_directory().invalidate()
 
     def employees(self):
         with get_conn() as c:
             return c.execute("SELECT * FROM employees ORDER BY id").fetchall()
 
+    def employee(self, employee_id: int):
+        with get_conn() as c:
+            return c.execute("SELECT * FROM employees WHERE id=?", (employee_id,)).fetchone()
+
     def add_employee(self, employee_no: str, name: str, email: str, department_id: int, position: str | None):
         with get_conn() as c:
             c.execute("INSERT INTO employees(employee_no,name,email,department_id,position) VALUES(?,?,?,?,?)",
                       (employee_no, name, email, department_id, position))
             emp_id = c.execute("SELECT id FROM employees WHERE employee_no=?", (employee_no,)).fetchone()["id"]
-            c.execute("INSERT OR IGNORE INTO leave_balances(employee_id) VALUES(?)", (emp_id,))
+            self._grant_default_leave(c, emp_id)
+        get_directory().invalidate()
+
+    def import_employees(self, chunks, upsert: bool = True, progress=None) -> dict:
+        """검증된 (employee_no,name,email,department_id,position) 튜플 리스트들을 한 트랜잭션으로 반영.
+        chunk마다 executemany로 넣고 새 직원의 기본 연차 부여도 같이 기록한다. 중간에 실패하면 전부 롤백.
+        upsert=False면 이미 있는 사번은 건너뛰고 skipped로 돌려준다. progress(처리 건수)는 chunk마다 호출.
+        반환: {inserted, updated, skipped: [employee_no…]}"""
+        ins = ("INSERT INTO employees(employee_no,name,email,department_id,position) VALUES(?,?,?,?,?) "
+               "ON CONFLICT(employee_no) DO UPDATE SET name=excluded.name, email=excluded.email, "
+               "department_id=excluded.department_id, position=excluded.position")
+        bal = ("INSERT INTO leave_ledger(employee_id,kind,days,note) SELECT e.id, 'grant', ?, '기본 부여' FROM employees e "
+               "WHERE e.employee_no=? AND NOT EXISTS (SELECT 1 FROM leave_ledger l WHERE l.employee_id=e.id)")
+        res = {"inserted": 0, "updated": 0, "skipped": []}; done = 0
+        with get_conn() as c:
+            for chunk in chunks:
+                if not chunk: continue
+                existing: dict[str, tuple] = {}   # 사번 -> (id, department_id)
+                for i in range(0, len(chunk), 500):   # SQLite 바인딩 변수 한도 안에서 IN 조회
+                    part = [r[0] for r in chunk[i:i+500]]
+                    existing.update((x[0], (x[1], x[2])) for x in c.execute(
+                        f"SELECT employee_no, id, department_id FROM employees WHERE employee_no IN ({','.join('?'*len(part))})", part))
+                if upsert:
+                    rows = chunk; res["updated"] += len(existing)
+                else:
+                    res["skipped"].extend(r[0] for r in chunk if r[0] in existing)
+                    rows = [r for r in chunk if r[0] not in existing]
+                res["inserted"] += len(rows) - (len(existing) if upsert else 0)
+                c.executemany(ins, rows)
+                c.executemany(bal, [(self.ANNUAL_LEAVE_DAYS, r[0]) for r in rows])
+                if upsert:   # 부서가 바뀐 직원은 목표 집계도 새 부서로 옮김
+                    for r in chunk:
+                        old = existing.get(r[0])
+                        if old and old[1] != r[3]: self._move_goal_rollups(c, old[0])
+                done += len(chunk)
+                if progress: progress(done)
+        get_directory().invalidate(); get_review_stats().invalidate()   # 부서별 평가 분포도 다시 계산
+        return res
 
     # ===== Attendance =====
     def attendance_for(self, employee_id: int, date_str: str):
@@ -72,6 +144,92 @@ class Repo:
                              VALUES(?,?,?,?,?,?,?)""",
                           (data['employee_id'], data['date'], data.get('in_time'), data.get('out_time'),
                            data.get('lunch_minutes',60), data.get('mode','office'), data.get('note')))
+            self._refresh_week(c, week_start_of(data['date']), data['employee_id'])
+
+    # ===== Timesheet (급여 마감용 집계) =====
+    def _off_json(self, start: str, end: str) -> str:
+        d1 = datetime.strptime(start, '%Y-%m-%d').date(); d2 = datetime.strptime(end, '%Y-%m-%d').date()
+        return json.dumps(off_dates(d1, d2, get_calendar()))
+
+    def _bucket_agg_sql(self, where: str, join: str = "", by_week: bool = False) -> str:
+        """attendance 행별 버킷(calc_work_buckets와 동일 규칙)을 SQL 안에서 계산해 직원(및 주)별로 합산.
+
+        결과 컬럼: emp, [week_start], regular, overtime, night, holiday, total, days.
+        :off 파라미터(주말/휴일 날짜 JSON 배열)가 필요하다.
+        """
+        REG = DAILY_REGULAR_MINUTES
+        wk_in = f", {week_start_sql('a.date')} AS week_start" if by_week else ""
+        wk = ", week_start" if by_week else ""
+        return f"""
+            SELECT emp{wk},
+                   SUM(CASE WHEN off AND total<>0 THEN 0 WHEN total<{REG} THEN total ELSE {REG} END) AS regular,
+                   SUM(CASE WHEN off AND total<>0 THEN 0 WHEN total>{REG} THEN total-{REG} ELSE 0 END) AS overtime,
+                   SUM({night_before_sql('e')} - {night_before_sql('s')}) AS night,
+                   SUM(CASE WHEN off THEN total ELSE 0 END) AS holiday,
+                   SUM(total) AS total, COUNT(*) AS days
+            FROM (SELECT emp{wk}, s, e, e - s - lunch AS total, off FROM (
+                  SELECT emp{wk}, s, e + (e<s)*1440 AS e, lunch, off FROM (
+                      SELECT a.employee_id AS emp{wk_in}, {to_minutes_sql('a.in_time')} AS s, {to_minutes_sql('a.out_time')} AS e,
+                             COALESCE(a.lunch_minutes,0) AS lunch, a.date IN (SELECT value FROM json_each(:off)) AS off
+                      FROM attendance a {join}
+                      WHERE {where} AND a.in_time<>'' AND a.out_time<>''
+                      LIMIT -1) LIMIT -1) LIMIT -1)  -- LIMIT: 평탄화(식 중복) 대신 co-routine으로 한 번씩만 계산
+            GROUP BY emp{wk}"""
+
+    def timesheet_summary(self, start: str, end: str, dept_id: int | None = None):
+        """start~end 기간 직원별 regular/overtime/night/holiday/total 분과 근무일수(days).
+
+        행별 버킷 계산과 합산을 한 쿼리 안에서 처리하고, 근태가 없는 직원도 0으로 포함한다.
+        주말/휴일 목록은 holidays 테이블 기준.
+        """
+        join = "JOIN employees de ON de.id=a.employee_id AND de.department_id=:dept" if dept_id else ""
+        sql = f"""
+            SELECT e.id AS employee_id, e.employee_no, e.name, e.department_id,
+                   COALESCE(t.regular,0) AS regular, COALESCE(t.overtime,0) AS overtime, COALESCE(t.night,0) AS night,
+                   COALESCE(t.holiday,0) AS holiday, COALESCE(t.total,0) AS total, COALESCE(t.days,0) AS days
+            FROM employees e LEFT JOIN ({self._bucket_agg_sql("a.date BETWEEN :s AND :e", join)}) t ON t.emp=e.id
+            {"WHERE e.department_id=:dept" if dept_id else ""}
+            ORDER BY e.id"""
+        with get_conn() as c:
+            return c.execute(sql, dict(s=start, e=end, off=self._off_json(start, end), dept=dept_id)).fetchall()
+
+    # ===== Weekly totals (주간 캡 점검용 집계 테이블) =====
+    def _refresh_week(self, c, week_start: str, employee_id: int | None = None):
+        """한 주(월~일)의 weekly_totals를 attendance에서 다시 계산. employee_id가 없으면 그 주 전체 직원."""
+        end = (datetime.strptime(week_start, '%Y-%m-%d').date() + timedelta(days=6)).strftime('%Y-%m-%d')
+        where = "a.date BETWEEN :s AND :e" + (" AND a.employee_id=:emp" if employee_id else "")
+        c.execute("DELETE FROM weekly_totals WHERE week_start=?" + (" AND employee_id=?" if employee_id else ""),
+                  (week_start, employee_id) if employee_id else (week_start,))
+        c.execute(f"""INSERT INTO weekly_totals(employee_id,week_start,regular,overtime,night,holiday,total,days)
+                      {self._bucket_agg_sql(where, by_week=True)}""",
+                  dict(s=week_start, e=end, emp=employee_id, off=self._off_json(week_start, end)))
+
+    def _rebuild_weekly_totals(self, c):
+        c.execute("DELETE FROM weekly_totals")
+        rng = c.execute("SELECT MIN(date) AS s, MAX(date) AS e FROM attendance").fetchone()
+        if not rng["s"]: return
+        s, _ = week_range_of(datetime.strptime(rng["s"], '%Y-%m-%d').date())
+        _, e = week_range_of(datetime.strptime(rng["e"], '%Y-%m-%d').date())
+        s = s.strftime('%Y-%m-%d'); e = e.strftime('%Y-%m-%d')
+        c.execute(f"""INSERT INTO weekly_totals(employee_id,week_start,regular,overtime,night,holiday,total,days)
+                      {self._bucket_agg_sql("a.date BETWEEN :s AND :e", by_week=True)}""",
+                  dict(s=s, e=e, off=self._off_json(s, e)))
+
+    def rebuild_weekly_totals(self):
+        """weekly_totals를 attendance 원본에서 통째로 다시 만든다."""
+        with get_conn() as c:
+            self._rebuild_weekly_totals(c)
+
+    def week_total(self, employee_id: int, week_start: str):
+        with get_conn() as c:
+            return c.execute("SELECT * FROM weekly_totals WHERE employee_id=? AND week_start=?", (employee_id, week_start)).fetchone()
+
+    def over_cap(self, week_start: str, cap_minutes: int):
+        """해당 주 누적 근무가 cap_minutes를 넘는 직원 (많은 순)."""
+        with get_conn() as c:
+            return c.execute("""SELECT w.*, e.employee_no, e.name, e.department_id FROM weekly_totals w
+                                JOIN employees e ON e.id=w.employee_id
+                                WHERE w.week_start=? AND w.total>? ORDER BY w.total DESC""", (week_start, cap_minutes)).fetchall()
 
     # ===== Requests (2-stage approval) =====
     def _derive_status(self, m, h):
@@ -79,72 +237,75 @@ class Repo:
         if m=="approved" and h=="approved": return "approved"
         return "pending"
 
+    def _requests_for_role(self, table: str, role: str, manager_dept_id: int | None,
+                           after_id: int | None, before_id: int | None, limit: int | None):
+        """신청 목록(최신순). manager는 자기 부서, hr은 매니저 승인된 건. after_id/before_id로 키셋 페이징."""
+        sql = f"SELECT r.* FROM {table} r"; where=[]; params=[]
+        if role=="manager" and manager_dept_id:
+            sql += " JOIN employees e ON r.employee_id=e.id"
+            where.append("e.department_id=?"); params.append(manager_dept_id)
+        elif role=="hr":
+            where.append("r.manager_status='approved'")
+        with get_conn() as c:
+            return self._keyset(c, sql, where, params, "r.id", True, after_id, before_id, limit)
+
     # Overtime
     def save_overtime(self, data: dict):
         with get_conn() as c:
             c.execute("""INSERT INTO overtime_requests(employee_id,date,start_time,end_time,minutes,reason) VALUES(?,?,?,?,?,?)""",
                       (data['employee_id'], data['date'], data['start_time'], data['end_time'], data['minutes'], data.get('reason')))
 
-    def overtimes_for_role(self, role: str, manager_dept_id: int | None):
-        sql = "SELECT o.* FROM overtime_requests o"
-        params = []
-        if role=="manager" and manager_dept_id:
-            sql += " JOIN employees e ON o.employee_id=e.id WHERE e.department_id=?"
-            params.append(manager_dept_id)
-        elif role=="hr":
-            sql += " WHERE o.manager_status='approved'"
-        return get_conn().execute(sql, tuple(params)).fetchall() if params or "WHERE" in sql else \
-               get_conn().execute("SELECT * FROM overtime_requests ORDER BY id DESC").fetchall()
+    def overtimes_for_role(self, role: str, manager_dept_id: int | None,
+                 after_id: int | None = None, before_id: int | None = None, limit: int | None = None):
+        return self._requests_for_role("overtime_requests", role, manager_dept_id, after_id, before_id, limit)
 
     def set_overtime_stage(self, id: int, stage: str, approve: bool):
-        col = "manager_status" if stage=="manager" else "hr_status"
         with get_conn() as c:
-            c.execute(f"UPDATE overtime_requests SET {col}=? WHERE id=?", ("approved" if approve else "rejected", id))
-            row = c.execute("SELECT manager_status, hr_status FROM overtime_requests WHERE id=?", (id,)).fetchone()
-            status = self._derive_status(row["manager_status"], row["hr_status"])
-            c.execute("UPDATE overtime_requests SET status=? WHERE id=?", (status, id))
+            return self._overtime_stage(c, id, stage, approve)
+
+    def _overtime_stage(self, c, id: int, stage: str, approve: bool) -> str:
+        col = "manager_status" if stage=="manager" else "hr_status"
+        c.execute(f"UPDATE overtime_requests SET {col}=? WHERE id=?", ("approved" if approve else "rejected", id))
+        row = c.execute("SELECT manager_status, hr_status FROM overtime_requests WHERE id=?", (id,)).fetchone()
+        status = self._derive_status(row["manager_status"], row["hr_status"])
+        c.execute("UPDATE overtime_requests SET status=? WHERE id=?", (status, id))
+        return status
 
     # Leave
     def save_leave(self, data: dict):
         with get_conn() as c:
             if data.get('type')=="연차":
-                bal = c.execute("SELECT * FROM leave_balances WHERE employee_id=?", (data['employee_id'],)).fetchone()
-                if not bal:
-                    c.execute("INSERT OR IGNORE INTO leave_balances(employee_id) VALUES(?)", (data['employee_id'],))
+                self._grant_default_leave(c, data['employee_id'])
             c.execute("""INSERT INTO leave_requests(employee_id,start_date,end_date,type,reason) VALUES(?,?,?,?,?)""",
                       (data['employee_id'], data['start_date'], data['end_date'], data['type'], data.get('reason')))
 
-    def leaves_for_role(self, role: str, manager_dept_id: int | None):
-        sql = "SELECT l.* FROM leave_requests l"
-        params = []
-        if role=="manager" and manager_dept_id:
-            sql += " JOIN employees e ON l.employee_id=e.id WHERE e.department_id=?"
-            params.append(manager_dept_id)
-        elif role=="hr":
-            sql += " WHERE l.manager_status='approved'"
-        return get_conn().execute(sql, tuple(params)).fetchall() if params or "WHERE" in sql else \
-               get_conn().execute("SELECT * FROM leave_requests ORDER BY id DESC").fetchall()
+    def leaves_for_role(self, role: str, manager_dept_id: int | None,
+                 after_id: int | None = None, before_id: int | None = None, limit: int | None = None):
+        return self._requests_for_role("leave_requests", role, manager_dept_id, after_id, before_id, limit)
 
     def set_leave_stage(self, id: int, stage: str, approve: bool):
-        from datetime import datetime as dt
-        col = "manager_status" if stage=="manager" else "hr_status"
         with get_conn() as c:
-            c.execute(f"UPDATE leave_requests SET {col}=? WHERE id=?", ("approved" if approve else "rejected", id))
-            row = c.execute("SELECT manager_status, hr_status, employee_id, start_date, end_date, type FROM leave_requests WHERE id=?", (id,)).fetchone()
-            status = self._derive_status(row["manager_status"], row["hr_status"])
-            c.execute("UPDATE leave_requests SET status=? WHERE id=?", (status, id))
-            # 연차 최종 승인 시 잔여 차감
-            if status=="approved" and row["type"]=="연차":
-                d1 = dt.strptime(row["start_date"], "%Y-%m-%d").date()
-                d2 = dt.strptime(row["end_date"], "%Y-%m-%d").date()
-                days = (d2 - d1).days + 1
-                bal = c.execute("SELECT * FROM leave_balances WHERE employee_id=?", (row["employee_id"],)).fetchone()
-                used = (bal["annual_used"] or 0) + days
-                total = bal["annual_total"] or 15.0
-                if used > total:  # 초과 시 승인 롤백
-                    c.execute(f"UPDATE leave_requests SET {col}='pending', status='pending' WHERE id=?", (id,))
-                else:
-                    c.execute("UPDATE leave_balances SET annual_used=? WHERE employee_id=?", (used, row["employee_id"]))
+            return self._leave_stage(c, id, stage, approve)
+
+    def _leave_stage(self, c, id: int, stage: str, approve: bool) -> str:
+        """반환: 새 status. 연차 잔여가 모자라 최종 승인을 되돌렸으면 'insufficient'."""
+        col = "manager_status" if stage=="manager" else "hr_status"
+        c.execute(f"UPDATE leave_requests SET {col}=? WHERE id=?", ("approved" if approve else "rejected", id))
+        row = c.execute("SELECT manager_status, hr_status, employee_id, start_date, end_date, type FROM leave_requests WHERE id=?", (id,)).fetchone()
+        status = self._derive_status(row["manager_status"], row["hr_status"])
+        c.execute("UPDATE leave_requests SET status=? WHERE id=?", (status, id))
+        # 연차 최종 승인 시 원장에 사용(영업일 수) 기록. 잔여 확인과 기록을 한 문장으로 해서 동시 승인에도 초과 차감 없음
+        if status=="approved" and row["type"]=="연차" \
+                and not c.execute("SELECT 1 FROM leave_ledger WHERE leave_request_id=?", (id,)).fetchone():   # 재승인: 이미 차감됨
+            days = get_calendar().business_days(row["start_date"], row["end_date"])
+            self._grant_default_leave(c, row["employee_id"])
+            cur = c.execute("""INSERT INTO leave_ledger(employee_id,kind,days,leave_request_id,note)
+                               SELECT ?, 'use', ?, ?, ? WHERE (SELECT SUM(days) FROM leave_ledger WHERE employee_id=?) >= ?""",
+                            (row["employee_id"], -days, id, f"{row['start_date']}~{row['end_date']}", row["employee_id"], days))
+            if cur.rowcount == 0:  # 잔여 부족: 승인 되돌림
+                c.execute(f"UPDATE leave_requests SET {col}='pending', status='pending' WHERE id=?", (id,))
+                return "insufficient"
+        return status
 
     # Correction
     def save_correction(self, data: dict):
@@ -153,35 +314,162 @@ class Repo:
                       (data['employee_id'], data['date'], data.get('new_in_time'), data.get('new_out_time'),
                        data.get('new_lunch_minutes'), data.get('reason')))
 
-    def corrections_for_role(self, role: str, manager_dept_id: int | None):
-        sql = "SELECT cr.* FROM correction_requests cr"
-        params = []
-        if role=="manager" and manager_dept_id:
-            sql += " JOIN employees e ON cr.employee_id=e.id WHERE e.department_id=?"
-            params.append(manager_dept_id)
-        elif role=="hr":
-            sql += " WHERE cr.manager_status='approved'"
-        return get_conn().execute(sql, tuple(params)).fetchall() if params or "WHERE" in sql else \
-               get_conn().execute("SELECT * FROM correction_requests ORDER BY id DESC").fetchall()
+    def corrections_for_role(self, role: str, manager_dept_id: int | None,
+                 after_id: int | None = None, before_id: int | None = None, limit: int | None = None):
+        return self._requests_for_role("correction_requests", role, manager_dept_id, after_id, before_id, limit)
 
     def set_correction_stage(self, id: int, stage: str, approve: bool):
-        col = "manager_status" if stage=="manager" else "hr_status"
         with get_conn() as c:
-            c.execute(f"UPDATE correction_requests SET {col}=? WHERE id=?", ("approved" if approve else "rejected", id))
-            row = c.execute("SELECT manager_status, hr_status, employee_id, date, new_in_time, new_out_time, new_lunch_minutes FROM correction_requests WHERE id=?", (id,)).fetchone()
-            status = self._derive_status(row["manager_status"], row["hr_status"])
-            c.execute("UPDATE correction_requests SET status=? WHERE id=?", (status, id))
-            if status=="approved":
-                a = c.execute("SELECT * FROM attendance WHERE employee_id=? AND date=?", (row["employee_id"], row["date"])).fetchone()
-                if a:
-                    c.execute("UPDATE attendance SET in_time=?, out_time=?, lunch_minutes=? WHERE id=?",
-                              (row["new_in_time"], row["new_out_time"], row["new_lunch_minutes"] or a["lunch_minutes"], a["id"]))
+            return self._correction_stage(c, id, stage, approve)
+
+    def _correction_stage(self, c, id: int, stage: str, approve: bool) -> str:
+        col = "manager_status" if stage=="manager" else "hr_status"
+        c.execute(f"UPDATE correction_requests SET {col}=? WHERE id=?", ("approved" if approve else "rejected", id))
+        row = c.execute("SELECT manager_status, hr_status, employee_id, date, new_in_time, new_out_time, new_lunch_minutes FROM correction_requests WHERE id=?", (id,)).fetchone()
+        status = self._derive_status(row["manager_status"], row["hr_status"])
+        c.execute("UPDATE correction_requests SET status=? WHERE id=?", (status, id))
+        if status=="approved":
+            a = c.execute("SELECT * FROM attendance WHERE employee_id=? AND date=?", (row["employee_id"], row["date"])).fetchone()
+            if a:
+                c.execute("UPDATE attendance SET in_time=?, out_time=?, lunch_minutes=? WHERE id=?",
+                          (row["new_in_time"], row["new_out_time"], row["new_lunch_minutes"] or a["lunch_minutes"], a["id"]))
+            else:
+                c.execute("INSERT INTO attendance(employee_id,date,in_time,out_time,lunch_minutes,mode) VALUES(?,?,?,?,?, 'office')",
+                          (row["employee_id"], row["date"], row["new_in_time"], row["new_out_time"], row["new_lunch_minutes"] or 60))
+            self._refresh_week(c, week_start_of(row["date"]), row["employee_id"])
+        return status
+
+    # ===== 결재함 (세 신청 유형 통합) =====
+    # kind: (테이블, 일자/기간 표시식, 내용 표시식). 순서는 inbox 키(k = id*3 + 순번)에 쓰이므로 바꾸지 말 것.
+    _INBOX = {
+        "overtime":   ("overtime_requests", "r.date", "r.start_time||'-'||r.end_time||' ('||r.minutes||'분)'"),
+        "leave":      ("leave_requests", "r.start_date||'~'||r.end_date", "r.type"),
+        "correction": ("correction_requests", "r.date", "IFNULL(r.new_in_time,'')||'-'||IFNULL(r.new_out_time,'')||' 점심 '||IFNULL(r.new_lunch_minutes,'')"),
+    }
+    INBOX_KINDS = tuple(_INBOX)
+
+    def _inbox_where(self, role: str, manager_dept_id: int | None) -> tuple[str, list] | None:
+        """역할이 지금 처리할 수 있는 건만: manager는 자기 부서의 매니저 대기, hr은 매니저 승인 후 HR 대기,
+        admin은 남은 단계와 관계없이 진행 중인 전체. 처리할 수 없는 역할이면 None.
+        (status, manager_status, hr_status) 인덱스의 등호 조건으로만 거른다."""
+        if role == "manager":
+            if not manager_dept_id: return None
+            return "r.status='pending' AND r.manager_status='pending' AND e.department_id=?", [manager_dept_id]
+        if role == "hr":
+            return "r.status='pending' AND r.manager_status='approved' AND r.hr_status='pending'", []
+        if role == "admin":
+            return "r.status='pending'", []
+        return None
+
+    def inbox(self, role: str, manager_dept_id: int | None, kind: str | None = None,
+              after: int | None = None, before: int | None = None, limit: int | None = None):
+        """처리 대기 신청을 유형 구분 없이 최신순으로. 행: k(페이징 키), kind, id, employee_id, employee_no, name,
+        period, detail, reason, manager_status, hr_status, stage(지금 처리할 단계). kind로 한 유형만 볼 수 있다."""
+        cond = self._inbox_where(role, manager_dept_id)
+        if cond is None: return []
+        where, wparams = cond; arms = []; params = []
+        for i, (k, (table, period, detail)) in enumerate(self._INBOX.items()):
+            if kind and k != kind: continue
+            arms.append(f"""SELECT r.id*3+{i} AS k, '{k}' AS kind, r.id, r.employee_id, e.employee_no, e.name,
+                                   {period} AS period, {detail} AS detail, r.reason, r.manager_status, r.hr_status,
+                                   CASE WHEN r.manager_status='pending' THEN 'manager' ELSE 'hr' END AS stage
+                            FROM {table} r JOIN employees e ON e.id=r.employee_id WHERE {where}""")
+            params += wparams
+        with get_conn() as c:
+            return self._keyset(c, f"SELECT * FROM ({' UNION ALL '.join(arms)})", [], params, "k", True, after, before, limit)
+
+    def inbox_counts(self, role: str, manager_dept_id: int | None) -> dict[str, int]:
+        """유형별 처리 대기 건수 (탭/버튼 배지용)."""
+        counts = dict.fromkeys(self.INBOX_KINDS, 0)
+        cond = self._inbox_where(role, manager_dept_id)
+        if cond is None: return counts
+        where, wparams = cond
+        join = " JOIN employees e ON e.id=r.employee_id" if role == "manager" else ""
+        sql = " UNION ALL ".join(f"SELECT '{k}', COUNT(*) FROM {table} r{join} WHERE {where}"
+                                 for k, (table, _p, _d) in self._INBOX.items())
+        with get_conn() as c:
+            counts.update(c.execute(sql, wparams * len(self._INBOX)).fetchall())
+        return counts
+
+    def decide_requests(self, items, stage: str, approve: bool, actor_user_id: int | None = None,
+                        dept_id: int | None = None) -> list[dict]:
+        """여러 신청(유형 섞임)에 같은 단계 결정을 한 트랜잭션으로 적용. items: (kind, id) 목록.
+        그 단계에서 처리할 수 없는 건(이미 처리됨, 매니저 승인 전 등)은 건너뛴다. dept_id를 주면(매니저)
+        그 부서 직원의 신청만 처리한다. 성공 건의 감사 로그는 executemany 한 번으로 남긴다.
+        반환: 항목마다 {kind, id, ok, status, message}."""
+        apply = {"overtime": self._overtime_stage, "leave": self._leave_stage, "correction": self._correction_stage}
+        action = f"{stage}_{'approve' if approve else 'reject'}"
+        items = list(dict.fromkeys((k, int(i)) for k, i in items)); results = []; logs = []
+        with get_conn() as c:
+            cur = {}   # kind -> {id: row}: 현재 상태를 유형별 IN 조회 한 번으로
+            for kind in self.INBOX_KINDS:
+                ids = [i for k, i in items if k == kind]
+                for n in range(0, len(ids), 500):
+                    part = ids[n:n+500]
+                    cur.setdefault(kind, {}).update((r["id"], r) for r in c.execute(
+                        f"SELECT r.id, e.department_id, r.manager_status, r.hr_status, r.status FROM {self._INBOX[kind][0]} r "
+                        f"LEFT JOIN employees e ON e.id=r.employee_id WHERE r.id IN ({','.join('?'*len(part))})", part))
+            for kind, id in items:
+                row = cur.get(kind, {}).get(id)
+                if row is None:
+                    msg = "없는 신청"
+                elif dept_id is not None and row["department_id"] != dept_id:
+                    msg = "다른 부서 신청"
+                elif row["status"] != "pending":
+                    msg = f"이미 처리됨({row['status']})"
+                elif stage == "manager" and row["manager_status"] != "pending":
+                    msg = "매니저 단계 처리 완료"
+                elif stage == "hr" and row["manager_status"] != "approved":
+                    msg = "매니저 승인 전"
+                elif stage == "hr" and row["hr_status"] != "pending":
+                    msg = "HR 단계 처리 완료"
                 else:
-                    c.execute("INSERT INTO attendance(employee_id,date,in_time,out_time,lunch_minutes,mode) VALUES(?,?,?,?,?, 'office')",
-                              (row["employee_id"], row["date"], row["new_in_time"], row["new_out_time"], row["new_lunch_minutes"] or 60))
+                    status = apply[kind](c, id, stage, approve)
+                    if status == "insufficient":
+                        results.append(dict(kind=kind, id=id, ok=False, status="pending", message="연차 잔여 부족")); continue
+                    results.append(dict(kind=kind, id=id, ok=True, status=status, message=""))
+                    logs.append((actor_user_id, action, kind, id, None)); continue
+                results.append(dict(kind=kind, id=id, ok=False, status=row["status"] if row else None, message=msg))
+            c.executemany("INSERT INTO audit_logs(actor_user_id,action,target_type,target_id,detail,created_at) VALUES(?,?,?,?,?, datetime('now'))", logs)
+        return results
 
     # ===== Overview =====
+    def _has_fts(self, c) -> bool:
+        if not hasattr(Repo, "_fts_ok"):   # FTS5 지원은 SQLite 빌드에 달렸으므로 프로세스당 한 번 확인. 없으면 LIKE
+            Repo._fts_ok = c.execute("SELECT 1 FROM sqlite_master WHERE name='employees_fts'").fetchone() is not None
+        return Repo._fts_ok
+
+    @staticmethod
+    def _fts_phrase(q: str) -> str:
+        return '"' + q.replace('"', '""') + '"'
+
+    def _name_filter(self, c, q: str) -> tuple[str, list]:
+        """이름/메일/사번 부분일치 조건 (e 별칭). 3글자 이상이면 trigram 색인, 그보다 짧으면 LIKE."""
+        if len(q) >= 3 and self._has_fts(c):
+            return "e.id IN (SELECT rowid FROM employees_fts WHERE employees_fts MATCH ?)", [self._fts_phrase(q)]
+        return "(e.name LIKE ? OR e.email LIKE ? OR e.employee_no LIKE ?)", [f"%{q}%"]*3
+
+    def search_employees(self, q: str, limit: int = 20):
+        """검색어 자동완성용: 사번 일치 > 이름/사번 앞부분 일치 > bm25 순위(이름 가중) 순으로 상위 limit명."""
+        q = q.strip()
+        if not q: return []
+        with get_conn() as c:
+            if len(q) >= 3 and self._has_fts(c):
+                return c.execute("""SELECT e.* FROM employees_fts f JOIN employees e ON e.id=f.rowid
+                                    WHERE employees_fts MATCH ?
+                                    ORDER BY e.employee_no=? DESC, (e.name LIKE ? OR e.employee_no LIKE ?) DESC,
+                                             bm25(employees_fts, 10.0, 1.0, 5.0)
+                                    LIMIT ?""", (self._fts_phrase(q), q, f"{q}%", f"{q}%", limit)).fetchall()
+            f, p = self._name_filter(c, q)
+            return c.execute(f"""SELECT e.* FROM employees e WHERE {f}
+                                 ORDER BY e.employee_no=? DESC, (e.name LIKE ? OR e.employee_no LIKE ?) DESC, e.name
+                                 LIMIT ?""", (*p, q, f"{q}%", f"{q}%", limit)).fetchall()
+
     def overview(self, base_date: str, dept_id: int | None, name_query: str | None):
+        return self.overview_page(base_date, dept_id, name_query)
+
+    def overview_page(self, base_date: str, dept_id: int | None, name_query: str | None,
+                      after_id: int | None = None, before_id: int | None = None, limit: int | None = None):
         sql = """SELECT e.*, a.in_time, a.out_time, a.lunch_minutes, a.mode, a.note
                  FROM employees e LEFT JOIN attendance a 
                  ON a.employee_id=e.id AND a.date=?"""
@@ -189,14 +477,70 @@ class Repo:
         filters=[]
         if dept_id:
             filters.append("e.department_id=?"); params.append(dept_id)
-        if name_query:
-            filters.append("(e.name LIKE ? OR e.email LIKE ? OR e.employee_no LIKE ?)")
-            params += [f"%{name_query}%"]*3
-        if filters:
-            sql += " WHERE " + " AND ".join(filters)
-        sql += " ORDER BY e.id"
         with get_conn() as c:
-            return c.execute(sql, tuple(params)).fetchall()
+            if name_query:
+                f, p = self._name_filter(c, name_query); filters.append(f); params += p
+            return self._keyset(c, sql, filters, params, "e.id", False, after_id, before_id, limit)
+
+    # ===== Export (커서 스트리밍) =====
+    EXPORT_BATCH = 2000
+
+    def _stream(self, sql: str, params=(), batch: int | None = None):
+        """(컬럼명 목록, 행 배치 제너레이터). 쿼리는 바로 실행하고 행은 fetchmany로 batch씩 꺼내므로
+        결과 전체를 메모리나 위젯에 올리지 않는다. 호출한 스레드에서 끝까지 소비해야 한다."""
+        cur = get_conn().execute(sql, tuple(params))
+        cols = [d[0] for d in cur.description]
+        def batches():
+            try:
+                while rows := cur.fetchmany(batch or self.EXPORT_BATCH):
+                    yield rows
+            finally:
+                cur.close()
+        return cols, batches()
+
+    def overview_export(self, base_date: str, dept_id: int | None, name_query: str | None, batch: int | None = None):
+        """overview_page와 같은 조건의 전체 결과를 스트리밍."""
+        sql = """SELECT e.id, e.employee_no, e.name, e.email, e.department_id, e.position,
+                        a.in_time, a.out_time, a.lunch_minutes, a.mode, a.note
+                 FROM employees e LEFT JOIN attendance a ON a.employee_id=e.id AND a.date=?"""
+        params = [base_date]; filters = []
+        if dept_id:
+            filters.append("e.department_id=?"); params.append(dept_id)
+        if name_query:
+            f, p = self._name_filter(get_conn(), name_query); filters.append(f); params += p
+        if filters: sql += " WHERE " + " AND ".join(filters)
+        return self._stream(sql + " ORDER BY e.id", params, batch)
+
+    def audit_export(self, batch: int | None = None, actor_user_id: int | None = None, action: str | None = None,
+                     target_type: str | None = None, target_id: int | None = None,
+                     since: str | None = None, until: str | None = None, archived: bool = True):
+        """audit_page와 같은 조건의 전체 결과를 스트리밍. 본 DB를 최신순으로 내보낸 뒤, archived면 기간과 겹치는
+        보관 DB를 최근 연도부터 이어 붙인다 (보관 DB는 그 연도를 읽는 동안만 ATTACH)."""
+        get_audit_writer().flush()
+        where, params = self._audit_where(actor_user_id, action, target_type, target_id, since, until)
+        sql = (f"SELECT {audit_archive.COLUMNS} FROM {{db}}.audit_logs"
+               + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY id DESC")
+        years = self._audit_years(since, until) if archived else []
+        cols, live = self._stream(sql.format(db="main"), params, batch)
+        if not years: return cols, live
+        def batches():
+            yield from live
+            c = get_conn()
+            for y in reversed(years):
+                with audit_archive.attached(c, y) as arc:
+                    yield from self._stream(sql.format(db=arc), params, batch)[1]   # 커서를 닫은 뒤 DETACH
+        return cols, batches()
+
+    def attendance_export(self, start: str, end: str, dept_id: int | None = None, batch: int | None = None):
+        """기간 내 근태 원본 행(직원 정보 포함)을 날짜, 직원 순으로 스트리밍."""
+        sql = """SELECT a.date, e.employee_no, e.name, e.department_id,
+                        a.in_time, a.out_time, a.lunch_minutes, a.mode, a.note
+                 FROM attendance a JOIN employees e ON e.id=a.employee_id
+                 WHERE a.date BETWEEN ? AND ?"""
+        params = [start, end]
+        if dept_id:
+            sql += " AND e.department_id=?"; params.append(dept_id)
+        return self._stream(sql + " ORDER BY a.date, a.employee_id", params, batch)
 
     # ===== Settings / Holidays / Leave balances =====
     def get_settings(self):
@@ -219,35 +563,122 @@ class Repo:
         with get_conn() as c:
             return c.execute("SELECT * FROM holidays ORDER BY date").fetchall()
 
+    def holiday_dates(self, s: str, e: str) -> set[str]:
+        return set(get_calendar().holidays_between(s, e))
+
     def add_holiday(self, date_str: str, name: str):
+        cal = get_calendar(); year = int(date_str[:4])
         with get_conn() as c:
             c.execute("INSERT OR IGNORE INTO holidays(date,name) VALUES(?,?)", (date_str, name))
+            cal.invalidate(year)   # 같은 연결로 다시 읽으므로 아래 재계산에 새 휴일이 반영됨
+            self._refresh_week(c, week_start_of(date_str))  # 휴일 여부가 바뀌면 그 주 버킷도 바뀜
+        cal.invalidate(year)       # 커밋 전에 다른 스레드가 읽어 둔 값 폐기
 
     def delete_holiday(self, date_str: str):
+        cal = get_calendar(); year = int(date_str[:4])
         with get_conn() as c:
             c.execute("DELETE FROM holidays WHERE date=?", (date_str,))
+            cal.invalidate(year)
+            self._refresh_week(c, week_start_of(date_str))
+        cal.invalidate(year)
+
+    # 연차: leave_ledger(추가 전용)에 부여/사용을 쌓고 잔액은 leave_balances 뷰(원장 합계)로 읽는다
+    ANNUAL_LEAVE_DAYS = 15.0
+    _BALANCE_COLS = """IFNULL(SUM(CASE WHEN l.kind='grant' THEN l.days END), 0) AS annual_total,
+                       -IFNULL(SUM(CASE WHEN l.kind='use' THEN l.days END), 0) AS annual_used,
+                       IFNULL(SUM(l.days), 0) AS remaining"""
+
+    def _grant_default_leave(self, c, employee_id: int):
+        c.execute("""INSERT INTO leave_ledger(employee_id,kind,days,note) SELECT ?, 'grant', ?, '기본 부여'
+                     WHERE NOT EXISTS (SELECT 1 FROM leave_ledger WHERE employee_id=?)""",
+                  (employee_id, self.ANNUAL_LEAVE_DAYS, employee_id))
+
+    def business_days(self, s: str, e: str) -> int:
+        """s~e 중 주말·휴일을 뺀 영업일 수 (연차 차감 기준). 달력 캐시에서 계산."""
+        return get_calendar().business_days(s, e)
 
     def get_leave_balance(self, employee_id: int):
+        """annual_total, annual_used, remaining. 원장이 없으면 기본 부여부터 기록."""
         with get_conn() as c:
-            b = c.execute("SELECT * FROM leave_balances WHERE employee_id=?", (employee_id,)).fetchone()
-            if not b:
-                c.execute("INSERT OR IGNORE INTO leave_balances(employee_id) VALUES(?)", (employee_id,))
-                b = c.execute("SELECT * FROM leave_balances WHERE employee_id=?", (employee_id,)).fetchone()
-            return b
+            self._grant_default_leave(c, employee_id)
+            return c.execute(f"SELECT ? AS employee_id, {self._BALANCE_COLS} FROM leave_ledger l WHERE l.employee_id=?",
+                             (employee_id, employee_id)).fetchone()
 
     def set_leave_total(self, employee_id: int, total: float):
+        """총 부여 일수를 total로 맞추는 조정 행을 추가 (기존 행은 고치지 않음)."""
+        with get_conn() as c:
+            self._grant_default_leave(c, employee_id)
+            c.execute("""INSERT INTO leave_ledger(employee_id,kind,days,note)
+                         SELECT ?, 'grant', ? - g, '부여 조정'
+                         FROM (SELECT IFNULL(SUM(days),0) AS g FROM leave_ledger WHERE employee_id=? AND kind='grant')
+                         WHERE ? - g <> 0""",
+                      (employee_id, total, employee_id, total))
+
+    def leave_balances(self, dept_id: int | None = None):
+        """직원 전체(또는 부서)의 연차 잔액. 원장 (employee_id, kind, days) 커버링 인덱스 합계 한 번."""
+        sql = f"""SELECT e.id AS employee_id, e.employee_no, e.name, e.department_id, {self._BALANCE_COLS}
+                  FROM employees e LEFT JOIN leave_ledger l ON l.employee_id=e.id"""
+        params = []
+        if dept_id:
+            sql += " WHERE e.department_id=?"; params.append(dept_id)
         with get_conn() as c:
-            c.execute("UPDATE leave_balances SET annual_total=? WHERE employee_id=?", (total, employee_id))
+            return c.execute(sql + " GROUP BY e.id ORDER BY e.id", params).fetchall()
+
+    def leave_ledger(self, employee_id: int):
+        with get_conn() as c:
+            return c.execute("SELECT * FROM leave_ledger WHERE employee_id=? ORDER BY id", (employee_id,)).fetchall()
 
     # ===== Audit =====
     def audit(self, actor_user_id: int, action: str, target_type: str, target_id: int, detail: str | None = None):
-        with get_conn() as c:
-            c.execute("INSERT INTO audit_logs(actor_user_id,action,target_type,target_id,detail) VALUES(?,?,?,?,?)",
-                      (actor_user_id, action, target_type, target_id, detail))
+        """버퍼에 넣고 바로 반환. 백그라운드 스레드가 모아서 기록한다 (app.audit_log)."""
+        get_audit_writer().log(actor_user_id, action, target_type, target_id, detail)
 
     def audit_recent(self, limit: int = 200):
-        with get_conn() as c:
-            return c.execute("SELECT * FROM audit_logs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return self.audit_page(limit=limit)
+
+    def archive_audit(self, keep_days: int = audit_archive.KEEP_DAYS, before: str | None = None) -> dict[int, int]:
+        """오래된 감사 로그를 연도별 보관 DB로 이동 (app.audit_archive.archive)."""
+        return audit_archive.archive(keep_days, before)
+
+    @staticmethod
+    def _audit_where(actor_user_id=None, action=None, target_type=None, target_id=None,
+                     since: str | None = None, until: str | None = None) -> tuple[list, list]:
+        where, params = [], []
+        for col, v in (("actor_user_id", actor_user_id), ("action", action), ("target_type", target_type), ("target_id", target_id)):
+            if v is not None:
+                where.append(f"{col}=?"); params.append(v)
+        if since:
+            where.append("created_at>=?"); params.append(since)
+        if until:   # until 날짜 당일 포함
+            where.append("created_at<?"); params.append((datetime.strptime(until[:10], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d'))
+        return where, params
+
+    @staticmethod
+    def _audit_years(since: str | None, until: str | None) -> list[int]:
+        """기간(since~until)과 겹치는 보관 DB 연도 (오름차순)."""
+        return [y for y in audit_archive.years() if (not since or y >= int(since[:4])) and (not until or y <= int(until[:4]))]
+
+    def audit_page(self, after_id: int | None = None, limit: int = 200, before_id: int | None = None,
+                   actor_user_id: int | None = None, action: str | None = None, target_type: str | None = None,
+                   target_id: int | None = None, since: str | None = None, until: str | None = None, archived: bool = True):
+        """감사 로그 최신순 페이지. after_id보다 오래된 것 / before_id보다 최근 것.
+
+        행위자/액션/타깃/기간(since~until, UTC 날짜) 조건은 각각 인덱스로 찾는다. archived면 기간과
+        겹치는 연도의 보관 DB를 하나씩 ATTACH해 같은 조건으로 조회하고 id 순으로 합친다.
+        """
+        get_audit_writer().flush()
+        where, params = self._audit_where(actor_user_id, action, target_type, target_id, since, until)
+        with get_conn() as c:
+            rows = self._keyset(c, "SELECT * FROM main.audit_logs", where, params, "id", True, after_id, before_id, limit)
+            years = self._audit_years(since, until) if archived else []
+            if not years: return rows
+            rows = list(rows)
+            for y in years:
+                with audit_archive.attached(c, y) as arc:
+                    rows += self._keyset(c, f"SELECT * FROM {arc}.audit_logs", where, params, "id", True, after_id, before_id, limit)
+        rows.sort(key=lambda r: r["id"], reverse=True)
+        if limit is None: return rows
+        return rows[-limit:] if before_id is not None else rows[:limit]
 
     # ===== Performance =====
     # Goals
@@ -275,10 +706,12 @@ class Repo:
             c.execute("""INSERT INTO goals(employee_id,quarter,title,description,weight,status,updated_at) 
                          VALUES(?,?,?,?,?,'draft', datetime('now'))""",
                       (employee_id, quarter, title, description, weight))
+            self._refresh_goal_rollup(c, employee_id, quarter)
 
     def update_goal_progress(self, id: int, progress: float):
         with get_conn() as c:
             c.execute("UPDATE goals SET progress=?, updated_at=datetime('now') WHERE id=?", (progress, id))
+            self._refresh_goal(c, id)
 
     def submit_goal(self, id: int):
         with get_conn() as c:
@@ -295,6 +728,78 @@ class Repo:
             elif row["manager_status"]=="approved" and row["hr_status"]=="approved":
                 status="approved"
             c.execute("UPDATE goals SET status=?, updated_at=datetime('now') WHERE id=?", (status, id))
+            self._refresh_goal(c, id)
+
+    # Goal rollups (대시보드용 집계 테이블)
+    _ROLLUP_AGG = "COUNT(*), IFNULL(SUM(IFNULL(weight,1.0)),0), IFNULL(SUM(IFNULL(weight,1.0) * IFNULL(progress,0)),0)"
+
+    def _refresh_goal_rollup(self, c, employee_id: int, quarter: str):
+        """직원 한 명의 한 분기 집계를 goals에서 다시 계산하고, 차이만큼 부서 집계에 반영한다."""
+        old = c.execute("SELECT department_id, goals, weight_sum, weighted FROM goal_rollups WHERE employee_id=? AND quarter=?",
+                        (employee_id, quarter)).fetchone()
+        n, wsum, wprog = c.execute(f"SELECT {self._ROLLUP_AGG} FROM goals WHERE employee_id=? AND quarter=?",
+                                   (employee_id, quarter)).fetchone()
+        dept = c.execute("SELECT department_id FROM employees WHERE id=?", (employee_id,)).fetchone()
+        dept = dept[0] if dept else None
+        if n:
+            c.execute("""INSERT INTO goal_rollups(employee_id,quarter,department_id,goals,weight_sum,weighted,progress) VALUES(?,?,?,?,?,?,?)
+                         ON CONFLICT(employee_id,quarter) DO UPDATE SET department_id=excluded.department_id, goals=excluded.goals,
+                         weight_sum=excluded.weight_sum, weighted=excluded.weighted, progress=excluded.progress""",
+                      (employee_id, quarter, dept, n, wsum, wprog, wprog / wsum if wsum else 0.0))
+        elif old:
+            c.execute("DELETE FROM goal_rollups WHERE employee_id=? AND quarter=?", (employee_id, quarter))
+        if old:
+            self._add_dept_rollup(c, quarter, old["department_id"], -1, -old["goals"], -old["weight_sum"], -old["weighted"])
+        if n:
+            self._add_dept_rollup(c, quarter, dept, 1, n, wsum, wprog)
+
+    def _add_dept_rollup(self, c, quarter: str, dept_id: int | None, emps: int, n: int, wsum: float, wprog: float):
+        dept_id = dept_id or 0   # 부서 없음은 0 (PK에 NULL을 두지 않음)
+        c.execute("""INSERT INTO goal_dept_rollups(quarter,department_id,employees,goals,weight_sum,weighted) VALUES(?,?,?,?,?,?)
+                     ON CONFLICT(quarter,department_id) DO UPDATE SET employees=employees+excluded.employees,
+                     goals=goals+excluded.goals, weight_sum=weight_sum+excluded.weight_sum, weighted=weighted+excluded.weighted""",
+                  (quarter, dept_id, emps, n, wsum, wprog))
+        c.execute("""UPDATE goal_dept_rollups SET progress=CASE WHEN weight_sum>0 THEN weighted/weight_sum ELSE 0 END
+                     WHERE quarter=? AND department_id=?""", (quarter, dept_id))
+        c.execute("DELETE FROM goal_dept_rollups WHERE quarter=? AND department_id=? AND employees<=0", (quarter, dept_id))
+
+    def _refresh_goal(self, c, goal_id: int):
+        g = c.execute("SELECT employee_id, quarter FROM goals WHERE id=?", (goal_id,)).fetchone()
+        if g: self._refresh_goal_rollup(c, g["employee_id"], g["quarter"])
+
+    def _move_goal_rollups(self, c, employee_id: int):
+        """부서 이동한 직원의 모든 분기 집계를 새 부서로 옮긴다."""
+        for (q,) in c.execute("SELECT quarter FROM goal_rollups WHERE employee_id=?", (employee_id,)).fetchall():
+            self._refresh_goal_rollup(c, employee_id, q)
+
+    def _rebuild_goal_rollups(self, c):
+        c.execute("DELETE FROM goal_rollups"); c.execute("DELETE FROM goal_dept_rollups")
+        c.execute(f"""INSERT INTO goal_rollups(employee_id,quarter,department_id,goals,weight_sum,weighted)
+                      SELECT g.employee_id, g.quarter, e.department_id, {self._ROLLUP_AGG}
+                      FROM goals g LEFT JOIN employees e ON e.id=g.employee_id GROUP BY g.employee_id, g.quarter""")
+        c.execute("UPDATE goal_rollups SET progress=CASE WHEN weight_sum>0 THEN weighted/weight_sum ELSE 0 END")
+        c.execute("""INSERT INTO goal_dept_rollups(quarter,department_id,employees,goals,weight_sum,weighted,progress)
+                     SELECT quarter, IFNULL(department_id,0), COUNT(*), SUM(goals), SUM(weight_sum), SUM(weighted),
+                            CASE WHEN SUM(weight_sum)>0 THEN SUM(weighted)/SUM(weight_sum) ELSE 0 END
+                     FROM goal_rollups GROUP BY quarter, IFNULL(department_id,0)""")
+
+    def rebuild_goal_rollups(self):
+        """goal_rollups/goal_dept_rollups를 goals 원본에서 통째로 다시 만든다."""
+        with get_conn() as c:
+            self._rebuild_goal_rollups(c)
+
+    def goal_rollup_rank(self, quarter: str, limit: int = 10, bottom: bool = False, dept_id: int | None = None):
+        """분기 가중 진행률 상위(bottom이면 하위) limit명. (quarter[, department_id], progress) 인덱스 순서대로 읽는다."""
+        sql = "SELECT * FROM goal_rollups WHERE quarter=?"; params = [quarter]
+        if dept_id:
+            sql += " AND department_id=?"; params.append(dept_id)
+        with get_conn() as c:
+            return c.execute(sql + f" ORDER BY progress {'ASC' if bottom else 'DESC'} LIMIT ?", params + [limit]).fetchall()
+
+    def goal_dept_rollups(self, quarter: str):
+        """분기의 부서별 가중 진행률 (부서 수만큼의 행)."""
+        with get_conn() as c:
+            return c.execute("SELECT * FROM goal_dept_rollups WHERE quarter=? ORDER BY progress DESC", (quarter,)).fetchall()
 
     # Reviews
     def add_review(self, employee_id: int, reviewer_id: int, period: str, category: str, score: float, comment: str):
@@ -302,6 +807,7 @@ class Repo:
             c.execute("""INSERT INTO reviews(employee_id,reviewer_id,period,category,score,comment,submitted_at)
                          VALUES(?,?,?,?,?,?, datetime('now'))""",
                       (employee_id, reviewer_id, period, category, score, comment))
+        get_review_stats().invalidate(period)
 
     def reviews_for_role(self, role: str, employee_id: int | None, manager_dept_id: int | None, period: str | None):
         sql = "SELECT r.* FROM reviews r"
@@ -321,6 +827,10 @@ class Repo:
         with get_conn() as c:
             return c.execute(sql, tuple(params)).fetchall()
 
+    def review_stats(self, period: str | None):
+        """기간별 평가 통계 (분포/백분위/유형별/부서별/직원별/평가자 편차). app.review_stats에서 캐시한다."""
+        return get_review_stats().period(period or None)
+
     def review_avg_by_employee(self, period: str | None):
         sql = "SELECT employee_id, AVG(score) AS avg_score, COUNT(*) AS cnt FROM reviews"
         params=[]
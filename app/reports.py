@@ -0,0 +1,134 @@
+"""월말 부서별 보고서: 부서마다 근태 버킷(일반/연장/야간/휴일), 연장근무 신청, 휴가 사용을 직원별 CSV로 만들고
+부서 합계를 모아 전사 요약(summary.csv)을 쓴다.
+
+    python -m app.cli report --month 2025-01 --workers 4
+    res = monthly_reports("2025-01"); res["total"]["overtime"], res["departments"][0]["path"]
+
+부서 하나가 작업 하나다. ProcessPoolExecutor로 코어 수만큼 나눠 돌리므로(버킷 계산이 CPU 위주라
+스레드로는 GIL 때문에 늘지 않음) 부서가 여럿이면 코어 수에 비례해 빨라진다. 워커는 앱의 연결 풀을 쓰지 않고
+자기 읽기 전용 연결(URI mode=ro)을 열어 근태를 직원 순으로 배치 단위로 읽으며, 끝난 직원부터 CSV에 쓴다.
+휴일 목록은 부모가 한 번 읽어 넘긴다. 소속 부서가 없는 직원은 부서 0(미배정)으로 묶는다.
+"""
+import os, sqlite3, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+from app import core_db
+from app.biz_calendar import count_business_days, get_calendar, weekday_holidays
+from app.exporter import export_dir, write_csv
+from app.utils_time import BUCKET_KEYS, calc_work_buckets_batch, month_range_of
+
+BATCH = 5000            # 워커가 한 번에 읽는 근태 행 수
+UNASSIGNED = "미배정"
+SUM_KEYS = ("headcount", "days") + BUCKET_KEYS + ("ot_requests", "ot_minutes", "leave_days", "annual_days")
+COLS = ("사번", "이름", "근무일", "일반", "연장", "야간", "휴일", "합계(분)",
+        "연장신청(건)", "연장신청(분)", "휴가(일)", "연차(일)")
+SUMMARY_COLS = ("부서ID", "부서", "인원", "근무일", "일반", "연장", "야간", "휴일", "합계(분)",
+                "연장신청(건)", "연장신청(분)", "휴가(일)", "연차(일)", "파일")
+
+def connect_ro(path) -> sqlite3.Connection:
+    """읽기 전용 연결. 쓰기를 시도하면 sqlite3.OperationalError."""
+    conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True, timeout=core_db.BUSY_TIMEOUT)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _emp_totals(cur, holidays, names: dict):
+    """직원 순으로 정렬된 근태 커서를 배치로 읽어 (직원, 합계)를 직원이 끝날 때마다 내보낸다.
+    names에는 직원별 (사번, 이름)을 모은다."""
+    carry = None
+    while rows := cur.fetchmany(BATCH):
+        for r in rows:
+            if r[0] not in names: names[r[0]] = (r[1], r[2])
+        _, per = calc_work_buckets_batch(rows, holidays, with_rows=False)
+        if carry is not None:
+            emp, t = carry
+            if emp in per:   # 배치 경계에 걸친 직원: 앞 배치 몫을 더함 (per의 첫 키)
+                for k, v in t.items(): per[emp][k] += v
+            else:
+                yield carry
+        *done, carry = per.items()
+        yield from done
+    if carry is not None: yield carry
+
+def dept_report(db_path: str, dept_id: int, start: str, end: str, holidays: frozenset, path: str) -> dict:
+    """부서 하나의 직원별 CSV를 path에 쓰고 부서 합계를 반환한다. 프로세스 워커에서 실행된다."""
+    t0 = time.perf_counter()
+    conn = connect_ro(db_path)
+    try:
+        dept_sql = "e.department_id=:dept" if dept_id else "e.department_id IS NULL"
+        p = dict(dept=dept_id, s=start, e=end)
+        ot = {r[0]: (r[1], r[2]) for r in conn.execute(f"""
+            SELECT o.employee_id, COUNT(*), SUM(o.minutes) FROM overtime_requests o JOIN employees e ON e.id=o.employee_id
+            WHERE {dept_sql} AND o.status='approved' AND o.date BETWEEN :s AND :e GROUP BY o.employee_id""", p)}
+        leave: dict[int, list] = {}
+        s, e = date.fromisoformat(start), date.fromisoformat(end); wk = weekday_holidays(holidays)
+        for r in conn.execute(f"""
+                SELECT l.employee_id, l.start_date, l.end_date, l.type FROM leave_requests l JOIN employees e ON e.id=l.employee_id
+                WHERE {dept_sql} AND l.status='approved' AND l.start_date <= :e AND l.end_date >= :s""", p):
+            n = count_business_days(max(s, date.fromisoformat(r[1])), min(e, date.fromisoformat(r[2])), wk)
+            acc = leave.setdefault(r[0], [0, 0]); acc[0] += n
+            if r[3] == "연차": acc[1] += n
+        cur = conn.execute(f"""
+            SELECT e.id AS employee_id, e.employee_no, e.name, a.date, a.in_time, a.out_time, a.lunch_minutes
+            FROM employees e LEFT JOIN attendance a ON a.employee_id=e.id AND a.date BETWEEN :s AND :e
+            WHERE {dept_sql} ORDER BY e.id, a.date""", p)
+        names: dict[int, tuple] = {}
+        tot = dict.fromkeys(SUM_KEYS, 0)
+        def rows():   # 직원 행을 모아 CSV 배치로 (근태 행은 calc_work_buckets_batch로 한 번씩만 계산)
+            buf = []
+            for emp, t in _emp_totals(cur, holidays, names):
+                n_ot, m_ot = ot.get(emp, (0, 0)); lv, an = leave.get(emp, (0, 0))
+                for k in BUCKET_KEYS: tot[k] += t[k]
+                tot["headcount"] += 1; tot["days"] += t["days"]
+                tot["ot_requests"] += n_ot; tot["ot_minutes"] += m_ot; tot["leave_days"] += lv; tot["annual_days"] += an
+                no, name = names.pop(emp)
+                buf.append((no, name, t["days"], t["regular"], t["overtime"], t["night"], t["holiday"], t["total"],
+                            n_ot, m_ot, lv, an))
+                if len(buf) >= 500:
+                    yield buf; buf = []
+            if buf: yield buf
+        write_csv(COLS, rows(), path)
+    finally:
+        conn.close()
+    return dict(dept_id=dept_id, path=path, seconds=time.perf_counter() - t0, **tot)
+
+def monthly_reports(month: str, out_dir: str | None = None, workers: int | None = None,
+                    compress: bool = False, progress=None) -> dict:
+    """month(YYYY-MM)의 부서별 CSV와 summary.csv를 out_dir(기본: exports/monthly_YYYY-MM)에 쓴다.
+
+    workers는 프로세스 수(기본: CPU 수, 1이면 풀 없이 현재 프로세스에서). progress(끝난 부서 수, 전체)는
+    부서가 끝날 때마다 호출. 반환: {"departments": [부서 합계...], "total": 전사 합계, "summary": 경로, "seconds": 초}.
+    """
+    t0 = time.perf_counter()
+    s, e = month_range_of(date.fromisoformat(month + "-01")); start, end = s.isoformat(), e.isoformat()
+    folder = Path(out_dir or os.path.join(export_dir(), f"monthly_{month}")); folder.mkdir(parents=True, exist_ok=True)
+    conn = core_db.get_conn()
+    names = {r[0]: r[1] for r in conn.execute("SELECT id, name FROM departments")}
+    # 인원 많은 부서부터 넣어야 마지막에 큰 부서 하나만 남아 도는 일이 줄어든다
+    depts = [(r[0] or 0, r[1]) for r in conn.execute(
+        "SELECT department_id, COUNT(*) FROM employees GROUP BY department_id ORDER BY 2 DESC")]
+    holidays = frozenset(get_calendar().holidays_between(s, e))
+    ext = ".csv.gz" if compress else ".csv"
+    jobs = [(str(core_db.DB_PATH), d, start, end, holidays, str(folder / f"dept_{d:03d}{ext}")) for d, _ in depts]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    results = []
+    if workers == 1:
+        for job in jobs:
+            results.append(dept_report(*job))
+            if progress: progress(len(results), len(jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for f in as_completed([ex.submit(dept_report, *job) for job in jobs]):
+                results.append(f.result())
+                if progress: progress(len(results), len(jobs))
+    results.sort(key=lambda r: r["dept_id"])
+    total = dict.fromkeys(SUM_KEYS, 0)
+    for r in results:
+        r["name"] = names.get(r["dept_id"], str(r["dept_id"])) if r["dept_id"] else UNASSIGNED
+        for k in SUM_KEYS: total[k] += r[k]
+    summary = str(folder / "summary.csv")
+    rows = [(r["dept_id"], r["name"], *(r[k] for k in SUM_KEYS), os.path.basename(r["path"])) for r in results]
+    rows.append(("", "전체", *(total[k] for k in SUM_KEYS), ""))
+    write_csv(SUMMARY_COLS, [rows], summary)
+    return dict(month=month, departments=results, total=total, summary=summary,
+                workers=workers, seconds=time.perf_counter() - t0)
@@ -0,0 +1,129 @@
+"""평가(reviews) 통계: 기간별로 reviews를 한 번 훑어 보정(calibration)에 필요한 값을 모두 구하고 메모리에 둔다.
+
+    s = get_review_stats().period("2025Q3")
+    s["overall"]["mean"], s["overall"]["std"], s["overall"]["p50"]
+    s["by_category"]["peer"], s["by_department"][2], s["by_employee"][7], s["reviewers"][3]["offset"]
+
+평균/분산은 Welford 방식으로 누적하고, 백분위는 점수별 건수(정렬된 히스토그램)에서 구한다 — 점수 종류가
+적으므로 행을 모두 들고 정렬할 필요가 없다. 평가자 편차(offset)는 그 평가자가 준 점수가 같은 피평가자의
+기간 평균보다 평균적으로 얼마나 높은지(+면 후함)이다. 부서는 피평가자의 현재 부서(없으면 0).
+Repo.add_review가 해당 기간을, import_employees(부서 이동)와 복원이 전체를 invalidate한다.
+"""
+import threading
+from app import core_db
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+class RunningStats:
+    """Welford 누적: 한 번에 한 값씩 더하며 평균/분산을 수치적으로 안정되게 유지한다."""
+    __slots__ = ("n", "mean", "m2", "lo", "hi")
+
+    def __init__(self):
+        self.n = 0; self.mean = 0.0; self.m2 = 0.0; self.lo = None; self.hi = None
+
+    def add(self, x: float):
+        self.n += 1; d = x - self.mean
+        self.mean += d / self.n; self.m2 += d * (x - self.mean)
+        if self.lo is None or x < self.lo: self.lo = x
+        if self.hi is None or x > self.hi: self.hi = x
+
+    @property
+    def std(self) -> float:
+        """표본 표준편차 (n<2면 0)."""
+        return (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+
+    def summary(self) -> dict:
+        return dict(n=self.n, mean=self.mean, std=self.std, min=self.lo, max=self.hi)
+
+class Distribution(RunningStats):
+    """RunningStats + 점수별 건수. 백분위는 건수 누적으로 선형 보간 (statistics.quantiles의 inclusive와 같음)."""
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.n = 0; self.mean = 0.0; self.m2 = 0.0; self.counts: dict[float, int] = {}
+
+    def add(self, x: float):   # 행마다 불리므로 RunningStats.add를 펼쳐 씀
+        self.n += 1; d = x - self.mean
+        self.mean += d / self.n; self.m2 += d * (x - self.mean)
+        c = self.counts; c[x] = c.get(x, 0) + 1
+
+    @property
+    def lo(self): return min(self.counts) if self.counts else None
+
+    @property
+    def hi(self): return max(self.counts) if self.counts else None
+
+    def _nth(self, k: int) -> float:
+        """정렬했을 때 k번째(0부터) 값."""
+        seen = 0
+        for v in sorted(self.counts):
+            seen += self.counts[v]
+            if seen > k: return v
+
+    def percentile(self, p: float) -> float | None:
+        if not self.n: return None
+        rank = (self.n - 1) * p / 100; i = int(rank); lo = self._nth(i)
+        return lo if rank == i else lo + (self._nth(i + 1) - lo) * (rank - i)
+
+    def summary(self) -> dict:
+        out = super().summary()
+        for p in PERCENTILES: out[f"p{p}"] = self.percentile(p)
+        out["histogram"] = dict(sorted(self.counts.items()))
+        return out
+
+def compute(period: str | None, conn=None) -> dict:
+    """period(None이면 전체)의 reviews를 한 번 읽어 통계를 만든다."""
+    conn = conn or core_db.get_conn()
+    sql = ("SELECT r.employee_id, r.reviewer_id, r.category, r.score, IFNULL(e.department_id, 0) "
+           "FROM reviews r LEFT JOIN employees e ON e.id=r.employee_id")
+    cur = conn.execute(sql + " WHERE r.period=?", (period,)) if period else conn.execute(sql)
+    overall = Distribution(); by_cat: dict[str, Distribution] = {}; by_dept: dict[int, Distribution] = {}
+    by_emp: dict[int, RunningStats] = {}; by_rev: dict[int, RunningStats] = {}
+    pairs: dict[int, dict[int, int]] = {}   # 평가자 -> {피평가자: 건수}
+    def acc(groups: dict, key, cls):
+        st = groups.get(key)
+        if st is None: st = groups[key] = cls()
+        return st
+    for emp, rev, cat, score, dept in cur:
+        overall.add(score)
+        acc(by_cat, cat, Distribution).add(score); acc(by_dept, dept, Distribution).add(score)
+        acc(by_emp, emp, RunningStats).add(score); acc(by_rev, rev, RunningStats).add(score)
+        p = acc(pairs, rev, dict); p[emp] = p.get(emp, 0) + 1
+    reviewers = {}
+    for rev, st in by_rev.items():
+        expected = sum(cnt * by_emp[emp].mean for emp, cnt in pairs[rev].items()) / st.n
+        reviewers[rev] = dict(n=st.n, mean=st.mean, offset=st.mean - expected)
+    return dict(period=period, overall=overall.summary(),
+                by_category={k: v.summary() for k, v in by_cat.items()},
+                by_department={k: v.summary() for k, v in by_dept.items()},
+                by_employee={k: v.summary() for k, v in by_emp.items()},
+                reviewers=reviewers)
+
+class ReviewStats:
+    def __init__(self):
+        self._cache: dict[str | None, dict] = {}; self._path = None
+        self._lock = threading.Lock(); self._gen = 0
+
+    def period(self, period: str | None) -> dict:
+        if self._path != core_db.DB_PATH:
+            self.invalidate(); self._path = core_db.DB_PATH
+        res = self._cache.get(period)
+        if res is None:
+            with self._lock:
+                gen = self._gen
+                res = compute(period)
+                if gen == self._gen:   # 계산 도중 invalidate되었으면 보관하지 않음
+                    self._cache[period] = res
+        return res
+
+    def invalidate(self, period: str | None = None):
+        """period의 캐시(와 전체 기간 캐시)를 지운다. None이면 전부."""
+        self._gen += 1
+        if period is None: self._cache = {}
+        else:
+            self._cache.pop(period, None); self._cache.pop(None, None)
+
+_stats = ReviewStats()
+
+def get_review_stats() -> ReviewStats:
+    return _stats
@@ -1,5 +1,7 @@
-from app.core_db import get_conn, init_db
-from app.utils_security import pbkdf2_hash
+from app import core_db
+from app.core_db import get_conn, init_db, schema_version, SCHEMA_VERSION
+from app.repo import Repo
+from app.utils_security import hash_password
 from datetime import datetime, timedelta
 
 def seed():
@@ -14,20 +16,21 @@ def seed():
                 ('A003','박철수','park@example.com',2,'개발자'),
             ])
         if not c.execute("SELECT 1 FROM users LIMIT 1").fetchone():
-            s1,h1 = pbkdf2_hash('admin1234');   c.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)", ('admin',s1,h1,'admin',None))
-            s2,h2 = pbkdf2_hash('hr1234');      c.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)", ('hr1',s2,h2,'hr',1))
-            s3,h3 = pbkdf2_hash('manager1234'); c.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)", ('manager1',s3,h3,'manager',3))
-            s4,h4 = pbkdf2_hash('user1234');    c.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)", ('user',s4,h4,'user',1))
-        # 연차 잔여 테이블 보정
+            s1,h1 = hash_password('admin1234');   c.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)", ('admin',s1,h1,'admin',None))
+            s2,h2 = hash_password('hr1234');      c.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)", ('hr1',s2,h2,'hr',1))
+            s3,h3 = hash_password('manager1234'); c.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)", ('manager1',s3,h3,'manager',3))
+            s4,h4 = hash_password('user1234');    c.execute("INSERT INTO users(username,salt,password_hash,role,employee_id) VALUES(?,?,?,?,?)", ('user',s4,h4,'user',1))
+        # 연차 기본 부여 (원장이 비어 있는 직원만)
         for emp_id in [1,2,3]:
-            c.execute("INSERT OR IGNORE INTO leave_balances(employee_id, annual_total, annual_used) VALUES(?,?,?)", (emp_id, 15.0, 0.0))
+            Repo()._grant_default_leave(c, emp_id)
         # 샘플 근태
-        today = datetime.now().date()
+        today = datetime.now().date(); added_attendance = False
         for i in range(5):
             d = (today - timedelta(days=i)).strftime('%Y-%m-%d')
             if not c.execute("SELECT 1 FROM attendance WHERE employee_id=1 AND date=?", (d,)).fetchone():
                 c.execute("INSERT INTO attendance(employee_id,date,in_time,out_time,lunch_minutes,mode) VALUES(?,?,?,?,?,?)",
                           (1,d,'08:46','16:46',60,'office'))
+                added_attendance = True
         # 샘플 성과
         if not c.execute("SELECT 1 FROM competencies LIMIT 1").fetchone():
             c.executemany("INSERT INTO competencies(name,description) VALUES(?,?)", [
@@ -35,7 +38,8 @@ def seed():
                 ('문제해결','문제 인식과 해결 능력'),
                 ('기술스킬','직무 관련 기술'),
             ])
-        if not c.execute("SELECT 1 FROM goals LIMIT 1").fetchone():
+        added_goals = not c.execute("SELECT 1 FROM goals LIMIT 1").fetchone()
+        if added_goals:
             c.executemany("""INSERT INTO goals(employee_id,quarter,title,description,weight,progress,manager_status,hr_status,status,updated_at)
                              VALUES(?,?,?,?,?,?,?,?,?, datetime('now'))""", [
                 (1,'2025Q3','팀 운영 효율 개선','회의시간 20% 감축',0.4,55,'approved','pending','submitted'),
@@ -49,3 +53,19 @@ def seed():
                 (2,3,'2025Q3','peer',4.2,'협업 원활'),
                 (3,1,'2025Q3','manager',4.8,'탁월한 문제 해결'),
             ])
+    if added_attendance:
+        Repo().rebuild_weekly_totals()
+    if added_goals:   # 목표를 Repo를 거치지 않고 넣었으므로 집계 테이블(goal_rollups)을 다시 계산
+        Repo().rebuild_goal_rollups()
+
+def ensure_db() -> str:
+    """앱 시작용. 스키마가 최신이면 아무것도 하지 않는다(warm start: PRAGMA 한 번).
+    이전 버전 DB(employees 테이블이 있으면 user_version이 0이어도)면 테이블/마이그레이션만 적용하고,
+    새 DB일 때만 seed()로 샘플 데이터까지 넣는다.
+    반환: 'warm' | 'migrated' | 'seeded'"""
+    if core_db.DB_PATH.exists():
+        if schema_version() == SCHEMA_VERSION: return "warm"
+        # user_version이 0인 예전 릴리스 DB도 기존 DB다: employees 테이블이 있으면 샘플을 넣지 않는다
+        if get_conn().execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='employees'").fetchone():
+            init_db(); return "migrated"
+    seed(); return "seeded"
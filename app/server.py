@@ -0,0 +1,291 @@
+"""로컬 JSON HTTP 서비스: 한 프로세스가 hris.db를 열고 여러 클라이언트의 조회/결재 요청을 처리한다.
+여러 HR 담당자가 공유 폴더의 DB 파일을 각자 열어 락을 다투는 대신 이 서버에 붙는다.
+
+    python -m app.server                          # 127.0.0.1:8765
+    python -m app.server --host 0.0.0.0 --port 9000 --db D:/hris/hris.db
+
+    POST /api/login {"username","password"}   -> {"token", "user"}    이후 Authorization: Bearer <token>
+    GET  /api/inbox?kind=&after=&limit=        POST /api/decide {"items": [["leave", 3], …], "stage", "approve"}
+    GET  /api/employees?q=   /api/overview?date=&dept=&q=&after=   /api/audit?action=&since=…   (ROUTES 참고)
+
+요청마다 스레드가 생기고(ThreadingHTTPServer), 각 스레드는 core_db의 스레드별 연결을 쓰다가 끝날 때
+풀에 돌려준다. GET 응답은 본문 해시를 (약한) ETag로 붙여 If-None-Match가 같으면 304만 보내고,
+Accept-Encoding에 gzip이 있으면 큰 본문은 압축한다. 세션은 메모리에만 둔다(재시작하면 다시 로그인).
+"""
+import argparse, gzip, hashlib, json, logging, re, secrets, sys, threading, time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from app import core_db
+from app.repo import Repo
+from app.directory import get_directory
+from app.utils_security import verify_password, needs_rehash, hash_password, DEFAULT_PARAMS
+
+HOST = "127.0.0.1"
+PORT = 8765
+SESSION_TTL = 8 * 3600     # 초
+GZIP_MIN = 1024            # 이보다 작은 본문은 압축하지 않음
+MAX_BODY = 1 << 20
+PAGE_LIMIT = 200           # 페이지 조회 기본/최대 건수
+
+log = logging.getLogger("hris.server")
+repo = Repo()
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message); self.status = status
+
+# ===== 세션 =====
+_sessions: dict[str, dict] = {}
+_sessions_lock = threading.Lock()
+
+def _login(body: dict) -> dict:
+    row = repo.user_by_username(str(body.get("username", "")))
+    if not row or not verify_password(str(body.get("password", "")), row["password_hash"], row["salt"]):
+        raise HttpError(401, "아이디 또는 비밀번호가 올바르지 않습니다.")
+    params = repo.get_settings()["password_params"] or DEFAULT_PARAMS
+    if needs_rehash(row["password_hash"], params):
+        repo.update_user_password(row["id"], *hash_password(str(body["password"]), params))
+    user = dict(id=row["id"], username=row["username"], role=row["role"], employee_id=row["employee_id"])
+    user["dept_id"] = get_directory().department_of(row["employee_id"]) if row["role"] == "manager" else None
+    token = secrets.token_urlsafe(24)
+    with _sessions_lock:
+        now = time.time()
+        for t in [t for t, s in _sessions.items() if s["expires"] < now]: del _sessions[t]
+        _sessions[token] = dict(user=user, expires=now + SESSION_TTL)
+    return dict(token=token, user=user)
+
+def _session_user(header: str | None) -> dict:
+    token = header[7:] if header and header.startswith("Bearer ") else None
+    with _sessions_lock:
+        s = _sessions.get(token) if token else None
+        if s and s["expires"] >= time.time(): return s["user"]
+    raise HttpError(401, "로그인이 필요합니다.")
+
+# ===== 파라미터 =====
+def _int(q: dict, name: str, default=None, limit: int | None = None):
+    v = q.get(name, [None])[0]
+    if v in (None, ""): return default
+    try: n = int(v)
+    except ValueError: raise HttpError(400, f"{name}: 정수가 아닙니다.")
+    return min(n, limit) if limit else n
+
+def _str(q: dict, name: str, default=None):
+    v = q.get(name, [None])[0]
+    return v if v not in (None, "") else default
+
+def _need(user: dict, *roles: str):
+    if user["role"] not in roles: raise HttpError(403, "권한이 없습니다.")
+
+def _dept_scope(user: dict, q: dict) -> int | None:
+    """매니저는 자기 부서로 고정(부서가 없으면 거부), 그 외는 ?dept= 값."""
+    if user["role"] != "manager": return _int(q, "dept")
+    if not user["dept_id"]: raise HttpError(403, "소속 부서가 없는 매니저입니다.")
+    return user["dept_id"]
+
+# ===== 엔드포인트: fn(user, query, body) -> JSON으로 보낼 값 =====
+def ep_me(user, q, body):
+    return user
+
+def ep_inbox(user, q, body):
+    _need(user, "admin", "hr", "manager")
+    return repo.inbox(user["role"], user["dept_id"], _str(q, "kind"), _int(q, "after"), _int(q, "before"),
+                      _int(q, "limit", PAGE_LIMIT, PAGE_LIMIT))
+
+def ep_inbox_counts(user, q, body):
+    _need(user, "admin", "hr", "manager")
+    return repo.inbox_counts(user["role"], user["dept_id"])
+
+def ep_decide(user, q, body):
+    _need(user, "admin", "hr", "manager")
+    stage = body.get("stage")
+    if stage not in ("manager", "hr"): raise HttpError(400, "stage는 manager 또는 hr")
+    if user["role"] != "admin" and user["role"] != stage: raise HttpError(403, f"{stage} 단계를 처리할 권한이 없습니다.")
+    try: items = [(str(k), int(i)) for k, i in body.get("items", [])]
+    except (TypeError, ValueError): raise HttpError(400, "items: [[kind, id], …]")
+    if any(k not in repo.INBOX_KINDS for k, _i in items): raise HttpError(400, f"kind: {', '.join(repo.INBOX_KINDS)}")
+    return repo.decide_requests(items, stage, bool(body.get("approve")), user["id"], _dept_scope(user, {}))
+
+def ep_employees(user, q, body):
+    _need(user, "admin", "hr", "manager")
+    term = _str(q, "q")
+    return repo.search_employees(term, _int(q, "limit", 20, PAGE_LIMIT)) if term else repo.employees()
+
+def ep_employee(user, q, body, emp_id):
+    if user["role"] == "user" and user["employee_id"] != emp_id: raise HttpError(403, "권한이 없습니다.")
+    row = repo.employee(emp_id)
+    if row is None: raise HttpError(404, "없는 직원")
+    return row
+
+def ep_leave_balance(user, q, body, emp_id):
+    if user["role"] == "user" and user["employee_id"] != emp_id: raise HttpError(403, "권한이 없습니다.")
+    return repo.get_leave_balance(emp_id)
+
+def ep_leave_balances(user, q, body):
+    _need(user, "admin", "hr")
+    return repo.leave_balances(_int(q, "dept"))
+
+def ep_departments(user, q, body):
+    return repo.departments()
+
+def ep_holidays(user, q, body):
+    return repo.holidays()
+
+def ep_overview(user, q, body):
+    _need(user, "admin", "hr", "manager")
+    from app.utils_time import today_str
+    dept = _dept_scope(user, q)
+    return repo.overview_page(_str(q, "date", today_str()), dept, _str(q, "q"), _int(q, "after"), _int(q, "before"),
+                              _int(q, "limit", PAGE_LIMIT, PAGE_LIMIT))
+
+def ep_timesheet(user, q, body):
+    _need(user, "admin", "hr")
+    s, e = _str(q, "start"), _str(q, "end")
+    if not (s and e): raise HttpError(400, "start, end가 필요합니다.")
+    return repo.timesheet_summary(s, e, _int(q, "dept"))
+
+def ep_audit(user, q, body):
+    _need(user, "admin", "hr")
+    return repo.audit_page(_int(q, "after"), _int(q, "limit", PAGE_LIMIT, PAGE_LIMIT), _int(q, "before"),
+                           _int(q, "actor"), _str(q, "action"), _str(q, "target_type"), _int(q, "target_id"),
+                           _str(q, "since"), _str(q, "until"))
+
+def ep_goal_rollups(user, q, body):
+    _need(user, "admin", "hr", "manager")
+    quarter = _str(q, "quarter")
+    if not quarter: raise HttpError(400, "quarter가 필요합니다.")
+    dept = _dept_scope(user, q)
+    limit = _int(q, "limit", 10, PAGE_LIMIT)
+    return dict(top=repo.goal_rollup_rank(quarter, limit, False, dept), bottom=repo.goal_rollup_rank(quarter, limit, True, dept),
+                departments=repo.goal_dept_rollups(quarter))
+
+def ep_review_stats(user, q, body):
+    _need(user, "admin", "hr")
+    return repo.review_stats(_str(q, "period"))
+
+# (메서드, 경로 정규식, 함수, 로그인 필요). 경로의 (\d+)는 int로 함수에 넘긴다.
+ROUTES: list[tuple[str, re.Pattern, object, bool]] = [(m, re.compile(p + "$"), fn, auth) for m, p, fn, auth in (
+    ("POST", r"/api/login", lambda user, q, body: _login(body), False),
+    ("GET", r"/api/me", ep_me, True),
+    ("GET", r"/api/inbox", ep_inbox, True),
+    ("GET", r"/api/inbox/counts", ep_inbox_counts, True),
+    ("POST", r"/api/decide", ep_decide, True),
+    ("GET", r"/api/employees", ep_employees, True),
+    ("GET", r"/api/employees/(\d+)", ep_employee, True),
+    ("GET", r"/api/employees/(\d+)/leave", ep_leave_balance, True),
+    ("GET", r"/api/leave/balances", ep_leave_balances, True),
+    ("GET", r"/api/departments", ep_departments, True),
+    ("GET", r"/api/holidays", ep_holidays, True),
+    ("GET", r"/api/overview", ep_overview, True),
+    ("GET", r"/api/timesheet", ep_timesheet, True),
+    ("GET", r"/api/audit", ep_audit, True),
+    ("GET", r"/api/goals/rollups", ep_goal_rollups, True),
+    ("GET", r"/api/reviews/stats", ep_review_stats, True),
+)]
+
+def _json_default(o):
+    if hasattr(o, "keys"): return {k: o[k] for k in o.keys()}   # sqlite3.Row
+    raise TypeError(type(o).__name__)
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"    # keep-alive: 연결 하나를 같은 스레드가 계속 처리
+    server_version = "HRIS"
+
+    def handle(self):
+        try:
+            super().handle()
+        finally:
+            core_db.release_conn()   # 이 스레드의 연결을 풀에 반납 (다음 스레드가 재사용)
+
+    def do_GET(self): self._dispatch("GET")
+    def do_POST(self): self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        url = urlsplit(self.path)
+        try:
+            raw = self._read_body()   # 인증/라우팅 오류여도 본문을 먼저 소비해야 keep-alive 다음 요청이 깨지지 않음
+            allowed = False
+            for m, pattern, fn, auth in ROUTES:
+                match = pattern.match(url.path)
+                if not match: continue
+                if m != method:
+                    allowed = True; continue
+                user = _session_user(self.headers.get("Authorization")) if auth else None
+                body = self._json(raw) if method == "POST" else {}
+                result = fn(user, parse_qs(url.query), body, *(int(g) for g in match.groups()))
+                return self._send(200, result, cache=(method == "GET"))
+            raise HttpError(405, "허용되지 않는 메서드") if allowed else HttpError(404, "없는 경로")
+        except HttpError as e:
+            self._send(e.status, {"error": str(e)})
+        except Exception as e:
+            log.exception("%s %s", method, self.path)
+            self._send(500, {"error": f"서버 오류: {e}"})
+
+    def _read_body(self) -> bytes:
+        """Content-Length만큼 읽는다. 읽지 않고 거절할 때(크기 초과, 잘못된 길이)는 연결을 닫는다."""
+        try:
+            n = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.close_connection = True; raise HttpError(400, "Content-Length가 잘못되었습니다.")
+        if n < 0 or n > MAX_BODY:
+            self.close_connection = True; raise HttpError(413, "요청 본문이 너무 큽니다.")
+        return self.rfile.read(n) if n else b""
+
+    @staticmethod
+    def _json(raw: bytes) -> dict:
+        try:
+            data = json.loads(raw or b"{}")
+        except ValueError: raise HttpError(400, "JSON 본문이 아닙니다.")
+        if not isinstance(data, dict): raise HttpError(400, "JSON 객체가 필요합니다.")
+        return data
+
+    def _send(self, status: int, obj, cache: bool = False):
+        body = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-cache"}
+        if cache:
+            etag = 'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'   # 압축 여부와 무관한 약한 ETag
+            headers["ETag"] = etag
+            if etag in (t.strip() for t in (self.headers.get("If-None-Match") or "").split(",")):
+                self.send_response(304)
+                for k, v in headers.items():
+                    if k != "Content-Type": self.send_header(k, v)
+                self.send_header("Content-Length", "0"); self.end_headers(); return
+        if len(body) >= GZIP_MIN and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"; headers["Vary"] = "Accept-Encoding"
+        if self.close_connection: headers["Connection"] = "close"
+        self.send_response(status)
+        for k, v in headers.items(): self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body))); self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        log.info("%s %s", self.address_string(), fmt % args)
+
+def make_server(host: str = HOST, port: int = PORT) -> ThreadingHTTPServer:
+    srv = ThreadingHTTPServer((host, port), Handler)
+    srv.daemon_threads = True
+    return srv
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.server", description="HRIS 로컬 JSON HTTP 서비스")
+    ap.add_argument("--host", default=HOST, help=f"바인드 주소 (기본 {HOST}: 이 PC에서만 접속)")
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--db", help="DB 파일 (기본: 앱 DB)")
+    args = ap.parse_args(argv)
+    if args.db: core_db.configure(path=args.db)
+    if not core_db.DB_PATH.exists():
+        print(f"DB 파일이 없습니다: {core_db.DB_PATH}", file=sys.stderr); return 1
+    if core_db.schema_version() < core_db.SCHEMA_VERSION: core_db.init_db()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    srv = make_server(args.host, args.port)
+    print(f"http://{args.host}:{srv.server_address[1]}/api", flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close(); core_db.close_all()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""명령줄/시작 경로 점검: 임시 폴더의 새 DB로 app.cli 명령과 ensure_db를 실제로 실행해 본다.
+
+    python -m app.smoke_check     # 문제 없으면 종료코드 0
+
+GUI 없이 돌아가는 경로(야간 배치, 첫 실행)에서 예외나 빈 결과가 나오지 않는지만 확인한다.
+점검 하나는 (이름, 함수)이고, 함수는 문제가 있으면 AssertionError를 낸다.
+"""
+import contextlib, io, sys, tempfile, traceback
+from pathlib import Path
+from app import cli, core_db
+
+def _run_cli(*argv) -> tuple[int, str, str]:
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        rc = cli.main(list(argv))
+    return rc, out.getvalue(), err.getvalue()
+
+def check_import_progress(tmp: Path):
+    """import-employees를 진행률 출력과 함께(-q 없이) 실행한다."""
+    db = str(tmp / "import.db")
+    rc, _, err = _run_cli("--db", db, "init", "--seed")
+    assert rc == 0, err
+    src = tmp / "staff.csv"
+    src.write_text("employee_no,name,email,department_id,position\n"
+                   "S001,점검1,s1@example.com,1,\nS002,점검2,s2@example.com,2,팀장\nS003,점검3,bad-email,2,\n",
+                   encoding="utf-8")
+    rc, out, err = _run_cli("--db", db, "import-employees", str(src))
+    assert rc == 3, f"종료코드 {rc} (거부 1건이면 3): {err}"
+    assert "4줄 (거부 1건)" in err, f"진행률 출력 없음: {err!r}"
+    assert "추가 2 / 갱신 0 / 거부 1" in out, out
+
+def check_fresh_rollups(tmp: Path):
+    """빈 경로에서 ensure_db()를 하면 샘플 목표의 집계(goal_rollups)까지 채워져 있어야 한다."""
+    from app.repo import Repo
+    from app.seed import ensure_db
+    core_db.configure(path=tmp / "fresh.db")
+    assert ensure_db() == "seeded"
+    repo = Repo()
+    n = len(repo.goal_progress_avg_by_employee("2025Q3"))
+    assert n, "샘플 목표가 없음"
+    assert len(repo.goal_rollup_rank("2025Q3")) == n, repo.goal_rollup_rank("2025Q3")
+    assert repo.goal_dept_rollups("2025Q3"), "부서 집계가 비어 있음"
+
+def check_legacy_db(tmp: Path):
+    """user_version이 0인 예전 릴리스 DB는 'migrated'이고 샘플 데이터가 들어가지 않아야 한다."""
+    import sqlite3
+    from app.seed import ensure_db
+    path = tmp / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""CREATE TABLE employees(id INTEGER PRIMARY KEY AUTOINCREMENT, employee_no TEXT UNIQUE NOT NULL,
+                              name TEXT NOT NULL, email TEXT NOT NULL, department_id INTEGER, position TEXT);
+                          INSERT INTO employees(employee_no,name,email) VALUES('L001','기존','old@example.com');""")
+    conn.close()
+    core_db.configure(path=path)
+    assert ensure_db() == "migrated"
+    assert core_db.schema_version() == core_db.SCHEMA_VERSION
+    c = core_db.get_conn()
+    for table in ("employees", "goals", "reviews", "users", "attendance"):
+        n = c.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        assert n == (1 if table == "employees" else 0), f"{table}: {n}행"
+    assert ensure_db() == "warm"
+
+CHECKS = [
+    ("import-employees 진행률", check_import_progress),
+    ("새 DB의 목표 집계", check_fresh_rollups),
+    ("예전 릴리스 DB는 마이그레이션만", check_legacy_db),
+]
+
+def main(argv=None) -> int:
+    failed = 0; saved = core_db.DB_PATH
+    for name, fn in CHECKS:
+        with tempfile.TemporaryDirectory() as d:
+            try:
+                fn(Path(d)); print(f"OK   {name}")
+            except Exception:
+                failed += 1; print(f"FAIL {name}"); traceback.print_exc()
+            finally:
+                core_db.configure(path=saved)   # 임시 DB 연결을 닫아야 폴더를 지울 수 있다
+    print(f"FAIL: {failed}/{len(CHECKS)}개 실패" if failed else f"OK: {len(CHECKS)}개 점검")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor, Future
+from tkinter import messagebox
+
+class BackgroundExecutor:
+    """Repo 호출을 워커 스레드에서 실행하고 결과 콜백은 Tk 메인 스레드에서 호출한다.
+
+    Tk 위젯은 메인 스레드에서만 만질 수 있으므로 워커는 결과를 큐에 넣고, 메인 스레드가
+    after()로 큐를 비우며 on_done/on_error를 부른다. 같은 key로 새 요청이 들어오면 이전
+    요청은 (시작 전이면) 취소되고, 이미 실행 중이었다면 결과를 버린다.
+    워커 스레드는 core_db의 스레드별 연결을 각자 하나씩 쓴다.
+    """
+    POLL_MS = 30
+
+    def __init__(self, root, workers: int = 2, on_busy=None):
+        self.root = root; self.on_busy = on_busy
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hris-db")
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+        self._latest: dict[str, int] = {}; self._futures: dict[str, Future] = {}
+        self._seq = 0; self._pending = 0; self._polling = False
+
+    def submit(self, key: str | None, fn, *args, on_done=None, on_error=None, **kwargs) -> Future:
+        """fn(*args, **kwargs)를 백그라운드에서 실행. key가 같은 이전 요청은 대체된다."""
+        self._seq += 1; seq = self._seq
+        if key is not None:
+            old = self._futures.get(key)
+            if old is not None: old.cancel()
+            self._latest[key] = seq
+        fut = self._pool.submit(fn, *args, **kwargs)
+        if key is not None: self._futures[key] = fut
+        self._set_pending(+1)
+        fut.add_done_callback(lambda f: self._results.put((key, seq, f, on_done, on_error)))
+        if not self._polling:
+            self._polling = True; self.root.after(self.POLL_MS, self._drain)
+        return fut
+
+    def post(self, fn, *args):
+        """워커 스레드에서 호출해도 안전: fn(*args)를 다음 폴링 때 메인 스레드에서 실행 (진행률 표시 등).
+        작업이 진행 중일 때만 폴링하므로 submit한 작업 안에서 쓴다."""
+        self._results.put((None, None, None, fn, args))
+
+    def cancel(self, key: str):
+        fut = self._futures.pop(key, None); self._latest.pop(key, None)
+        if fut is not None: fut.cancel()
+
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _set_pending(self, delta: int):
+        before = self._pending; self._pending += delta
+        if self.on_busy and (before == 0) != (self._pending == 0):
+            self.on_busy(self._pending > 0)
+
+    def _drain(self):
+        try:
+            while True:
+                try: key, seq, fut, on_done, on_error = self._results.get_nowait()
+                except queue.Empty: break
+                if fut is None:   # post()로 넘어온 UI 작업
+                    on_done(*on_error); continue
+                self._set_pending(-1)
+                if fut.cancelled() or (key is not None and self._latest.get(key) != seq):
+                    continue  # 취소되었거나 더 최근 요청으로 대체됨
+                if key is not None: self._futures.pop(key, None)
+                exc = fut.exception()
+                if exc is not None:
+                    (on_error or self._show_error)(exc)
+                elif on_done is not None:
+                    on_done(fut.result())
+        finally:
+            if self._pending:
+                self.root.after(self.POLL_MS, self._drain)
+            else:
+                self._polling = False
+
+    @staticmethod
+    def _show_error(exc: BaseException):
+        messagebox.showerror("오류", f"데이터를 불러오지 못했습니다: {exc}")
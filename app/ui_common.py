@@ -1,11 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv, os, datetime
+import csv, os
+from app.exporter import export_dir, export_path, write_csv
 
 def export_tree_to_csv(tree: ttk.Treeview, base_name: str) -> str:
-    ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-    folder = os.path.join(os.getcwd(), 'exports'); os.makedirs(folder, exist_ok=True)
-    path = os.path.join(folder, f'{base_name}_{ts}.csv')
+    path = export_path(base_name)
     cols = tree["columns"]
     with open(path, "w", encoding="utf-8-sig", newline="") as f:
         w = csv.writer(f); w.writerow(cols)
@@ -13,3 +12,95 @@ def export_tree_to_csv(tree: ttk.Treeview, base_name: str) -> str:
             row = [tree.set(iid, c) for c in cols]; w.writerow(row)
     messagebox.showinfo("내보내기", f"CSV 저장: {path}")
     return path
+
+def export_rows_to_csv(cols, rows, base_name: str) -> str:
+    """Treeview를 거치지 않고 조회 결과(행 시퀀스)를 바로 CSV로 저장."""
+    path = export_path(base_name)
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f); w.writerow(cols); w.writerows(rows)
+    messagebox.showinfo("내보내기", f"CSV 저장: {path}")
+    return path
+
+def export_query_to_csv(executor, fetch, base_name: str, status=None):
+    """fetch() -> (컬럼, 행 배치)를 워커 스레드에서 실행해 파일로 바로 스트리밍 저장 (위젯을 거치지 않음).
+    저장 위치와 gzip 여부(.csv.gz)는 대화상자에서 고른다. status(text)는 메인 스레드에서 진행 상황을 받는다."""
+    path = filedialog.asksaveasfilename(initialdir=export_dir(), initialfile=os.path.basename(export_path(base_name)),
+                                        defaultextension=".csv", filetypes=[("CSV","*.csv"),("CSV (gzip)","*.csv.gz")])
+    if not path: return
+    def run():
+        cols, batches = fetch()
+        report = (lambda n: executor.post(status, f"내보내는 중… {n:,}행")) if status else None
+        return write_csv(cols, batches, path, progress=report)
+    executor.submit(f"export:{path}", run,
+                    on_done=lambda n: messagebox.showinfo("내보내기", f"CSV 저장({n:,}행): {path}"),
+                    on_error=lambda e: messagebox.showerror("내보내기", f"저장 실패: {e}"))
+
+class LazyTree:
+    """스크롤에 맞춰 키셋 페이지를 불러오는 Treeview 래퍼.
+
+    fetch(after=키, before=키, limit=N)는 화면 순서대로 행을 돌려줘야 하며, key(row)는 그 키,
+    to_values(row)는 표시할 값 튜플. 위젯에는 최대 max_rows 행만 유지하고, 넘치면 반대쪽 끝을
+    잘라낸 뒤 다시 그쪽으로 스크롤할 때 before/after 페이지로 되불러온다.
+    executor(BackgroundExecutor)를 주면 페이지 조회를 워커 스레드에서 한다.
+    """
+    EDGE = 0.05  # 스크롤 위치가 양 끝 5% 이내면 다음/이전 페이지 요청
+
+    def __init__(self, parent, columns, key, to_values, fetch=None, page_size: int = 200,
+                 max_rows: int = 2000, executor=None, **tree_kw):
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", **tree_kw)
+        for c in columns: self.tree.heading(c, text=c)
+        sb = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=lambda lo, hi: (sb.set(lo, hi), self._on_scroll(float(lo), float(hi))))
+        sb.pack(side="right", fill="y"); self.tree.pack(side="left", fill="both", expand=True)
+        self.key = key; self.to_values = to_values; self.fetch = fetch
+        self.page_size = page_size; self.max_rows = max_rows; self.executor = executor
+        self._keys: list = []; self._loading = False; self._at_end = True; self._trimmed_top = False
+
+    def pack(self, **kw): self.frame.pack(**kw)
+
+    def reload(self, fetch=None):
+        """목록을 비우고 첫 페이지부터 다시 불러온다 (fetch를 주면 조회 조건 교체)."""
+        if fetch is not None: self.fetch = fetch
+        self.tree.delete(*self.tree.get_children()); self._keys = []
+        self._at_end = False; self._trimmed_top = False; self._loading = False
+        self._load("next")
+
+    def _on_scroll(self, lo: float, hi: float):
+        if self._loading or self.fetch is None: return
+        if hi >= 1 - self.EDGE and not self._at_end: self._load("next")
+        elif lo <= self.EDGE and self._trimmed_top: self._load("prev")
+
+    def _load(self, direction: str):
+        if direction == "next":
+            kw = dict(after=self._keys[-1] if self._keys else None, limit=self.page_size)
+        else:
+            kw = dict(before=self._keys[0], limit=self.page_size)
+        self._loading = True; fetch = self.fetch
+        if self.executor is None:
+            self._apply(direction, fetch, fetch(**kw))
+        else:
+            self.executor.submit(f"lazytree-{id(self)}", fetch, on_done=lambda rows: self._apply(direction, fetch, rows),
+                                 on_error=self._failed, **kw)
+
+    def _failed(self, exc):
+        self._loading = False; messagebox.showerror("오류", f"목록을 불러오지 못했습니다: {exc}")
+
+    def _apply(self, direction: str, fetch, rows):
+        self._loading = False
+        if fetch is not self.fetch: return  # 그 사이 조회 조건이 바뀜
+        t = self.tree
+        if direction == "next":
+            for r in rows:
+                k = self.key(r); t.insert("", "end", iid=str(k), values=self.to_values(r)); self._keys.append(k)
+            self._at_end = len(rows) < self.page_size
+            while len(self._keys) > self.max_rows:   # 위쪽 잘라내기
+                t.delete(str(self._keys.pop(0))); self._trimmed_top = True
+        else:
+            for i, r in enumerate(rows):
+                k = self.key(r); t.insert("", i, iid=str(k), values=self.to_values(r))
+            self._keys[0:0] = [self.key(r) for r in rows]
+            self._trimmed_top = len(rows) == self.page_size
+            while len(self._keys) > self.max_rows:   # 아래쪽 잘라내기
+                t.delete(str(self._keys.pop())); self._at_end = False
+            if self._keys: t.yview_moveto(len(rows) / len(self._keys))  # 보던 행을 제자리에
@@ -1,11 +1,94 @@
-import os, hashlib, binascii
+import os, sys, hashlib, binascii, hmac, time
 
-def pbkdf2_hash(password: str, salt: bytes | None = None, rounds: int = 200_000) -> tuple[str,str]:
+# 비밀번호 해시는 "알고리즘$파라미터$salt$hash" 형식으로 저장해 파라미터를 바꿔도 기존 해시를 검증할 수 있다.
+#   pbkdf2_sha256$200000$<salt hex>$<hash hex>
+#   scrypt$n=16384,r=8,p=1$<salt hex>$<hash hex>
+# '$'가 없는 값은 예전 형식(salt 컬럼 + PBKDF2 200,000회 hex)이다.
+DEFAULT_PARAMS = "pbkdf2_sha256$200000"
+LEGACY_ROUNDS = 200_000
+HAS_SCRYPT = hasattr(hashlib, "scrypt")
+
+def pbkdf2_hash(password: str, salt: bytes | None = None, rounds: int = LEGACY_ROUNDS) -> tuple[str,str]:
     if salt is None: salt = os.urandom(16)
     dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, rounds, dklen=32)
     return binascii.hexlify(salt).decode(), binascii.hexlify(dk).decode()
 
-def pbkdf2_verify(password: str, salt_hex: str, hash_hex: str, rounds: int = 200_000) -> bool:
+def pbkdf2_verify(password: str, salt_hex: str, hash_hex: str, rounds: int = LEGACY_ROUNDS) -> bool:
     salt = binascii.unhexlify(salt_hex.encode())
     dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, rounds, dklen=32)
-    return binascii.hexlify(dk).decode() == hash_hex
+    return hmac.compare_digest(binascii.hexlify(dk).decode(), hash_hex)
+
+def _parse(params: str) -> tuple[str, dict]:
+    algo, _, arg = params.partition("$")
+    if algo == "pbkdf2_sha256":
+        return algo, {"rounds": int(arg)}
+    if algo == "scrypt":
+        return algo, {k: int(v) for k, v in (kv.split("=") for kv in arg.split(","))}
+    raise ValueError(f"지원하지 않는 해시 알고리즘: {algo}")
+
+def _derive(password: str, params: str, salt: bytes) -> bytes:
+    algo, p = _parse(params)
+    if algo == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, p["rounds"], dklen=32)
+    if not HAS_SCRYPT:
+        raise RuntimeError("이 Python/OpenSSL 빌드는 scrypt를 지원하지 않습니다.")
+    n, r = p["n"], p["r"]
+    return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p["p"], dklen=32, maxmem=256 * n * r + (1 << 20))
+
+def hash_password(password: str, params: str | None = None) -> tuple[str, str]:
+    """(salt hex, 저장용 해시 문자열). params 기본값은 DEFAULT_PARAMS."""
+    params = params or DEFAULT_PARAMS; salt = os.urandom(16)
+    dk = _derive(password, params, salt)
+    return salt.hex(), f"{params}${salt.hex()}${dk.hex()}"
+
+def verify_password(password: str, stored: str, legacy_salt_hex: str | None = None) -> bool:
+    """저장된 해시와 비교. 예전 형식이면 users.salt 값(legacy_salt_hex)을 함께 넘긴다."""
+    if "$" not in stored:
+        return legacy_salt_hex is not None and pbkdf2_verify(password, legacy_salt_hex, stored)
+    params, salt_hex, hash_hex = stored.rsplit("$", 2)
+    return hmac.compare_digest(_derive(password, params, bytes.fromhex(salt_hex)).hex(), hash_hex)
+
+def needs_rehash(stored: str, params: str | None = None) -> bool:
+    """저장된 해시가 현재 파라미터와 다르면 True (로그인 성공 시 새 파라미터로 다시 저장)."""
+    if "$" not in stored: return True
+    return stored.rsplit("$", 2)[0] != (params or DEFAULT_PARAMS)
+
+def _time_ms(params: str) -> float:
+    salt = os.urandom(16); best = float("inf")
+    for _ in range(3):
+        t = time.perf_counter(); _derive("calibrate", params, salt); best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+def calibrate(target_ms: float = 250, algorithm: str = "pbkdf2_sha256") -> str:
+    """이 장비에서 한 번 검증에 target_ms 정도 걸리는 파라미터 문자열을 찾는다."""
+    if algorithm == "pbkdf2_sha256":
+        base = 50_000; ms = _time_ms(f"pbkdf2_sha256${base}")
+        rounds = max(100_000, int(base * target_ms / ms) // 10_000 * 10_000)
+        return f"pbkdf2_sha256${rounds}"
+    if algorithm == "scrypt":
+        n = 1 << 14   # r=8 기준 16MB부터 두 배씩
+        while n < (1 << 20) and _time_ms(f"scrypt$n={n * 2},r=8,p=1") <= target_ms:
+            n *= 2
+        return f"scrypt$n={n},r=8,p=1"
+    raise ValueError(f"지원하지 않는 해시 알고리즘: {algorithm}")
+
+def main(argv=None) -> int:
+    """python -m app.utils_security [--target-ms 250] [--scrypt] [--save]
+    보정한 파라미터를 출력하고, --save면 설정에 저장해 이후 로그인부터 새 파라미터로 재해시되게 한다."""
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m app.utils_security", description="비밀번호 해시 비용 보정")
+    ap.add_argument("--target-ms", type=float, default=250, help="목표 검증 시간(ms)")
+    ap.add_argument("--scrypt", action="store_true", help="PBKDF2 대신 scrypt 사용")
+    ap.add_argument("--save", action="store_true", help="설정(settings.password_params)에 저장")
+    args = ap.parse_args(argv)
+    if args.scrypt and not HAS_SCRYPT:
+        print("scrypt를 지원하지 않는 환경입니다.", file=sys.stderr); return 1
+    params = calibrate(args.target_ms, "scrypt" if args.scrypt else "pbkdf2_sha256")
+    print(f"{params}\t{_time_ms(params):.0f}ms")
+    if args.save:
+        from app.repo import Repo
+        Repo().update_settings(password_params=params); print("저장됨")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,18 +21,53 @@ def week_range_of(target: date):
     end = start + timedelta(days=6)
     return start, end
 
+def week_start_of(date_str: str) -> str:
+    return week_range_of(datetime.strptime(date_str, '%Y-%m-%d').date())[0].strftime('%Y-%m-%d')
+
+def month_range_of(target: date):
+    start = target.replace(day=1)
+    end = (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+def off_dates(s: date, e: date, holidays=()) -> list[str]:
+    """s~e 중 주말 또는 휴일인 날짜('YYYY-MM-DD') 목록."""
+    out = []; d = s
+    while d <= e:
+        ds = d.strftime('%Y-%m-%d')
+        if d.weekday() >= 5 or ds in holidays: out.append(ds)
+        d += timedelta(days=1)
+    return out
+
 def span_minutes(start_hhmm: str, end_hhmm: str):
-    return to_minutes(end_hhmm) - to_minutes(start_hhmm)
+    s = to_minutes(start_hhmm); e = to_minutes(end_hhmm)
+    return e - s if e >= s else e + 24*60 - s  # 자정 넘김
+
+_DAY = 24 * 60
+_NIGHT_AM = NIGHT_END * 60               # 00:00 ~ 06:00
+_NIGHT_PM = NIGHT_START * 60             # 22:00 ~ 24:00
+_NIGHT_PER_DAY = _NIGHT_AM + (_DAY - _NIGHT_PM)
+BUCKET_KEYS = ("regular", "overtime", "night", "holiday", "total")
+
+def _night_before(t: int) -> int:
+    """첫날 00:00부터 t분 직전까지의 야간 분 (구간 산술, O(1))."""
+    days, r = divmod(t, _DAY)
+    return days * _NIGHT_PER_DAY + min(r, _NIGHT_AM) + max(0, r - _NIGHT_PM)
+
+# SQL 버전 (Repo 집계 쿼리에서 사용). 규칙은 위 Python 함수와 동일하게 유지할 것.
+def to_minutes_sql(col: str) -> str:
+    return f"(CAST(substr({col},1,instr({col},':')-1) AS INTEGER)*60 + CAST(substr({col},instr({col},':')+1) AS INTEGER))"
+
+def week_start_sql(col: str) -> str:
+    """날짜 컬럼이 속한 주의 월요일 (week_range_of와 동일)."""
+    return f"date({col}, '-'||((CAST(strftime('%w',{col}) AS INTEGER)+6)%7)||' days')"
+
+def night_before_sql(x: str) -> str:
+    return f"({x}/{_DAY}*{_NIGHT_PER_DAY} + min({x}%{_DAY},{_NIGHT_AM}) + max({x}%{_DAY}-{_NIGHT_PM},0))"
 
 def _night_minutes(in_time: str, out_time: str):
     s = to_minutes(in_time); e = to_minutes(out_time)
-    if e < s: e += 24*60
-    night=0
-    for minute in range(s, e):
-        h = (minute//60) % 24
-        if h >= NIGHT_START or h < NIGHT_END:
-            night += 1
-    return night
+    if e < s: e += _DAY  # 자정 넘김
+    return _night_before(e) - _night_before(s)
 
 def calc_work_buckets(in_time: str | None, out_time: str | None, lunch_minutes: int, d: date, is_holiday: bool) -> dict:
     if not in_time or not out_time:
@@ -43,3 +78,44 @@ def calc_work_buckets(in_time: str | None, out_time: str | None, lunch_minutes:
     regular = min(total, DAILY_REGULAR_MINUTES) if not holiday_minutes else 0
     overtime = max(0, total-DAILY_REGULAR_MINUTES) if not holiday_minutes else 0
     return dict(regular=regular, overtime=overtime, night=night, holiday=holiday_minutes, total=total)
+
+def calc_work_buckets_batch(rows, holidays=(), with_rows: bool = True) -> tuple[list[dict], dict[int, dict]]:
+    """근태 행(employee_id, date, in_time, out_time, lunch_minutes) 여러 건을 한 번에 계산.
+
+    calc_work_buckets와 같은 결과를 (행별 버킷 목록, 직원별 합계)로 돌려준다. 직원별 합계에는
+    근무일수(days)도 포함. holidays는 'YYYY-MM-DD' 문자열 집합이며, 출퇴근 시각이 없는 행
+    (LEFT JOIN 결과 등)은 0으로 센다. 합계만 필요하면 with_rows=False로 행별 dict 생성을 생략.
+    """
+    off_cache: dict[str, bool] = {}; min_cache: dict[str, int] = {}
+    per_row: list[dict] = []; acc: dict[int, list] = {}
+    REG = DAILY_REGULAR_MINUTES; zero = dict.fromkeys(BUCKET_KEYS, 0)
+    for r in rows:
+        it = r["in_time"]; ot = r["out_time"]
+        t = acc.get(r["employee_id"])
+        if t is None:
+            t = acc[r["employee_id"]] = [0, 0, 0, 0, 0, 0]
+        if not it or not ot:
+            if with_rows: per_row.append(dict(zero))
+            continue
+        s = min_cache.get(it)
+        if s is None: s = min_cache[it] = to_minutes(it)
+        e = min_cache.get(ot)
+        if e is None: e = min_cache[ot] = to_minutes(ot)
+        ds = r["date"]; off = off_cache.get(ds)
+        if off is None:
+            off = off_cache[ds] = ds in holidays or datetime.strptime(ds, '%Y-%m-%d').weekday() >= 5
+        if e < s: e += _DAY  # 자정 넘김
+        total = e - s - (r["lunch_minutes"] or 0)
+        night = _night_before(e) - _night_before(s)
+        if off and total:
+            regular = overtime = 0; hol = total
+        else:
+            regular = total if total < REG else REG
+            overtime = total - REG if total > REG else 0
+            hol = 0
+        t[0] += regular; t[1] += overtime; t[2] += night; t[3] += hol; t[4] += total; t[5] += 1
+        if with_rows:
+            per_row.append(dict(regular=regular, overtime=overtime, night=night, holiday=hol, total=total))
+    per_emp = {emp: dict(regular=v[0], overtime=v[1], night=v[2], holiday=v[3], total=v[4], days=v[5])
+               for emp, v in acc.items()}
+    return per_row, per_emp